@@ -1,60 +1,88 @@
 # app/__init__.py
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from .config import Config
-# from .models import db  # or however you import db
-# from .models import User  # import your models before creating
-
 # app = Flask(__name__)
 # Initialize extensions
 db = SQLAlchemy()           # Provides ORM capabilities
 jwt = JWTManager()          # Handles JWT authentication
 
-# Global set to store revoked JWT token identifiers (jti)
-revoked_tokens = set()
-
-def create_app():
+def create_app(config_object=Config):
     """
     Application factory function.
     Creates and configures the Flask application.
     """
     app = Flask(__name__)
+    # orjson-backed encoding/decoding for jsonify() and request.get_json()
+    from app.json_provider import JSONProvider
+    app.json = JSONProvider(app)
 
     CORS(app)
 
-    # Load configuration from the Config class
-    app.config.from_object(Config)
+    # Load configuration from the Config class (or a subclass, e.g. in tests)
+    app.config.from_object(config_object)
+
+    # gzip/brotli responses. after_request hooks run in reverse order of
+    # registration, so registering it first makes it see the final body.
+    from app.compression import init_compression
+    init_compression(app)
 
     # Initialize extensions with the app
+    from app.metrics import configure_engine_options, instrument_engine, init_metrics, REVOCATION_CHECK_DURATION
+    from app.query_tracker import instrument_queries
+    configure_engine_options(app)
     db.init_app(app)
     jwt.init_app(app)
 
-    # from .models import User  # import your models before creating
+    # Expose request timings, SQL timings and connection pool saturation at /metrics
+    with app.app_context():
+        instrument_engine(db.engine)
+        instrument_queries(db.engine)
+    init_metrics(app)
 
+    # Opt-in cProfile reports per request and slow-query logging
+    from app.profiling import init_profiling
     with app.app_context():
-        from .models import User  # import your models before creating
-        db.create_all()
+        init_profiling(app, db.engine)
 
-        # ✅ Move this into the app context
-        if not User.query.first():  # Optional: only add users if table is empty
-            user1 = User(username="David", email="david@myemail.com", password="1234")
-            user2 = User(username="John", email="john@myemail.com", password="5678")
+    # Warn about (or, in tests, fail on) statements repeated once per row
+    from app.query_detector import init_query_detector
+    init_query_detector(app)
 
-            db.session.add_all([user1, user2])
-            db.session.commit()
+    # Import models so they are registered with SQLAlchemy. Schema changes and
+    # demo data are applied once per deploy ("flask migrate", "flask seed-demo"),
+    # never here, so creating the app performs no database I/O.
+    from . import models  # noqa: F401
+
+    # Shared store of revoked JWT identifiers (jti), see app/services/revocation_store.py
+    from app.services.revocation_store import create_revocation_store
+    app.extensions["revocation_store"] = create_revocation_store(app.config)
+
+    # Read-through cache of study room and user records, see app/services/record_cache.py
+    from app.services.record_cache import create_record_cache
+    app.extensions["record_cache"] = create_record_cache(app.config)
 
     # Register the token blocklist loader
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
         jti = jwt_payload.get("jti")
-        return jti in revoked_tokens
+        with REVOCATION_CHECK_DURATION.time():
+            return app.extensions["revocation_store"].is_revoked(jti)
 
     # Register blueprints for API routes
     from app.routes.api_routes import api_bp
     app.register_blueprint(api_bp, url_prefix="/api")
 
+    # Liveness (/healthz) and readiness (/readyz) probes
+    from app.health import init_health
+    init_health(app)
+
+    # Register "flask" command line tools
+    from app.cli import register_commands
+    register_commands(app)
+
     # Define a root route that shows all API endpoints
     @app.route("/")
     def home():
@@ -68,10 +96,13 @@ def create_app():
                     "methods": sorted(list(rule.methods)),
                     "url": str(rule)
                 })
-        return jsonify({
+        response = jsonify({
             "message": "StudySmarter API is running!",
             "available_endpoints": endpoints
-        }), 200
+        })
+        # The route map only changes on deploy; let clients and the compression cache reuse it
+        response.add_etag(weak=True)
+        return response.make_conditional(request)
 
     return app
     
\ No newline at end of file
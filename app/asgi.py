@@ -0,0 +1,207 @@
+# app/asgi.py
+"""
+ASGI serving mode.
+
+The I/O-bound endpoints listed in app/routes/async_routes.py (room feeds,
+exports and raw-body media uploads) run as native coroutines on the asyncio
+engine of app/async_db.py, so a request waiting on the database or on a slow
+client holds no thread. Every other request, and anything an async view
+hands back with FALLBACK, is served by the regular Flask app through
+asgiref's WsgiToAsgi adapter, so URLs and response shapes are the same in
+both modes.
+
+Run with any ASGI server, e.g. "uvicorn asgi:application".
+"""
+import logging
+import time
+from urllib.parse import parse_qsl
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header, parse_options_header
+from werkzeug.routing import Map
+from app.async_db import create_async_db
+from app.config import Config
+from app.compression import choose_encoding, is_compressible_mimetype, make_compressor
+from app.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_RESPONSE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Returned by an async view to let the Flask app handle the request instead
+FALLBACK = object()
+
+
+class ClientDisconnected(Exception):
+    """Raised while reading the body of a request whose client went away."""
+
+
+class AsyncRequest:
+    """
+The parts of an ASGI HTTP request the async views use.
+    """
+
+    def __init__(self, scope, receive, sessions):
+        self.scope = scope
+        self.method = scope['method']
+        self.path = scope['path']
+        self.args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+        self.headers = Headers([(k.decode('latin-1'), v.decode('latin-1')) for k, v in scope['headers']])
+        self.mimetype = parse_options_header(self.headers.get('Content-Type', ''))[0].lower()
+        # async_sessionmaker: "async with request.session() as session"
+        self.session = sessions
+        self._receive = receive
+
+    async def stream(self):
+        """
+Yields the request body as it arrives.
+        """
+        while True:
+            message = await self._receive()
+            if message['type'] == 'http.disconnect':
+                raise ClientDisconnected()
+            chunk = message.get('body', b'')
+            if chunk:
+                yield chunk
+            if not message.get('more_body', False):
+                return
+
+
+class AsyncResponse:
+    """
+A response whose body is bytes or an async iterator of bytes (streamed).
+    """
+
+    def __init__(self, body=b'', status=200, mimetype=None, headers=None):
+        self.body = body
+        self.status = status
+        self.headers = Headers(headers or [])
+        if mimetype:
+            self.headers['Content-Type'] = mimetype
+
+    @property
+    def is_streamed(self):
+        return not isinstance(self.body, bytes)
+
+    async def send(self, send):
+        headers = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in self.headers.items()]
+        if not self.is_streamed:
+            headers.append((b'content-length', str(len(self.body)).encode('ascii')))
+        await send({'type': 'http.response.start', 'status': self.status, 'headers': headers})
+        if not self.is_streamed:
+            await send({'type': 'http.response.body', 'body': self.body})
+            return
+        async for chunk in self.body:
+            if chunk:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+def json_response(app, data, status=200):
+    """
+The async counterpart of jsonify(): same encoder, same bytes.
+    """
+    return AsyncResponse(app.json.dumps_bytes(data) + b'\n', status, mimetype='application/json')
+
+
+async def _compress_stream(chunks, compress, flush, finish):
+    async for chunk in chunks:
+        data = compress(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+
+class AsyncAPI:
+    """
+ASGI application: native async views first, the Flask app for everything else.
+    """
+
+    def __init__(self, flask_app, routes):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.url_map = Map([rule for rule, _ in routes])
+        self.views = {rule.endpoint: view for rule, view in routes}
+        self.engine, self.sessions = create_async_db(flask_app.config)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] == 'http' and scope['method'] != 'HEAD':
+            try:
+                endpoint, args = self.url_map.bind('localhost').match(scope['path'], scope['method'])
+            except HTTPException:
+                pass
+            else:
+                if await self._dispatch(endpoint, args, scope, receive, send):
+                    return
+        await self.wsgi(scope, receive, send)
+
+    async def _dispatch(self, endpoint, args, scope, receive, send):
+        """
+Runs an async view. Returns False when the view handed the request back.
+        """
+        started = time.perf_counter()
+        request = AsyncRequest(scope, receive, self.sessions)
+        with self.flask_app.app_context():
+            try:
+                response = await self.views[endpoint](request, **args)
+            except ClientDisconnected:
+                return True
+            except Exception:
+                logger.exception('Unhandled error in async view %s', endpoint)
+                response = json_response(self.flask_app, {'message': 'Internal server error'}, 500)
+            if response is FALLBACK:
+                return False
+            # Measured before compression, like the Flask hook
+            size = None if response.is_streamed else len(response.body)
+            self._compress(request, response)
+            await response.send(send)
+
+        HTTP_REQUEST_DURATION.labels(endpoint, request.method).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(endpoint, request.method, str(response.status)).inc()
+        if size is not None:
+            HTTP_RESPONSE_SIZE.labels(endpoint).observe(size)
+        return True
+
+    def _compress(self, request, response):
+        """
+Applies the same negotiation as app/compression.py to an async response.
+        """
+        config = self.flask_app.config
+        mimetype = parse_options_header(response.headers.get('Content-Type', ''))[0]
+        if (not config['COMPRESS_ENABLED'] or response.status < 200 or response.status in (204, 206, 304)
+                or 'Content-Encoding' in response.headers or not is_compressible_mimetype(mimetype)):
+            return
+        response.headers.add('Vary', 'Accept-Encoding')
+        encoding = choose_encoding(parse_accept_header(request.headers.get('Accept-Encoding')))
+        if encoding is None:
+            return
+        compress, flush, finish = make_compressor(config, encoding)
+        if response.is_streamed:
+            response.body = _compress_stream(response.body, compress, flush, finish)
+        else:
+            if len(response.body) < config['COMPRESS_MIN_SIZE']:
+                return
+            response.body = compress(response.body) + finish()
+        response.headers['Content-Encoding'] = encoding
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_asgi_app(config_object=Config):
+    """
+Creates the Flask app and wraps it in the ASGI application.
+    """
+    from app import create_app
+    from app.routes.async_routes import async_routes
+
+    return AsyncAPI(create_app(config_object), async_routes())
@@ -0,0 +1,50 @@
+# app/async_db.py
+"""
+SQLAlchemy asyncio engine for the native async routes of the ASGI app (asgi.py).
+
+It connects to the same database as the Flask app: postgresql:// URLs use
+psycopg's async driver (postgresql+psycopg://) and sqlite:// URLs use
+aiosqlite. The ORM models are shared, so AsyncSession queries the same
+mapped classes as db.session does.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.query_tracker import instrument_queries
+
+ASYNC_DRIVERS = {
+    'postgres': 'postgresql+psycopg',
+    'postgresql': 'postgresql+psycopg',
+    'postgresql+psycopg2': 'postgresql+psycopg',
+    'postgresql+psycopg': 'postgresql+psycopg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_database_url(database_uri: str) -> str:
+    """
+Returns the async-driver form of a database URL.
+
+Raises:
+ValueError: If the database has no supported async driver.
+    """
+    scheme, separator, rest = database_uri.partition('://')
+    if not separator or scheme not in ASYNC_DRIVERS:
+        raise ValueError(f'No async driver for database URL scheme {scheme!r}')
+    return f'{ASYNC_DRIVERS[scheme]}://{rest}'
+
+
+def create_async_db(config):
+    """
+Creates the async engine and session factory for an app's configuration.
+The pool settings of SQLALCHEMY_ENGINE_OPTIONS are reused, with
+SQLAlchemy's asyncio-compatible pool instead of the instrumented one.
+
+Returns:
+tuple: (AsyncEngine, async_sessionmaker)
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    options.pop('poolclass', None)
+    engine = create_async_engine(async_database_url(config['SQLALCHEMY_DATABASE_URI']), **options)
+    # Statement timings feed db_query_duration_seconds like the sync engine's
+    instrument_queries(engine.sync_engine)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    return engine, sessions
@@ -0,0 +1,129 @@
+# app/cli.py
+"""
+Command line tools registered on the Flask CLI ("flask <command>").
+"""
+import os
+from contextlib import ExitStack
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from app import db
+
+jobs_cli = AppGroup('jobs', help='Run background jobs.')
+
+@jobs_cli.command('work')
+@click.option('--processes', type=int, default=None, help='Worker processes (default: JOB_WORKER_PROCESSES).')
+@click.option('--poll-interval', type=float, default=None, help='Seconds to sleep when the queue is empty.')
+def work_command(processes, poll_interval):
+    """Start a pool of worker processes that run queued jobs until interrupted."""
+    from app.services.job_queue import run_worker_pool
+    processes = processes or current_app.config['JOB_WORKER_PROCESSES']
+    click.echo(f'Starting {processes} job worker process(es)')
+    run_worker_pool(processes, poll_interval)
+
+@jobs_cli.command('run-pending')
+def run_pending_command():
+    """Run every job that is currently due in this process, then exit."""
+    from app.services import media_jobs  # noqa: F401 (registers handlers)
+    from app.services.job_queue import run_pending_jobs
+    count = run_pending_jobs()
+    click.echo(f'Ran {count} job(s)')
+
+@click.command('expire-uploads')
+@with_appcontext
+def expire_uploads_command():
+    """Remove resumable uploads that saw no chunk for MEDIA_RESUMABLE_SESSION_TTL seconds."""
+    from app.services.media_jobs import expire_upload_sessions
+    count = expire_upload_sessions()
+    click.echo(f'Expired {count} upload session(s)')
+
+@click.command('migrate')
+@with_appcontext
+def migrate_command():
+    """Bring the database schema up to date. Safe to run on every deploy."""
+    database_url = current_app.config['SQLALCHEMY_DATABASE_URI']
+    if database_url.startswith('postgres'):
+        from database import get_conninfo, migrate
+        # The app's database, which may differ from the one DATABASE_URL names
+        applied = migrate(get_conninfo(database_url))
+        click.echo(f"Applied {len(applied)} migration(s): {', '.join(applied) or 'none pending'}")
+    else:
+        # Migrations are written for PostgreSQL; local SQLite databases are built from the models
+        db.create_all()
+        click.echo('Created missing tables from the models')
+
+@click.command('seed-demo')
+def seed_demo_command():
+    """Add the demo users if the users table is empty."""
+    from app.models import User
+    from app.services.password_hasher import hash_password
+    if User.query.first():
+        click.echo('Users already exist, skipping demo data')
+        return
+    db.session.add_all([
+        User(username="David", email="david@myemail.com", password=hash_password("1234")),
+        User(username="John", email="john@myemail.com", password=hash_password("5678"))
+    ])
+    db.session.commit()
+    click.echo('Added demo users')
+
+@click.command('export')
+@click.argument('table', type=click.Choice(['study_rooms', 'posts', 'comments']))
+@click.option('--format', 'fmt', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+@click.option('--since', default=None, help='Only rows changed at or after this ISO 8601 timestamp.')
+@click.option('--gzip', 'compress', is_flag=True, help='Gzip the output.')
+@click.option('--output', '-o', type=click.File('wb'), default='-', help='Output file (default: stdout).')
+@with_appcontext
+def export_command(table, fmt, since, compress, output):
+    """Stream a table to a file as NDJSON or CSV."""
+    from app.controllers.export_controller import parse_since
+    from app.services.export import export_stream
+    try:
+        since = parse_since(since)
+    except ValueError:
+        raise click.BadParameter('expected an ISO 8601 timestamp', param_hint='--since')
+    for chunk in export_stream(table, fmt, since, compress):
+        output.write(chunk)
+
+@click.command('import')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--keep-ids', is_flag=True, help='Insert source ids unchanged instead of offsetting them.')
+@click.option('--skip-invalid', is_flag=True, help='Drop rows that fail the checks instead of aborting.')
+@click.option('--batch-size', type=int, default=10000, show_default=True, help='Rows per batch and progress report.')
+@with_appcontext
+def import_command(files, keep_ids, skip_invalid, batch_size):
+    """Bulk load tables from <table>.ndjson / <table>.csv files (users, study_rooms, posts, comments)."""
+    from app.services.importer import import_files, ImportFailed
+
+    sources = {}
+    formats = set()
+    with ExitStack() as stack:
+        for path in files:
+            table, extension = os.path.splitext(os.path.basename(path))
+            if extension not in ('.ndjson', '.csv'):
+                raise click.BadParameter(f'{path}: expected a .ndjson or .csv file', param_hint='FILES')
+            formats.add(extension[1:])
+            sources[table] = stack.enter_context(open(path, newline='', encoding='utf-8'))
+        if len(formats) > 1:
+            raise click.BadParameter('all files must use the same format', param_hint='FILES')
+
+        def progress(table, stage, count):
+            click.echo(f'{table}: {stage}' + (f' {count} rows' if count is not None else ''), err=True)
+
+        try:
+            summary = import_files(sources, formats.pop(), keep_ids, skip_invalid, progress, batch_size)
+        except ImportFailed as e:
+            raise click.ClickException(f'Import aborted, nothing was written: {e}')
+    for table, result in summary.items():
+        click.echo(f"{table}: imported {result['rows']} rows (new id = source id + {result['id_offset']})")
+
+def register_commands(app):
+    """
+Attaches the commands above to the application's CLI.
+    """
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(expire_uploads_command)
+    app.cli.add_command(migrate_command)
+    app.cli.add_command(seed_demo_command)
+    app.cli.add_command(export_command)
+    app.cli.add_command(import_command)
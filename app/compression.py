@@ -0,0 +1,149 @@
+# app/compression.py
+"""
+Response compression (gzip, and brotli when the Brotli package is installed),
+negotiated per request from Accept-Encoding.
+
+- Bodies smaller than COMPRESS_MIN_SIZE are sent as they are.
+- Streamed responses (e.g. exports) are compressed chunk by chunk.
+- Responses that carry an ETag are cacheable, so their compressed body is
+  kept in a small LRU and reused while the ETag stays the same.
+- Responses that already have a Content-Encoding are left alone.
+"""
+import threading
+import zlib
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+
+class CompressedBodyCache:
+    """
+Thread-safe LRU of compressed bodies, keyed by (path, ETag, encoding).
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, size):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != size:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, size, body):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (size, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _gzip_compressor(level):
+    # wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _brotli_compressor(quality):
+    compressor = brotli.Compressor(quality=quality)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+def choose_encoding(accept_encodings):
+    """
+Returns 'br', 'gzip' or None for the client's Accept-Encoding, honouring q-values.
+    """
+    offers = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return accept_encodings.best_match(offers)
+
+
+def is_compressible_mimetype(mimetype):
+    mimetype = mimetype or ''
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def make_compressor(config, encoding):
+    """
+Returns (compress, flush, finish) functions for 'br' or 'gzip' at the
+configured level.
+    """
+    if encoding == 'br':
+        return _brotli_compressor(config['COMPRESS_BROTLI_QUALITY'])
+    return _gzip_compressor(config['COMPRESS_GZIP_LEVEL'])
+
+
+def init_compression(app):
+    """
+Registers the compression after_request hook.
+    """
+    config = app.config
+    cache = CompressedBodyCache(config['COMPRESS_CACHE_SIZE'])
+    app.extensions['compression_cache'] = cache
+
+    def stream(chunks, encoding):
+        compress, flush, finish = make_compressor(config, encoding)
+        for chunk in chunks:
+            data = compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+            # Flush so each chunk reaches the client as it is produced
+            data += flush()
+            if data:
+                yield data
+        yield finish()
+
+    @app.after_request
+    def compress_response(response):
+        if not config['COMPRESS_ENABLED']:
+            return response
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or request.method == 'HEAD'
+                or 'Content-Encoding' in response.headers
+                or response.direct_passthrough
+                or not is_compressible_mimetype(response.mimetype)):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < config['COMPRESS_MIN_SIZE']:
+                return response
+            etag, weak = response.get_etag()
+            key = (request.path, etag, encoding) if etag else None
+            compressed = cache.get(key, len(body)) if key else None
+            if compressed is None:
+                compress, _, finish = make_compressor(config, encoding)
+                compressed = compress(body) + finish()
+                if key:
+                    cache.set(key, len(body), compressed)
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = encoding
+        # A strong ETag names exact bytes, so the compressed variant needs its own
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
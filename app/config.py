@@ -4,6 +4,38 @@ from dotenv import load_dotenv
 # Load environment variables from a .env file in the project root
 load_dotenv()
 
+def env_flag(name, default="False"):
+    return os.getenv(name, default).lower() in ["true", "1", "t"]
+
+def engine_options(database_uri):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS for a database URI from the DB_POOL_* and
+    DB_*_TIMEOUT_MS environment variables. Pool sizing only applies to server
+    databases; SQLite keeps Flask-SQLAlchemy's defaults.
+    """
+    if not database_uri.startswith("postgresql"):
+        return {}
+
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": env_flag("DB_POOL_PRE_PING", "True"),
+    }
+
+    # Server-side timeouts, applied to every new connection (0 disables them)
+    settings = []
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    lock_timeout = int(os.getenv("DB_LOCK_TIMEOUT_MS", "10000"))
+    if statement_timeout:
+        settings.append(f"-c statement_timeout={statement_timeout}")
+    if lock_timeout:
+        settings.append(f"-c lock_timeout={lock_timeout}")
+    if settings:
+        options["connect_args"] = {"options": " ".join(settings)}
+    return options
+
 class Config:
     # Flask configuration
     DEBUG = os.getenv("FLASK_DEBUG", "False").lower() in ["true", "1", "t"]
@@ -15,7 +47,103 @@ class Config:
         f"@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLALCHEMY_ENGINE_OPTIONS is built by configure_engine_options() from the
+    # final SQLALCHEMY_DATABASE_URI; set it in a subclass to bypass that
 
     # JWT configuration
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY") or os.urandom(24).hex()
-    
\ No newline at end of file
+
+    # JWT revocation (logout) store: "database", "redis" or "memory"
+    JWT_REVOCATION_BACKEND = os.getenv("JWT_REVOCATION_BACKEND", "database")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Seconds a worker may trust its cached "not revoked" answer (0 disables the cache)
+    JWT_REVOCATION_CACHE_TTL = float(os.getenv("JWT_REVOCATION_CACHE_TTL", "2"))
+    JWT_REVOCATION_CACHE_SIZE = int(os.getenv("JWT_REVOCATION_CACHE_SIZE", "10000"))
+
+    # Study room / user record cache: shared tier "none", "redis" or "memory"
+    RECORD_CACHE_BACKEND = os.getenv("RECORD_CACHE_BACKEND", "none")
+    # Seconds a worker trusts its local copy (0 disables the local tier)
+    RECORD_CACHE_TTL = float(os.getenv("RECORD_CACHE_TTL", "5"))
+    RECORD_CACHE_SIZE = int(os.getenv("RECORD_CACHE_SIZE", "10000"))
+    RECORD_CACHE_SHARED_TTL = float(os.getenv("RECORD_CACHE_SHARED_TTL", "300"))
+
+    # Password hashing pool (PASSWORD_HASH_WORKERS=0 hashes on the request thread)
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(PASSWORD_HASH_WORKERS * 4)))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "1"))
+    
+    # Seconds a worker reuses the result of the /readyz database check
+    READINESS_CACHE_SECONDS = float(os.getenv("READINESS_CACHE_SECONDS", "5"))
+
+    # Pagination configuration for list endpoints
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", "50"))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", "200"))
+    # Number of recent comments embedded in each post of a room feed
+    FEED_COMMENTS_PER_POST = int(os.getenv("FEED_COMMENTS_PER_POST", "3"))
+    # Largest batch accepted by the /bulk create endpoints (larger requests get 413)
+    BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+    # Streaming exports (/api/export/<table>, "flask export"): rows fetched per
+    # server round trip, and the statement timeout for export queries (0 = none)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    EXPORT_STATEMENT_TIMEOUT_MS = int(os.getenv("EXPORT_STATEMENT_TIMEOUT_MS", "0"))
+
+    # Response compression (app/compression.py). Brotli is offered only when
+    # the Brotli package is installed.
+    COMPRESS_ENABLED = env_flag("COMPRESS_ENABLED", "True")
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "500"))
+    COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+    # Compressed bodies of responses with an ETag kept for reuse (0 disables)
+    COMPRESS_CACHE_SIZE = int(os.getenv("COMPRESS_CACHE_SIZE", "256"))
+
+    # Per-request profiling (app/profiling.py): requests sending PROFILING_HEADER
+    # with PROFILING_TOKEN as its value (the header is ignored while no token is
+    # set) or a random PROFILING_SAMPLE_RATE share of requests are profiled;
+    # reports go to PROFILING_DIR
+    PROFILING_ENABLED = env_flag("PROFILING_ENABLED", "False")
+    PROFILING_HEADER = os.getenv("PROFILING_HEADER", "X-Profile")
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_DIR = os.getenv("PROFILING_DIR") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles"
+    )
+    PROFILING_MAX_REPORTS = int(os.getenv("PROFILING_MAX_REPORTS", "100"))
+    # Log statements slower than this many milliseconds, with their plan (0 disables)
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+    SLOW_QUERY_EXPLAIN = env_flag("SLOW_QUERY_EXPLAIN", "True")
+    # Bound parameters can hold personal data or secrets, so they are only logged on request
+    SLOW_QUERY_LOG_PARAMETERS = env_flag("SLOW_QUERY_LOG_PARAMETERS", "False")
+
+    # N+1 query detection (app/query_detector.py): "off", "warn" or "raise" when one
+    # request runs the same statement shape QUERY_DETECTOR_THRESHOLD times or more
+    QUERY_DETECTOR = os.getenv("QUERY_DETECTOR", "warn" if DEBUG else "off").lower()
+    QUERY_DETECTOR_THRESHOLD = int(os.getenv("QUERY_DETECTOR_THRESHOLD", "5"))
+
+    # Media storage for uploaded files (content-addressed by SHA-256)
+    MEDIA_STORAGE_ROOT = os.getenv("MEDIA_STORAGE_ROOT") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "media_storage"
+    )
+    MEDIA_UPLOAD_CHUNK_SIZE = int(os.getenv("MEDIA_UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+    MEDIA_MAX_UPLOAD_BYTES = int(os.getenv("MEDIA_MAX_UPLOAD_BYTES", str(100 * 1024 * 1024)))
+    # Resumable uploads: default chunk size and the largest file a session may announce
+    MEDIA_RESUMABLE_CHUNK_SIZE = int(os.getenv("MEDIA_RESUMABLE_CHUNK_SIZE", str(8 * 1024 * 1024)))
+    MEDIA_MAX_RESUMABLE_BYTES = int(os.getenv("MEDIA_MAX_RESUMABLE_BYTES", str(4 * 1024 * 1024 * 1024)))
+    # Largest chunk a client may ask for (also bounded by the INTEGER chunk_size column)
+    MEDIA_RESUMABLE_MAX_CHUNK_SIZE = int(os.getenv("MEDIA_RESUMABLE_MAX_CHUNK_SIZE", str(64 * 1024 * 1024)))
+    # Seconds an open session may go without receiving a chunk before "flask expire-uploads" removes it
+    MEDIA_RESUMABLE_SESSION_TTL = int(os.getenv("MEDIA_RESUMABLE_SESSION_TTL", str(24 * 60 * 60)))
+    # Seconds after which a finalize call that never finished is presumed dead; its
+    # session may then be completed again or expired
+    MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT = int(os.getenv("MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT", "600"))
+    # Largest side of generated image thumbnails (width, height)
+    MEDIA_THUMBNAIL_SIZE = (320, 320)
+
+    # Background job queue (jobs table, run with "flask jobs work")
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+    JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", "600"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    JOB_WORKER_PROCESSES = int(os.getenv("JOB_WORKER_PROCESSES", "2"))
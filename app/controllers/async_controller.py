@@ -0,0 +1,182 @@
+# app/controllers/async_controller.py
+"""
+Native async versions of the I/O-bound endpoints, served by the ASGI app
+(app/asgi.py). Each view mirrors its Flask counterpart's validation, status
+codes and response body; only the database and body I/O are awaited.
+"""
+import asyncio
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from app.asgi import AsyncResponse, FALLBACK, json_response
+from app.controllers.export_controller import parse_since
+from app.controllers.media_controller import ALLOWED_MEDIA_TYPES
+from app.controllers.post_controller import group_recent_comments, recent_comments_statement, serialize_feed_post
+from app.models import Media, Post, StudyRoom
+from app.services.export import (
+    EXPORT_ENCODERS, EXPORT_FORMATS, EXPORT_TABLES, export_columns, export_statement, export_timeout,
+    gzip_chunks_async
+)
+from app.services.media_jobs import enqueue_media_processing
+from app.services.media_storage import ContentWriter, MediaTooLarge, EmptyUpload
+from app.services.pagination import InvalidPageRequest, keyset_query, parse_page_args, split_page
+
+async def get_room_feed(request, id):
+    """
+Async GET /api/study_rooms/<id>/feed, see post_controller.get_room_feed().
+    """
+    app = current_app._get_current_object()
+    try:
+        limit, after = parse_page_args(request.args, app.config)
+        async with request.session() as session:
+            room = await session.get(StudyRoom, id)
+            if room is None:
+                return json_response(app, {'message': 'Room not found'}, 404)
+
+            columns = [Post.created_at, Post.post_id]
+            statement = keyset_query(
+                select(Post).where(Post.room_id == id).options(selectinload(Post.media)),
+                columns, limit, after, descending=True
+            )
+            posts, next_cursor = split_page((await session.scalars(statement)).all(), columns, limit)
+
+            per_post = app.config['FEED_COMMENTS_PER_POST']
+            comments_by_post = {}
+            if posts and per_post > 0:
+                rows = await session.execute(recent_comments_statement([post.post_id for post in posts], per_post))
+                comments_by_post = group_recent_comments(rows.all())
+
+        return json_response(app, {
+            'room_id': room.room_id,
+            'posts': [serialize_feed_post(post, comments_by_post.get(post.post_id, [])) for post in posts],
+            'next_cursor': next_cursor
+        })
+    except InvalidPageRequest as e:
+        return json_response(app, {'message': str(e)}, 400)
+    except Exception as e:
+        return json_response(app, {'message': 'Error fetching feed', 'error': str(e)}, 500)
+
+async def export_table(request, table):
+    """
+Async GET /api/export/<table>, see export_controller.export_table().
+Rows are streamed from the database with an async server-side cursor.
+    """
+    app = current_app._get_current_object()
+    if table not in EXPORT_TABLES:
+        return json_response(app, {'message': f"Unknown table. Exportable tables: {', '.join(EXPORT_TABLES)}"}, 404)
+
+    fmt = request.args.get('format', 'ndjson').strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        return json_response(app, {'message': f"Invalid format. Allowed formats: {', '.join(EXPORT_FORMATS)}"}, 400)
+
+    try:
+        since = parse_since(request.args.get('since'))
+    except ValueError:
+        return json_response(app, {'message': "Invalid 'since'. Use an ISO 8601 timestamp."}, 400)
+
+    batch_size = app.config['EXPORT_BATCH_SIZE']
+    columns = export_columns(table)
+
+    async def chunks():
+        encode = EXPORT_ENCODERS[fmt](columns)
+        header = encode([])
+        if header:
+            yield header
+        # Leaving the block rolls back the read transaction (and the SET LOCAL)
+        async with request.session() as session:
+            if session.bind.dialect.name == 'postgresql':
+                await session.execute(export_timeout())
+            result = await session.stream(export_statement(table, since).execution_options(yield_per=batch_size))
+            async for partition in result.partitions():
+                yield encode(partition)
+
+    compress = request.args.get('gzip', 'false').lower() in ['true', '1', 't']
+    response = AsyncResponse(gzip_chunks_async(chunks()) if compress else chunks(), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{table}.{fmt}"'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+async def upload_media_file(request):
+    """
+Async POST /api/media/upload for raw-body uploads, see
+media_controller.upload_media_file(). Multipart uploads are handed to the
+Flask view.
+
+The body is written to storage as it arrives, in batches of
+MEDIA_UPLOAD_CHUNK_SIZE bytes. The file work (writes, fsync and rename) runs in
+worker threads, so it never blocks the event loop, and no database connection
+is held while the client is sending the body.
+    """
+    if request.mimetype == 'multipart/form-data':
+        return FALLBACK
+
+    app = current_app._get_current_object()
+    fields = request.args
+    mime_type = request.mimetype or 'application/octet-stream'
+
+    media_type = (fields.get('type') or mime_type.split('/', 1)[0]).strip().lower()
+    if media_type not in ALLOWED_MEDIA_TYPES:
+        return json_response(app, {'message': f"Invalid media type. Allowed types: {', '.join(ALLOWED_MEDIA_TYPES)}"}, 400)
+
+    post_id = fields.get('post_id')
+    if post_id is not None:
+        try:
+            post_id = int(post_id)
+        except (ValueError, TypeError):
+            return json_response(app, {'message': 'Invalid post_id type. Must be an integer.'}, 400)
+
+    try:
+        if post_id is not None:
+            async with request.session() as session:
+                if await session.get(Post, post_id) is None:
+                    return json_response(app, {'message': f"Post with id {post_id} not found."}, 404)
+
+        batch_size = app.config['MEDIA_UPLOAD_CHUNK_SIZE']
+        writer = await asyncio.to_thread(ContentWriter)
+        try:
+            buffer = bytearray()
+            async for chunk in request.stream():
+                buffer += chunk
+                if len(buffer) >= batch_size:
+                    await asyncio.to_thread(writer.write, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await asyncio.to_thread(writer.write, bytes(buffer))
+            stored = await asyncio.to_thread(writer.commit)
+        finally:
+            await asyncio.to_thread(writer.discard)
+
+        async with request.session() as session:
+            new_media = Media(
+                type=media_type,
+                file_path=stored.file_path,
+                post_id=post_id,
+                content_hash=stored.content_hash,
+                size_bytes=stored.size,
+                mime_type=mime_type
+            )
+            session.add(new_media)
+            await session.flush()
+            enqueue_media_processing(new_media, session=session)
+            await session.commit()
+
+        return json_response(app, {
+            'message': 'Media uploaded successfully',
+            'media_id': new_media.media_id,
+            'type': new_media.type,
+            'file_path': new_media.file_path,
+            'post_id': new_media.post_id,
+            'content_hash': new_media.content_hash,
+            'size_bytes': new_media.size_bytes,
+            'mime_type': new_media.mime_type,
+            'status': new_media.status,
+            'deduplicated': not stored.created
+        }, 201)
+
+    except MediaTooLarge as e:
+        return json_response(app, {'message': str(e)}, 413)
+    except EmptyUpload as e:
+        return json_response(app, {'message': str(e)}, 400)
+    except Exception as e:
+        return json_response(app, {'message': 'Media upload failed', 'error': str(e)}, 500)
@@ -2,8 +2,9 @@
 from flask import request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt, create_access_token
 from app import db
-from app.services.auth_service import register_user, login_user_service
-from app.models.user import User  # To check if a user already exists
+from app.services.auth_service import register_user, login_user_service, find_user_by_email
+from app.services.revocation_store import revoke_token
+from app.services.password_hasher import HashingPoolBusy
 
 def signup():
     """
@@ -27,7 +28,7 @@ def signup():
             return jsonify({'message': 'Empty values are not allowed'}), 400
 
         # Check if a user with the provided email already exists
-        existing_user = User.query.filter_by(email=email).first()
+        existing_user = find_user_by_email(email)
         if existing_user:
             return jsonify({'message': 'User already registered'}), 409
 
@@ -43,6 +44,9 @@ def signup():
             }), 201
         else:
             return jsonify({'message': 'User registration failed'}), 400
+    except HashingPoolBusy as e:
+        db.session.rollback()
+        return jsonify({'message': 'Server busy, please retry'}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'Registration failed', 'error': str(e)}), 500
@@ -76,6 +80,8 @@ On successful login, returns a JWT token and user information.
             return jsonify(result), 200
         else:
             return jsonify({'message': 'Invalid credentials'}), 401
+    except HashingPoolBusy as e:
+        return jsonify({'message': 'Server busy, please retry'}), 503, {'Retry-After': str(e.retry_after)}
     except Exception as e:
         return jsonify({'message': 'Login failed', 'error': str(e)}), 500
 
@@ -83,15 +89,14 @@ On successful login, returns a JWT token and user information.
 def logout_user():
     """
 Endpoint for logging out the user.
-Revokes the JWT token by adding its unique identifier (jti) to a revocation list.
+Revokes the JWT token by storing its unique identifier (jti) in the shared
+revocation store until the token expires.
     """
     try:
-        from app import revoked_tokens  # Ensure revoked_tokens is defined in app/__init__.py
         token_data = get_jwt()
         if not token_data or 'jti' not in token_data:
             return jsonify({'message': 'Invalid token data'}), 400
-        jti = token_data['jti']
-        revoked_tokens.add(jti)
+        revoke_token(token_data)
         return jsonify({'message': 'Successfully logged out'}), 200
     except Exception as e:
         return jsonify({'message': 'Logout failed', 'error': str(e)}), 500
@@ -1,7 +1,8 @@
 # app/controllers/comment_controller.py
 from flask import request, jsonify
-from app.models import Comment, Post
+from app.models import Comment, Post, User
 from app import db
+from app.services.bulk import bulk_endpoint, parse_int, parse_text
 
 def create_comment():
     """
@@ -68,4 +69,27 @@ Enhancements:
             'message': 'Failed to create comment',
             'error': str(e)
         }), 500
-        
\ No newline at end of file
+
+def _parse_bulk_comment(item):
+    return {
+        'post_id': parse_int(item, 'post_id'),
+        'creator_id': parse_int(item, 'creator_id'),
+        'content': parse_text(item, 'content')
+    }
+
+def create_comments_bulk():
+    """
+Endpoint for creating many comments in one request.
+Expects a JSON array of comment objects (or {'items': [...]}), each with
+'post_id', 'creator_id' and 'content'.
+
+Posts and creators are checked with one query each and the valid comments are
+inserted in a single statement. Responds 201 when every item was created and
+207 with a per-item status otherwise.
+    """
+    return bulk_endpoint(
+        'Failed to create comments',
+        parse_item=_parse_bulk_comment,
+        references={'post_id': (Post.post_id, 'Post'), 'creator_id': (User.id, 'Creator (user)')},
+        model=Comment, key_column=Comment.comment_id, key_name='comment_id'
+    )
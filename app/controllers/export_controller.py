@@ -0,0 +1,44 @@
+# app/controllers/export_controller.py
+from datetime import datetime
+from flask import request, jsonify, Response, stream_with_context
+from app.services.export import EXPORT_TABLES, EXPORT_FORMATS, export_stream
+
+def parse_since(value):
+    """
+Parses the 'since' parameter (ISO 8601). Returns None when it is absent.
+Raises ValueError when it is not a valid timestamp.
+    """
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+
+def export_table(table):
+    """
+Endpoint for streaming a full (or incremental) dump of a table.
+Accepts 'format' ('ndjson' or 'csv', default 'ndjson'), 'since' (ISO 8601;
+only rows changed at or after it) and 'gzip' (true/false).
+
+Rows are streamed as they are read, so the response starts immediately and
+the server's memory use does not grow with the table.
+    """
+    if table not in EXPORT_TABLES:
+        return jsonify({'message': f"Unknown table. Exportable tables: {', '.join(EXPORT_TABLES)}"}), 404
+
+    fmt = request.args.get('format', 'ndjson').strip().lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'message': f"Invalid format. Allowed formats: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    try:
+        since = parse_since(request.args.get('since'))
+    except ValueError:
+        return jsonify({'message': "Invalid 'since'. Use an ISO 8601 timestamp."}), 400
+
+    compress = request.args.get('gzip', 'false').lower() in ['true', '1', 't']
+    response = Response(
+        stream_with_context(export_stream(table, fmt, since, compress)),
+        mimetype=EXPORT_FORMATS[fmt]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename="{table}.{fmt}"'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
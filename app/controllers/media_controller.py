@@ -3,6 +3,11 @@ from flask import request, jsonify
 from app.models import Media
 from app import db
 from app.models.post import Post  # Import Post model to validate post_id if provided
+from app.services.media_storage import store_stream, MediaTooLarge, EmptyUpload
+from app.services.media_jobs import enqueue_media_processing
+from app.services.bulk import bulk_endpoint, parse_int, parse_text, ItemError
+
+ALLOWED_MEDIA_TYPES = ['image', 'video', 'audio']
 
 def upload_media():
     """
@@ -40,9 +45,8 @@ Enhancements:
             return jsonify({'message': 'File path cannot be empty'}), 400
 
         # Optionally check allowed media types
-        allowed_types = ['image', 'video', 'audio']
-        if media_type not in allowed_types:
-            return jsonify({'message': f"Invalid media type. Allowed types: {', '.join(allowed_types)}"}), 400
+        if media_type not in ALLOWED_MEDIA_TYPES:
+            return jsonify({'message': f"Invalid media type. Allowed types: {', '.join(ALLOWED_MEDIA_TYPES)}"}), 400
 
         # Validate post_id if provided and verify that the post exists
         post_id = data.get('post_id')
@@ -72,4 +76,108 @@ Enhancements:
     except Exception as e:
         db.session.rollback()
         return jsonify({'message': 'Media upload failed', 'error': str(e)}), 500
-        
\ No newline at end of file
+
+def _parse_bulk_media(item):
+    media_type = parse_text(item, 'type').lower()
+    if media_type not in ALLOWED_MEDIA_TYPES:
+        raise ItemError(f"Invalid media type. Allowed types: {', '.join(ALLOWED_MEDIA_TYPES)}")
+    return {
+        'type': media_type,
+        'file_path': parse_text(item, 'file_path'),
+        'post_id': parse_int(item, 'post_id', required=False)
+    }
+
+def upload_media_bulk():
+    """
+Endpoint for registering many media entries in one request.
+Expects a JSON array of media objects (or {'items': [...]}), each with 'type'
+and 'file_path' and optionally 'post_id'.
+
+Posts are checked with one query and the valid entries are inserted in a
+single statement. Responds 201 when every item was created and 207 with a
+per-item status otherwise.
+    """
+    return bulk_endpoint(
+        'Media upload failed',
+        parse_item=_parse_bulk_media,
+        references={'post_id': (Post.post_id, 'Post')},
+        model=Media, key_column=Media.media_id, key_name='media_id'
+    )
+
+def upload_media_file():
+    """
+Endpoint for uploading the media bytes themselves.
+
+Accepts either a multipart/form-data body with a 'file' part, or the raw file
+as the request body with its MIME type in the Content-Type header.
+'type' (image, video or audio) and 'post_id' are read from the form fields or
+the query string; 'type' defaults to the major part of the MIME type.
+
+The body is streamed to disk in MEDIA_UPLOAD_CHUNK_SIZE chunks and stored
+under its SHA-256 hash, so identical uploads share one file. Checksum
+verification, probing and thumbnails run afterwards as a background job;
+the media 'status' stays 'pending' until it finishes.
+    """
+    try:
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if upload is None:
+                return jsonify({'message': "Missing 'file' part"}), 400
+            fields = request.form
+            mime_type = upload.mimetype or 'application/octet-stream'
+            stream = upload.stream
+        else:
+            fields = request.args
+            mime_type = request.mimetype or 'application/octet-stream'
+            stream = request.stream
+
+        media_type = (fields.get('type') or mime_type.split('/', 1)[0]).strip().lower()
+        if media_type not in ALLOWED_MEDIA_TYPES:
+            return jsonify({'message': f"Invalid media type. Allowed types: {', '.join(ALLOWED_MEDIA_TYPES)}"}), 400
+
+        post_id = fields.get('post_id')
+        if post_id is not None:
+            try:
+                post_id = int(post_id)
+            except (ValueError, TypeError):
+                return jsonify({'message': 'Invalid post_id type. Must be an integer.'}), 400
+
+            post = Post.query.get(post_id)
+            if not post:
+                return jsonify({'message': f"Post with id {post_id} not found."}), 404
+
+        stored = store_stream(stream)
+
+        new_media = Media(
+            type=media_type,
+            file_path=stored.file_path,
+            post_id=post_id,
+            content_hash=stored.content_hash,
+            size_bytes=stored.size,
+            mime_type=mime_type
+        )
+        db.session.add(new_media)
+        db.session.flush()
+        enqueue_media_processing(new_media)
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Media uploaded successfully',
+            'media_id': new_media.media_id,
+            'type': new_media.type,
+            'file_path': new_media.file_path,
+            'post_id': new_media.post_id,
+            'content_hash': new_media.content_hash,
+            'size_bytes': new_media.size_bytes,
+            'mime_type': new_media.mime_type,
+            'status': new_media.status,
+            'deduplicated': not stored.created
+        }), 201
+
+    except MediaTooLarge as e:
+        return jsonify({'message': str(e)}), 413
+    except EmptyUpload as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Media upload failed', 'error': str(e)}), 500
@@ -1,9 +1,14 @@
 # app/controllers/post_controller.py
-from flask import request, jsonify
-from app.models import Post
+from flask import request, jsonify, current_app
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+from app.models import Post, Comment
 from app import db
 from app.models.user import User
 from app.models.study_room import StudyRoom  # Import StudyRoom to validate room existence
+from app.services.pagination import get_page_args, paginate, InvalidPageRequest
+from app.services.bulk import bulk_endpoint, parse_int, parse_text
+from app.services.record_cache import get_room_record, get_user_record
 
 def create_post():
     """
@@ -45,8 +50,8 @@ Enhancements:
                 'message': 'Invalid creator_id. It must be an integer.'
             }), 400
 
-        # Verify that the creator exists
-        user = User.query.get(creator_id)
+        # Verify that the creator exists (served from the record cache when warm)
+        user = get_user_record(creator_id)
         if not user:
             return jsonify({'message': 'Creator (user) not found'}), 404
 
@@ -60,7 +65,7 @@ Enhancements:
                     'message': 'Invalid room_id. It must be an integer if provided.'
                 }), 400
 
-            study_room = StudyRoom.query.get(room_id)
+            study_room = get_room_record(room_id)
             if not study_room:
                 return jsonify({'message': f'Study room with id {room_id} not found.'}), 404
 
@@ -82,4 +87,120 @@ Enhancements:
             'message': 'Failed to create post',
             'error': str(e)
         }), 500
-        
\ No newline at end of file
+
+def _parse_bulk_post(item):
+    return {
+        'content': parse_text(item, 'content'),
+        'creator_id': parse_int(item, 'creator_id'),
+        'room_id': parse_int(item, 'room_id', required=False)
+    }
+
+def create_posts_bulk():
+    """
+Endpoint for creating many posts in one request.
+Expects a JSON array of post objects (or {'items': [...]}), each with
+'content' and 'creator_id' and optionally 'room_id'.
+
+Creators and rooms are checked with one query each and the valid posts are
+inserted in a single statement. Responds 201 when every item was created and
+207 with a per-item status otherwise.
+    """
+    return bulk_endpoint(
+        'Failed to create posts',
+        parse_item=_parse_bulk_post,
+        references={'creator_id': (User.id, 'Creator (user)'), 'room_id': (StudyRoom.room_id, 'Study room')},
+        model=Post, key_column=Post.post_id, key_name='post_id'
+    )
+
+def get_room_feed(id):
+    """
+Endpoint to fetch the posts of a study room, newest first, one page at a time.
+Each post includes its media and its most recent comments
+(FEED_COMMENTS_PER_POST per post).
+
+The whole page is loaded in a fixed number of queries regardless of page
+size: the room, the page of posts, their media (selectin load) and the
+recent comments of every post on the page (one windowed query).
+    """
+    try:
+        limit, after = get_page_args()
+
+        room = db.session.get(StudyRoom, id)
+        if not room:
+            return jsonify({'message': 'Room not found'}), 404
+
+        query = Post.query.filter_by(room_id=id).options(selectinload(Post.media))
+        posts, next_cursor = paginate(
+            query, [Post.created_at, Post.post_id], limit, after, descending=True
+        )
+        comments_by_post = load_recent_comments(
+            [post.post_id for post in posts],
+            current_app.config['FEED_COMMENTS_PER_POST']
+        )
+
+        return jsonify({
+            'room_id': room.room_id,
+            'posts': [serialize_feed_post(post, comments_by_post.get(post.post_id, [])) for post in posts],
+            'next_cursor': next_cursor
+        }), 200
+    except InvalidPageRequest as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Error fetching feed', 'error': str(e)}), 500
+
+def load_recent_comments(post_ids, per_post):
+    """
+Loads the 'per_post' most recent comments of each post in a single query.
+
+Returns:
+dict: Lists of serialized comments keyed by post_id, newest first.
+    """
+    if not post_ids or per_post <= 0:
+        return {}
+    return group_recent_comments(db.session.execute(recent_comments_statement(post_ids, per_post)).all())
+
+def recent_comments_statement(post_ids, per_post):
+    """
+Builds the windowed query behind load_recent_comments().
+    """
+    rank = func.row_number().over(
+        partition_by=Comment.post_id,
+        order_by=(Comment.created_at.desc(), Comment.comment_id.desc())
+    ).label('rank')
+    ranked = select(
+        Comment.comment_id, Comment.post_id, Comment.creator_id,
+        Comment.content, Comment.created_at, rank
+    ).where(Comment.post_id.in_(post_ids)).subquery()
+    return select(ranked).where(ranked.c.rank <= per_post).order_by(ranked.c.post_id, ranked.c.rank)
+
+def group_recent_comments(rows):
+    """
+Serializes the rows of recent_comments_statement() into lists keyed by post_id.
+    """
+    comments_by_post = {}
+    for row in rows:
+        comments_by_post.setdefault(row.post_id, []).append({
+            'comment_id': row.comment_id,
+            'creator_id': row.creator_id,
+            'content': row.content,
+            'created_at': row.created_at.isoformat()
+        })
+    return comments_by_post
+
+def serialize_feed_post(post, recent_comments):
+    """
+Builds the feed representation of a post whose media is already loaded.
+    """
+    return {
+        'post_id': post.post_id,
+        'content': post.content,
+        'creator_id': post.creator_id,
+        'room_id': post.room_id,
+        'created_at': post.created_at.isoformat(),
+        'media': [{
+            'media_id': media.media_id,
+            'type': media.type,
+            'file_path': media.file_path
+        } for media in post.media],
+        'recent_comments': recent_comments
+    }
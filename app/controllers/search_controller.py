@@ -0,0 +1,35 @@
+# app/controllers/search_controller.py
+from flask import request, jsonify
+from app.services.pagination import get_page_args, InvalidPageRequest
+from app.services.search import search, SEARCH_TYPES
+
+def search_content():
+    """
+Endpoint for ranked full-text search.
+Expects a 'q' query parameter. Optionally accepts 'type' ('posts' or
+'comments', default 'posts'), 'room_id', and the 'limit'/'after' pagination
+parameters.
+    """
+    try:
+        query_text = request.args.get('q', '').strip()
+        if not query_text:
+            return jsonify({'message': "Query parameter 'q' cannot be empty"}), 400
+
+        search_type = request.args.get('type', 'posts').strip().lower()
+        if search_type not in SEARCH_TYPES:
+            return jsonify({'message': f"Invalid type. Allowed types: {', '.join(SEARCH_TYPES)}"}), 400
+
+        room_id = request.args.get('room_id')
+        if room_id is not None:
+            try:
+                room_id = int(room_id)
+            except ValueError:
+                return jsonify({'message': 'Invalid room_id. It must be an integer.'}), 400
+
+        limit, after = get_page_args()
+        results, next_cursor = search(query_text, search_type, room_id, limit, after)
+        return jsonify({'results': results, 'next_cursor': next_cursor}), 200
+    except InvalidPageRequest as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'message': 'Search failed', 'error': str(e)}), 500
@@ -2,6 +2,9 @@
 from flask import request, jsonify
 from app.models import StudyRoom
 from app import db
+from app.services.pagination import get_page_args, paginate, InvalidPageRequest
+from app.services.conditional import record_validator, page_validator
+from app.services.record_cache import get_room_record
 # Optionally, uncomment the following line if you want to check for the creator's existence.
 # from app.models.user import User
 
@@ -68,34 +71,50 @@ def create_study_room():
 def get_study_room(id):
     """
 Endpoint to fetch a specific study room by its ID.
+The room is read through the record cache, so repeated reads of a hot room
+do not query the database. Supports If-None-Match / If-Modified-Since: an
+unchanged room is answered with 304.
     """
     try:
-        room = StudyRoom.query.get(id)
-        if not room:
+        room = get_room_record(id)
+        if room is None:
             return jsonify({'message': 'Room not found'}), 404
+        validator = record_validator(StudyRoom.__tablename__, id, room['updated_at'])
+        if validator.matches():
+            return validator.not_modified()
+
         room_data = {
-            'room_id': room.room_id,
-            'name': room.name,
-            'description': room.description,
-            'capacity': room.capacity,
-            'creator_id': room.creator_id
+            'room_id': room['room_id'],
+            'name': room['name'],
+            'description': room['description'],
+            'capacity': room['capacity'],
+            'creator_id': room['creator_id']
         }
-        return jsonify(room_data), 200
+        return validator.apply(jsonify(room_data)), 200
     except Exception as e:
         return jsonify({'message': 'Error fetching room', 'error': str(e)}), 500
 
 def get_all_study_rooms():
     """
-Endpoint to fetch all study rooms.
+Endpoint to fetch study rooms one page at a time.
+Accepts optional 'limit' and 'after' query parameters; 'after' is the
+'next_cursor' returned by the previous page.
+Supports If-None-Match / If-Modified-Since per page.
     """
     try:
-        rooms = StudyRoom.query.all()
+        limit, after = get_page_args()
+        validator = page_validator(StudyRoom.query, [StudyRoom.room_id], limit, after)
+        if validator.matches():
+            return validator.not_modified()
+
+        rooms, next_cursor = paginate(StudyRoom.query, [StudyRoom.room_id], limit, after)
         rooms_data = [{
             'room_id': room.room_id,
             'name': room.name,
             'capacity': room.capacity
         } for room in rooms]
-        return jsonify(rooms_data), 200
+        return validator.apply(jsonify({'study_rooms': rooms_data, 'next_cursor': next_cursor})), 200
+    except InvalidPageRequest as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Error fetching rooms', 'error': str(e)}), 500
-        
\ No newline at end of file
@@ -0,0 +1,266 @@
+# app/controllers/upload_controller.py
+import os
+from datetime import datetime, timedelta
+from flask import request, jsonify, current_app
+from sqlalchemy import or_
+from app import db
+from app.models import Media, Post, UploadSession, UploadChunk
+from app.controllers.media_controller import ALLOWED_MEDIA_TYPES
+from app.services.media_jobs import enqueue_media_processing, stale_assembly
+from app.services.media_storage import (
+    write_chunk, assemble_chunks, discard_chunks, absolute_path, ChunkSizeMismatch
+)
+
+def session_expiry():
+    return datetime.utcnow() + timedelta(seconds=current_app.config['MEDIA_RESUMABLE_SESSION_TTL'])
+
+def create_upload_session():
+    """
+Endpoint for starting a resumable upload.
+Expects JSON with 'type', 'mime_type' and 'total_size'.
+Optionally accepts 'chunk_size' (at most MEDIA_RESUMABLE_MAX_CHUNK_SIZE),
+'post_id' and 'sha256' (checked on completion).
+
+Returns the 'upload_id' and the chunk layout the client must follow:
+chunk N covers bytes [N * chunk_size, (N + 1) * chunk_size). The session
+expires after MEDIA_RESUMABLE_SESSION_TTL seconds without a chunk.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'message': 'No data provided'}), 400
+
+        required_fields = ['type', 'mime_type', 'total_size']
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            return jsonify({
+                'message': 'Missing required fields',
+                'required': required_fields,
+                'missing': missing_fields
+            }), 400
+
+        media_type = str(data['type']).strip().lower()
+        if media_type not in ALLOWED_MEDIA_TYPES:
+            return jsonify({'message': f"Invalid media type. Allowed types: {', '.join(ALLOWED_MEDIA_TYPES)}"}), 400
+
+        mime_type = str(data['mime_type']).strip()
+        if not mime_type:
+            return jsonify({'message': 'MIME type cannot be empty'}), 400
+
+        try:
+            total_size = int(data['total_size'])
+            chunk_size = int(data.get('chunk_size') or current_app.config['MEDIA_RESUMABLE_CHUNK_SIZE'])
+        except (ValueError, TypeError):
+            return jsonify({'message': 'total_size and chunk_size must be integers'}), 400
+
+        if total_size <= 0 or chunk_size <= 0:
+            return jsonify({'message': 'total_size and chunk_size must be greater than zero'}), 400
+        if chunk_size > current_app.config['MEDIA_RESUMABLE_MAX_CHUNK_SIZE']:
+            return jsonify({'message': f"chunk_size must be at most {current_app.config['MEDIA_RESUMABLE_MAX_CHUNK_SIZE']} bytes"}), 400
+        if total_size > current_app.config['MEDIA_MAX_RESUMABLE_BYTES']:
+            return jsonify({'message': f"Upload exceeds {current_app.config['MEDIA_MAX_RESUMABLE_BYTES']} bytes"}), 413
+
+        expected_hash = data.get('sha256')
+        if expected_hash is not None:
+            expected_hash = str(expected_hash).strip().lower()
+            if len(expected_hash) != 64:
+                return jsonify({'message': 'sha256 must be a 64 character hex digest'}), 400
+
+        post_id = data.get('post_id')
+        if post_id is not None:
+            try:
+                post_id = int(post_id)
+            except (ValueError, TypeError):
+                return jsonify({'message': 'Invalid post_id type. Must be an integer.'}), 400
+
+            post = Post.query.get(post_id)
+            if not post:
+                return jsonify({'message': f"Post with id {post_id} not found."}), 404
+
+        session = UploadSession(
+            type=media_type,
+            mime_type=mime_type,
+            total_size=total_size,
+            chunk_size=chunk_size,
+            expires_at=session_expiry(),
+            post_id=post_id,
+            expected_hash=expected_hash
+        )
+        db.session.add(session)
+        db.session.commit()
+
+        return jsonify({
+            'message': 'Upload session created',
+            'upload_id': session.upload_id,
+            'chunk_size': session.chunk_size,
+            'total_chunks': session.total_chunks,
+            'expires_at': session.expires_at.isoformat()
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Failed to create upload session', 'error': str(e)}), 500
+
+def upload_chunk(upload_id, chunk_index):
+    """
+Endpoint for sending one chunk of a resumable upload as the raw request body.
+Chunks may arrive in any order and on any worker; re-sending a chunk replaces it.
+    """
+    try:
+        session = db.session.get(UploadSession, upload_id)
+        if not session:
+            return jsonify({'message': 'Upload not found'}), 404
+        if session.status != 'open':
+            return jsonify({'message': f"Upload is {session.status}"}), 409
+        if chunk_index >= session.total_chunks:
+            return jsonify({'message': f"chunk_index must be below {session.total_chunks}"}), 400
+
+        def claim():
+            # The status is checked again now that the body is on disk. The UPDATE
+            # holds the session's row lock until the commit below, so completion
+            # and expiry cannot start while the part file is being replaced.
+            return UploadSession.query.filter_by(upload_id=upload_id, status='open').update(
+                {'expires_at': session_expiry()}, synchronize_session=False
+            ) == 1
+
+        size = write_chunk(upload_id, chunk_index, request.stream, session.expected_chunk_size(chunk_index), claim)
+        if size is None:
+            db.session.rollback()
+            if session.status in ('completed', 'expired'):
+                discard_chunks(upload_id)
+            return jsonify({'message': f"Upload is {session.status}"}), 409
+        db.session.merge(UploadChunk(upload_id=upload_id, chunk_index=chunk_index, size=size))
+        db.session.commit()
+
+        return jsonify({
+            'upload_id': upload_id,
+            'chunk_index': chunk_index,
+            'offset': chunk_index * session.chunk_size,
+            'size': size
+        }), 200
+    except ChunkSizeMismatch as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Chunk upload failed', 'error': str(e)}), 500
+
+def get_upload_session(upload_id):
+    """
+Endpoint for querying which chunks of a resumable upload were received,
+so an interrupted client only re-sends the missing ones.
+    """
+    try:
+        session = db.session.get(UploadSession, upload_id)
+        if not session:
+            return jsonify({'message': 'Upload not found'}), 404
+
+        received = sorted(
+            index for (index,) in db.session.query(UploadChunk.chunk_index).filter_by(upload_id=upload_id)
+        )
+        received_set = set(received)
+        return jsonify({
+            'upload_id': session.upload_id,
+            'status': session.status,
+            'total_size': session.total_size,
+            'chunk_size': session.chunk_size,
+            'total_chunks': session.total_chunks,
+            'received_chunks': received,
+            'received_offsets': [index * session.chunk_size for index in received],
+            'missing_chunks': [index for index in range(session.total_chunks) if index not in received_set],
+            'expires_at': session.expires_at.isoformat(),
+            'media_id': session.media_id
+        }), 200
+    except Exception as e:
+        return jsonify({'message': 'Error fetching upload', 'error': str(e)}), 500
+
+def complete_upload(upload_id):
+    """
+Endpoint for finalizing a resumable upload.
+Assembles the chunks into content-addressed storage, verifies the size and
+the announced SHA-256, and only then creates the Media row and queues
+its background processing.
+
+A session left 'assembling' by a call that died can be completed again once
+MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT has passed.
+    """
+    try:
+        session = db.session.get(UploadSession, upload_id)
+        if not session:
+            return jsonify({'message': 'Upload not found'}), 404
+
+        received = db.session.query(UploadChunk.chunk_index).filter_by(upload_id=upload_id).count()
+        if received != session.total_chunks:
+            return jsonify({
+                'message': 'Upload is missing chunks',
+                'received': received,
+                'total_chunks': session.total_chunks
+            }), 409
+
+        # Claim the session so two concurrent finalize calls cannot both assemble it.
+        # Every later status change is fenced by locked_at, so a call whose stale
+        # claim was taken over cannot overwrite the new owner's result.
+        locked_at = datetime.utcnow()
+        claimed = UploadSession.query.filter(
+            UploadSession.upload_id == upload_id,
+            or_(UploadSession.status == 'open', stale_assembly(locked_at))
+        ).update({'status': 'assembling', 'locked_at': locked_at}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            return jsonify({'message': f"Upload is {session.status}"}), 409
+        owned = UploadSession.query.filter_by(upload_id=upload_id, status='assembling', locked_at=locked_at)
+
+        try:
+            stored = assemble_chunks(upload_id, session.total_chunks)
+            if stored.size != session.total_size or (
+                session.expected_hash and stored.content_hash != session.expected_hash
+            ):
+                if stored.created:
+                    os.unlink(absolute_path(stored.file_path))
+                owned.update({'status': 'open', 'locked_at': None}, synchronize_session=False)
+                db.session.commit()
+                return jsonify({
+                    'message': 'Assembled file does not match the announced size or sha256',
+                    'size': stored.size,
+                    'sha256': stored.content_hash
+                }), 422
+
+            new_media = Media(
+                type=session.type,
+                file_path=stored.file_path,
+                post_id=session.post_id,
+                content_hash=stored.content_hash,
+                size_bytes=stored.size,
+                mime_type=session.mime_type
+            )
+            db.session.add(new_media)
+            db.session.flush()
+            enqueue_media_processing(new_media)
+            completed = owned.update(
+                {'status': 'completed', 'media_id': new_media.media_id, 'locked_at': None},
+                synchronize_session=False
+            )
+            if not completed:
+                db.session.rollback()
+                return jsonify({'message': 'Upload was taken over by another completion'}), 409
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            owned.update({'status': 'open', 'locked_at': None}, synchronize_session=False)
+            db.session.commit()
+            raise
+
+        discard_chunks(upload_id)
+        return jsonify({
+            'message': 'Media uploaded successfully',
+            'media_id': new_media.media_id,
+            'type': new_media.type,
+            'file_path': new_media.file_path,
+            'post_id': new_media.post_id,
+            'content_hash': new_media.content_hash,
+            'size_bytes': new_media.size_bytes,
+            'mime_type': new_media.mime_type,
+            'status': new_media.status,
+            'deduplicated': not stored.created
+        }), 201
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': 'Failed to complete upload', 'error': str(e)}), 500
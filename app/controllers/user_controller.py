@@ -1,15 +1,24 @@
 # app/controllers/user_controller.py
 from flask import jsonify
 from app.models import User
+from app.services.pagination import get_page_args, paginate, InvalidPageRequest
+from app.services.conditional import page_validator
 
 def get_users():
     """
-Endpoint to fetch all users.
-Returns a list of users with their id, username, and email.
+Endpoint to fetch users one page at a time.
+Returns a list of users with their id, username, and email, plus a
+'next_cursor' to pass as 'after' for the following page.
+Supports If-None-Match / If-Modified-Since per page.
     """
     try:
-        users = User.query.all()
-        if not users:
+        limit, after = get_page_args()
+        validator = page_validator(User.query, [User.id], limit, after)
+        if validator.matches():
+            return validator.not_modified()
+
+        users, next_cursor = paginate(User.query, [User.id], limit, after)
+        if not users and after is None:
             return jsonify({'message': 'No users found'}), 404
 
         users_data = [{
@@ -18,7 +27,9 @@ Returns a list of users with their id, username, and email.
             'email': user.email
         } for user in users]
 
-        return jsonify(users_data), 200
+        return validator.apply(jsonify({'users': users_data, 'next_cursor': next_cursor})), 200
+    except InvalidPageRequest as e:
+        return jsonify({'message': str(e)}), 400
     except Exception as e:
         return jsonify({'message': 'Error fetching users', 'error': str(e)}), 500
         
\ No newline at end of file
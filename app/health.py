@@ -0,0 +1,71 @@
+# app/health.py
+"""
+Health probes for load balancers and orchestrators.
+
+- GET /healthz: liveness. The process is up and serving; never touches the database.
+- GET /readyz: readiness. The database answers. The result of the check is
+  reused for READINESS_CACHE_SECONDS per worker, so frequent probes cost at
+  most one "SELECT 1" per interval and never queue behind each other.
+"""
+import threading
+import time
+from flask import jsonify
+from sqlalchemy import text
+from app import db
+
+
+class ReadinessCheck:
+    """
+Caches the outcome of the database check for 'ttl' seconds.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._result = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def status(self):
+        """
+Returns (ready, error). Only one thread runs the check at a time; the others
+use the previous result meanwhile.
+        """
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.ttl:
+            return self._result
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            self._result = self._check()
+            self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+    def _check(self):
+        try:
+            db.session.execute(text('SELECT 1'))
+            return True, None
+        except Exception as e:
+            return False, str(e)
+        finally:
+            db.session.remove()
+
+
+def init_health(app):
+    """
+Registers /healthz and /readyz.
+    """
+    readiness = ReadinessCheck(app.config['READINESS_CACHE_SECONDS'])
+    app.extensions['readiness'] = readiness
+
+    @app.route('/healthz')
+    def healthz():
+        return jsonify({'status': 'ok'}), 200
+
+    @app.route('/readyz')
+    def readyz():
+        ready, error = readiness.status()
+        if not ready:
+            return jsonify({'status': 'unavailable', 'error': error}), 503
+        return jsonify({'status': 'ready'}), 200
@@ -0,0 +1,211 @@
+# app/metrics.py
+"""
+Prometheus metrics for the API, exposed at GET /metrics.
+
+Under gunicorn (or any multi-process server) set PROMETHEUS_MULTIPROC_DIR to
+an empty, writable directory before the workers start: every process then
+writes its samples there and /metrics aggregates all of them.
+"""
+import os
+import time
+from flask import Response, g, request
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client import CollectorRegistry, multiprocess
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from app.config import engine_options
+
+# --------------------------
+# HTTP requests
+# --------------------------
+HTTP_REQUESTS = Counter(
+    'http_requests_total',
+    'Requests handled, by endpoint, method and status code',
+    ['endpoint', 'method', 'status']
+)
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Time spent handling a request (until the response is returned to the server)',
+    ['endpoint', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes',
+    'Response body size before compression (streamed responses are not counted)',
+    ['endpoint'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+)
+
+# --------------------------
+# SQL statements (app/query_tracker.py)
+# --------------------------
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Duration of individual SQL statements',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'db_queries_per_request',
+    'SQL statements executed while handling one request',
+    ['endpoint'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+DB_TIME_PER_REQUEST = Histogram(
+    'db_time_per_request_seconds',
+    'Total time spent in SQL statements while handling one request',
+    ['endpoint'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+
+# --------------------------
+# JWT revocation checks
+# --------------------------
+REVOCATION_CHECK_DURATION = Histogram(
+    'jwt_revocation_check_seconds',
+    'Time spent checking whether a token has been revoked',
+    buckets=(0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+)
+
+# --------------------------
+# Database connection pool
+# --------------------------
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent getting a connection from the pool (waiting for a free one, or opening one)',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    'db_pool_checkout_timeouts_total',
+    'Pool checkouts that gave up after DB_POOL_TIMEOUT'
+)
+POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections',
+    'Connections currently checked out of the pool',
+    multiprocess_mode='livesum'
+)
+POOL_CAPACITY = Gauge(
+    'db_pool_capacity_connections',
+    'Maximum connections the pool may open (pool_size + max_overflow)',
+    multiprocess_mode='livesum'
+)
+
+
+# --------------------------
+# Record cache (app/services/record_cache.py)
+# --------------------------
+RECORD_CACHE_LOOKUPS = Counter(
+    'record_cache_lookups_total',
+    'Record cache lookups by record kind and result (local_hit, shared_hit, miss)',
+    ['kind', 'result']
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+QueuePool that records how long each checkout took to return a connection.
+
+Only the public connect() entry point is wrapped, so the timing also covers
+opening a new connection when the pool grows and the pre-ping, not just the
+wait for a free slot.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+def configure_engine_options(app):
+    """
+Builds SQLALCHEMY_ENGINE_OPTIONS from the app's SQLALCHEMY_DATABASE_URI (unless
+the config already sets them) and uses the instrumented pool for server
+databases. Must run before db.init_app().
+    """
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS')
+    if options is None:
+        options = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    if 'pool_size' in options:
+        options = dict(options, poolclass=InstrumentedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def instrument_engine(engine):
+    """
+Keeps the pool saturation gauges current as connections are checked out and in.
+
+The capacity is set by each process on its first checkout rather than here:
+with a preloading server this runs in the master, whose value the workers'
+gauges would not see (and which would be added to theirs).
+    """
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    capacity_pid = None
+
+    def checkout(*args):
+        nonlocal capacity_pid
+        if capacity_pid != os.getpid():
+            current = engine.pool
+            POOL_CAPACITY.set(current.size() + max(current._max_overflow, 0))
+            capacity_pid = os.getpid()
+        POOL_CHECKED_OUT.inc()
+
+    # 'checkin' fires before the pool updates its own counters, so track them here
+    event.listen(pool, 'checkout', checkout)
+    event.listen(pool, 'checkin', lambda *args: POOL_CHECKED_OUT.dec())
+
+
+def _endpoint_label():
+    # Unmatched URLs (404s) share one label so clients cannot create new series
+    return request.endpoint or 'unmatched'
+
+
+def init_metrics(app):
+    """
+Registers the request timing hooks and the /metrics endpoint.
+    """
+    from app.query_tracker import get_query_stats
+
+    @app.before_request
+    def start_request_timer():
+        g._request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.pop('_request_started', None)
+        if started is None or request.endpoint == 'metrics':
+            return response
+        endpoint = _endpoint_label()
+        HTTP_REQUEST_DURATION.labels(endpoint, request.method).observe(time.perf_counter() - started)
+        HTTP_REQUESTS.labels(endpoint, request.method, str(response.status_code)).inc()
+        size = None if response.is_streamed else response.calculate_content_length()
+        if size is not None:
+            HTTP_RESPONSE_SIZE.labels(endpoint).observe(size)
+        stats = get_query_stats()
+        DB_QUERIES_PER_REQUEST.labels(endpoint).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(endpoint).observe(stats.seconds)
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+            # Aggregate the samples written by every worker process
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead(pid):
+    """
+Drops the live gauges of a worker that exited (call from gunicorn's child_exit hook).
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
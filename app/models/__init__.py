@@ -3,5 +3,9 @@ from app.models.study_room import StudyRoom
 from app.models.post import Post
 from app.models.comment import Comment
 from app.models.media import Media
+from app.models.revoked_token import RevokedToken
+from app.models.upload_session import UploadSession, UploadChunk
+from app.models.job import Job
+from app.models import search_index  # noqa: F401 (full-text search DDL)
 
-__all__ = ['User', 'StudyRoom', 'Post', 'Comment', 'Media']
+__all__ = ['User', 'StudyRoom', 'Post', 'Comment', 'Media', 'RevokedToken', 'UploadSession', 'UploadChunk', 'Job']
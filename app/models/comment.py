@@ -12,6 +12,12 @@ class Comment(db.Model):
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Comments of a post in time order (recent comments in feeds)
+        db.Index('ix_comments_post_id_created_at', post_id, created_at),
+        db.Index('ix_comments_creator_id', creator_id),
+    )
+
     def __init__(self, post_id, creator_id, content):
         self.post_id = post_id
         self.creator_id = creator_id
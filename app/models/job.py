@@ -0,0 +1,39 @@
+# app/models/job.py
+
+import json
+from datetime import datetime
+from app import db
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+
+    job_id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    # 'queued' -> 'running' -> 'done', or back to 'queued' for a retry, or 'failed'
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    def __init__(self, kind, payload=None, max_attempts=5):
+        self.kind = kind
+        self.payload = json.dumps(payload or {})
+        self.status = 'queued'
+        self.attempts = 0
+        self.max_attempts = max_attempts
+        self.run_after = datetime.utcnow()
+
+    @property
+    def data(self):
+        return json.loads(self.payload)
+
+    def __repr__(self):
+        return f'<Job {self.job_id} {self.kind}>'
@@ -9,13 +9,29 @@ class Media(db.Model):
     media_id = db.Column(db.Integer, primary_key=True)
     type = db.Column(db.String(50), nullable=False)
     file_path = db.Column(db.String(255), nullable=False)
-    post_id = db.Column(db.Integer, db.ForeignKey('posts.post_id'), nullable=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.post_id'), nullable=True, index=True)
+    # Set for files stored by the upload endpoints (SHA-256 of the bytes)
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+    size_bytes = db.Column(db.BigInteger, nullable=True)
+    mime_type = db.Column(db.String(255), nullable=True)
+    # 'pending' until background processing finishes, then 'ready' or 'failed'
+    status = db.Column(db.String(20), nullable=False, default='ready')
+    # Filled in by the media processing job when the file can be probed
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=True)
+    thumbnail_path = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
-    def __init__(self, type, file_path, post_id=None):
+    def __init__(self, type, file_path, post_id=None, content_hash=None, size_bytes=None, mime_type=None,
+                 status='ready'):
         self.type = type.strip()
         self.file_path = file_path.strip()
         self.post_id = post_id
+        self.content_hash = content_hash
+        self.size_bytes = size_bytes
+        self.mime_type = mime_type
+        self.status = status
 
     def __repr__(self):
         return f'<Media {self.media_id}>'
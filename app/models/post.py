@@ -12,6 +12,12 @@ class Post(db.Model):
     room_id = db.Column(db.Integer, db.ForeignKey('study_rooms.room_id'), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # Room feeds: WHERE room_id = ? ORDER BY created_at DESC
+        db.Index('ix_posts_room_id_created_at', room_id, created_at.desc()),
+        db.Index('ix_posts_creator_id', creator_id),
+    )
+
     # Relationships
     comments = db.relationship('Comment', backref='post', lazy=True)
     media = db.relationship('Media', backref='post', lazy=True)
@@ -0,0 +1,19 @@
+# app/models/revoked_token.py
+
+from datetime import datetime
+from app import db
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    # When the token itself expires; the row is useless after this and gets purged
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __init__(self, jti, expires_at=None):
+        self.jti = jti
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        return f'<RevokedToken {self.jti}>'
@@ -0,0 +1,51 @@
+# app/models/search_index.py
+"""
+Full-text search structures that the ORM models cannot declare themselves.
+
+PostgreSQL: a generated tsvector column per table, indexed with GIN, so the
+index is maintained by the database on every write.
+SQLite (tests, local runs): an external-content FTS5 table per table, kept in
+sync by triggers.
+
+The DDL runs whenever the tables are created with db.create_all(); deployed
+PostgreSQL databases get the same objects from migrations/0004_full_text_search.sql.
+"""
+from sqlalchemy import DDL, event
+from app.models.post import Post
+from app.models.comment import Comment
+
+# Index names declared in schema.sql in addition to the model indexes
+FULL_TEXT_INDEXES = ['ix_posts_search_vector', 'ix_comments_search_vector']
+
+def _postgres_ddl(table, index):
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED",
+        f"CREATE INDEX IF NOT EXISTS {index} ON {table} USING GIN (search_vector)",
+    ]
+
+def _sqlite_ddl(table, key):
+    fts = f"{table}_fts"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"content, content='{table}', content_rowid='{key}')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.{key}, new.content); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.{key}, old.content); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF content ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.{key}, old.content); "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.{key}, new.content); END",
+    ]
+
+for model, key, index in [(Post, 'post_id', 'ix_posts_search_vector'),
+                          (Comment, 'comment_id', 'ix_comments_search_vector')]:
+    table = model.__tablename__
+    for statement in _postgres_ddl(table, index):
+        event.listen(model.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    for statement in _sqlite_ddl(table, key):
+        event.listen(model.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(
+        model.__table__, 'before_drop',
+        DDL(f"DROP TABLE IF EXISTS {table}_fts").execute_if(dialect='sqlite')
+    )
@@ -10,8 +10,10 @@ class StudyRoom(db.Model):
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     capacity = db.Column(db.Integer, nullable=False)
-    creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    creator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Bumped on every change; drives ETag/Last-Modified and incremental exports
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
 
     # Relationship with posts in the study room
     posts = db.relationship('Post', backref='study_room', lazy=True)
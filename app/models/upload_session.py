@@ -0,0 +1,72 @@
+# app/models/upload_session.py
+
+import uuid
+from datetime import datetime
+from app import db
+
+class UploadSession(db.Model):
+    __tablename__ = 'upload_sessions'
+
+    upload_id = db.Column(db.String(32), primary_key=True)
+    type = db.Column(db.String(50), nullable=False)
+    mime_type = db.Column(db.String(255), nullable=False)
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.post_id'), nullable=True, index=True)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    chunk_size = db.Column(db.Integer, nullable=False)
+    # Optional SHA-256 announced by the client, checked after assembly
+    expected_hash = db.Column(db.String(64), nullable=True)
+    # 'open' while chunks are accepted, 'assembling' during finalize, then 'completed';
+    # 'expired' once an open session saw no chunk for MEDIA_RESUMABLE_SESSION_TTL seconds
+    status = db.Column(db.String(20), nullable=False, default='open')
+    # When the current finalize call claimed the session ('assembling')
+    locked_at = db.Column(db.DateTime, nullable=True)
+    media_id = db.Column(db.Integer, db.ForeignKey('media.media_id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Pushed forward by every chunk; "flask expire-uploads" removes open sessions past it
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    # Relationship with the chunks received so far
+    chunks = db.relationship('UploadChunk', backref='upload', lazy=True)
+
+    __table_args__ = (
+        db.Index('ix_upload_sessions_status_expires_at', 'status', 'expires_at'),
+    )
+
+    def __init__(self, type, mime_type, total_size, chunk_size, expires_at, post_id=None, expected_hash=None):
+        self.upload_id = uuid.uuid4().hex
+        self.type = type
+        self.mime_type = mime_type
+        self.total_size = total_size
+        self.chunk_size = chunk_size
+        self.post_id = post_id
+        self.expected_hash = expected_hash
+        self.expires_at = expires_at
+        self.status = 'open'
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    def expected_chunk_size(self, chunk_index):
+        if chunk_index == self.total_chunks - 1:
+            return self.total_size - self.chunk_size * chunk_index
+        return self.chunk_size
+
+    def __repr__(self):
+        return f'<UploadSession {self.upload_id}>'
+
+class UploadChunk(db.Model):
+    __tablename__ = 'upload_chunks'
+
+    upload_id = db.Column(db.String(32), db.ForeignKey('upload_sessions.upload_id'), primary_key=True)
+    chunk_index = db.Column(db.Integer, primary_key=True)
+    size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __init__(self, upload_id, chunk_index, size):
+        self.upload_id = upload_id
+        self.chunk_index = chunk_index
+        self.size = size
+
+    def __repr__(self):
+        return f'<UploadChunk {self.upload_id}:{self.chunk_index}>'
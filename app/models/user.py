@@ -11,6 +11,16 @@ class User(db.Model):
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped on every change; drives ETag/Last-Modified of the user list
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # Never included when a User is serialized by app.json_provider
+    __json_hidden__ = ('password',)
+
+    __table_args__ = (
+        # Case-insensitive login lookups: WHERE lower(email) = lower(?)
+        db.Index('ix_users_email_lower', db.func.lower(email), unique=True),
+    )
 
     # Relationships (one-to-many)
     posts = db.relationship('Post', backref='author', lazy=True)
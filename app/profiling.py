@@ -0,0 +1,215 @@
+# app/profiling.py
+"""
+Opt-in per-request profiling and slow-query logging.
+
+With PROFILING_ENABLED, a request is profiled when it sends the
+PROFILING_HEADER header with PROFILING_TOKEN as its value, or when it is
+picked at random with probability PROFILING_SAMPLE_RATE. Without a token the
+header is ignored, so clients cannot force profiling.
+The request is run under cProfile and its SQL statements are recorded; the
+report is written to PROFILING_DIR as <id>.json (metadata, statements and
+the top functions) plus <id>.prof (load with pstats or snakeviz). Only the
+newest PROFILING_MAX_REPORTS reports are kept. The id is returned in the
+X-Profile-Id response header.
+
+Independently, any statement slower than SLOW_QUERY_MS is logged as a warning
+together with its EXPLAIN plan (SLOW_QUERY_EXPLAIN). Its parameters are only
+logged with SLOW_QUERY_LOG_PARAMETERS.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from flask import g, request
+from sqlalchemy import event
+from app.query_tracker import record_statements
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in the JSON report, by cumulative time
+REPORT_TOP_FUNCTIONS = 40
+
+
+# --------------------------
+# Report store
+# --------------------------
+class ProfileStore:
+    """
+Directory of profile reports that keeps only the newest max_reports.
+    """
+
+    def __init__(self, directory, max_reports):
+        self.directory = directory
+        self.max_reports = max_reports
+        self._lock = threading.Lock()
+
+    def save(self, report, profile):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, report['id'])
+        profile.dump_stats(base + '.prof')
+        with open(base + '.json', 'w') as f:
+            json.dump(report, f, indent=2)
+        self._rotate()
+
+    def _rotate(self):
+        with self._lock:
+            reports = sorted(
+                (entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')),
+                key=lambda entry: (entry.stat().st_mtime, entry.name)
+            )
+            for entry in reports[:max(0, len(reports) - self.max_reports)]:
+                base = entry.path[:-len('.json')]
+                for path in (base + '.json', base + '.prof'):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+
+def top_functions(profile, limit=REPORT_TOP_FUNCTIONS):
+    """
+Returns the profile's most expensive functions by cumulative time as text.
+    """
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(limit)
+    return out.getvalue()
+
+
+def _wants_profile(config):
+    token = config['PROFILING_TOKEN']
+    if token and request.headers.get(config['PROFILING_HEADER']) == token:
+        return True
+    rate = config['PROFILING_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+
+# --------------------------
+# Slow queries
+# --------------------------
+def explain(cursor, statement, parameters, dialect_name):
+    """
+Returns the plan of a statement as text, using the cursor's connection.
+    """
+    connection = cursor.connection
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect_name == 'sqlite' else 'EXPLAIN '
+    explain_cursor = connection.cursor()
+    if dialect_name == 'postgresql':
+        # A failed EXPLAIN must not abort the request's transaction
+        explain_cursor.execute('SAVEPOINT slow_query_explain')
+    try:
+        explain_cursor.execute(prefix + statement, parameters)
+        rows = explain_cursor.fetchall()
+    except Exception:
+        if dialect_name == 'postgresql':
+            explain_cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+        raise
+    finally:
+        if dialect_name == 'postgresql':
+            explain_cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+        explain_cursor.close()
+    # SQLite: (id, parent, notused, detail); PostgreSQL: one plan line per row
+    return '\n'.join(str(row[-1]) for row in rows)
+
+
+def instrument_slow_queries(engine, threshold_ms, with_plan=True, with_parameters=False):
+    """
+Logs statements that take at least threshold_ms milliseconds, and their bound
+parameters if with_parameters is set.
+Must be registered after app.query_tracker.instrument_queries, whose
+listener records when each statement started.
+    """
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_started
+        if elapsed < threshold:
+            return
+        plan = None
+        # Only plain reads are explained: EXPLAIN of a write is harmless, but its plan rarely helps
+        if with_plan and not executemany and statement.lstrip()[:6].upper() in ('SELECT', 'WITH '):
+            try:
+                plan = explain(cursor, statement, parameters, conn.dialect.name)
+            except Exception as e:
+                plan = f'(EXPLAIN failed: {e})'
+        logger.warning(
+            'Slow query (%.1f ms): %s%s%s',
+            elapsed * 1000, statement,
+            f'\nParameters: {parameters!r}' if with_parameters else '',
+            f'\nPlan:\n{plan}' if plan else ''
+        )
+
+
+# --------------------------
+# Request hooks
+# --------------------------
+def init_profiling(app, engine):
+    """
+Registers the profiling hooks and the slow-query logger.
+    """
+    config = app.config
+    if config['SLOW_QUERY_MS'] > 0:
+        instrument_slow_queries(
+            engine, config['SLOW_QUERY_MS'], config['SLOW_QUERY_EXPLAIN'], config['SLOW_QUERY_LOG_PARAMETERS']
+        )
+
+    if not config['PROFILING_ENABLED']:
+        return
+    if not config['PROFILING_TOKEN']:
+        logger.warning('PROFILING_TOKEN is not set: the %s header is ignored', config['PROFILING_HEADER'])
+    store = ProfileStore(config['PROFILING_DIR'], config['PROFILING_MAX_REPORTS'])
+    app.extensions['profile_store'] = store
+
+    @app.before_request
+    def start_profile():
+        if not _wants_profile(config):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return
+        g._profile = profile
+        g._profile_started = time.perf_counter()
+        g._profile_statements = record_statements()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('_profile', None)
+        if profile is None:
+            return response
+        profile.disable()
+        elapsed = time.perf_counter() - g._profile_started
+        statements = g._profile_statements
+        report = {
+            'id': f"{datetime.utcnow():%Y%m%dT%H%M%S}-{request.endpoint or 'unmatched'}-{uuid.uuid4().hex[:8]}",
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 3),
+            'sql': {
+                'count': len(statements),
+                'duration_ms': round(sum(seconds for _, seconds in statements) * 1000, 3),
+                'statements': [
+                    {'statement': statement, 'duration_ms': round(seconds * 1000, 3)}
+                    for statement, seconds in statements
+                ],
+            },
+            'top_functions': top_functions(profile),
+        }
+        try:
+            store.save(report, profile)
+        except OSError as e:
+            logger.warning('Could not save profile %s: %s', report['id'], e)
+            return response
+        response.headers['X-Profile-Id'] = report['id']
+        return response
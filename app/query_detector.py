@@ -0,0 +1,75 @@
+# app/query_detector.py
+"""
+N+1 query detection for tests and development.
+
+With QUERY_DETECTOR set to "warn" or "raise", the statements of every request
+are recorded (app/query_tracker.py) and grouped by shape: the SQL text with
+whitespace and expanded IN lists normalized. A shape executed at least
+QUERY_DETECTOR_THRESHOLD times in one request usually means a lazy-loaded
+relationship or a per-row lookup inside a loop, i.e. a query count that grows
+with the size of the result. "warn" logs it; "raise" raises
+RepeatedQueryError, which fails the request (and the test that made it).
+"""
+import logging
+import re
+from collections import Counter
+from flask import g, request
+from app.query_tracker import record_statements
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+# IN (?, ?, ?) / IN (%(id_1_1)s, %(id_1_2)s) -> IN (...), so batches of any size share a shape
+_IN_LIST = re.compile(r'\bIN\s*\((?:[^()]*?,\s*)*[^()]*?\)', re.IGNORECASE)
+
+
+class RepeatedQueryError(RuntimeError):
+    """
+Raised when a request executes the same statement shape too many times.
+    """
+
+
+def query_shape(statement: str) -> str:
+    """
+Normalizes a statement so executions that differ only in parameters match.
+    """
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', statement).strip())
+
+
+def repeated_queries(statements, threshold):
+    """
+Returns [(shape, count)] for the shapes executed at least 'threshold' times,
+most repeated first. 'statements' holds (statement, seconds) pairs.
+    """
+    counts = Counter(query_shape(statement) for statement, _ in statements)
+    return [(shape, count) for shape, count in counts.most_common() if count >= threshold]
+
+
+def init_query_detector(app):
+    """
+Registers the request hooks. The mode and threshold are read per request, so
+tests may change them after the app is created.
+    """
+
+    @app.before_request
+    def record_request_queries():
+        if app.config['QUERY_DETECTOR'] != 'off':
+            g._detector_statements = record_statements()
+
+    @app.after_request
+    def check_request_queries(response):
+        statements = g.pop('_detector_statements', None)
+        mode = app.config['QUERY_DETECTOR']
+        if statements is None or mode == 'off':
+            return response
+        repeated = repeated_queries(statements, app.config['QUERY_DETECTOR_THRESHOLD'])
+        if not repeated:
+            return response
+        message = (
+            f'{request.method} {request.path} executed {len(statements)} statements; repeated: '
+            + '; '.join(f'{count}x {shape}' for shape, count in repeated)
+        )
+        if mode == 'raise':
+            raise RepeatedQueryError(message)
+        logger.warning('Possible N+1 queries: %s', message)
+        return response
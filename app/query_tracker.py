@@ -0,0 +1,88 @@
+# app/query_tracker.py
+"""
+Counts and times the SQL statements executed while handling each request.
+
+Engine events record every statement's duration; inside a request the totals
+are accumulated on flask.g, where the metrics hooks read them. Requests that
+need the statements themselves (e.g. profiled requests) call record_statements().
+"""
+import time
+from contextlib import contextmanager
+from flask import g, has_request_context
+from sqlalchemy import event
+from app.metrics import DB_QUERY_DURATION
+
+
+class QueryStats:
+    """
+Number of statements and total seconds spent in them during one request, and,
+once record_statements() was called, each statement with its duration.
+    """
+    __slots__ = ('count', 'seconds', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = None
+
+
+def get_query_stats():
+    """
+Returns the QueryStats of the current request (creating them on first use).
+    """
+    stats = g.get('_query_stats')
+    if stats is None:
+        stats = g._query_stats = QueryStats()
+    return stats
+
+
+def record_statements():
+    """
+Starts keeping the (statement, seconds) pairs of the current request and
+returns the list they are appended to.
+    """
+    stats = get_query_stats()
+    if stats.statements is None:
+        stats.statements = []
+    return stats.statements
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    DB_QUERY_DURATION.observe(elapsed)
+    if has_request_context():
+        stats = get_query_stats()
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((statement, elapsed))
+
+
+def instrument_queries(engine):
+    """
+Starts timing the statements executed on an engine.
+    """
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextmanager
+def count_queries(engine):
+    """
+Collects the statements executed on an engine inside the block, from any
+thread or request, e.g. to check a query budget in tests.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
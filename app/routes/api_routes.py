@@ -3,9 +3,14 @@ from flask import Blueprint
 from app.controllers.auth_controller import signup, login_user, logout_user
 from app.controllers.user_controller import get_users
 from app.controllers.study_room_controller import create_study_room, get_study_room, get_all_study_rooms
-from app.controllers.post_controller import create_post
-from app.controllers.comment_controller import create_comment
-from app.controllers.media_controller import upload_media
+from app.controllers.post_controller import create_post, create_posts_bulk, get_room_feed
+from app.controllers.comment_controller import create_comment, create_comments_bulk
+from app.controllers.media_controller import upload_media, upload_media_bulk, upload_media_file
+from app.controllers.search_controller import search_content
+from app.controllers.export_controller import export_table
+from app.controllers.upload_controller import (
+    create_upload_session, upload_chunk, get_upload_session, complete_upload
+)
 
 # Create a blueprint for all API routes
 api_bp = Blueprint('api', __name__)
@@ -28,18 +33,41 @@ api_bp.route('/users', methods=['GET'])(get_users)
 api_bp.route('/study_rooms', methods=['POST'])(create_study_room)
 api_bp.route('/study_rooms', methods=['GET'])(get_all_study_rooms)
 api_bp.route('/study_rooms/<int:id>', methods=['GET'])(get_study_room)
+api_bp.route('/study_rooms/<int:id>/feed', methods=['GET'])(get_room_feed)
 
 # --------------------------
 # Post Routes
 # --------------------------
 api_bp.route('/posts', methods=['POST'])(create_post)
+api_bp.route('/posts/bulk', methods=['POST'])(create_posts_bulk)
 
 # --------------------------
 # Comment Routes
 # --------------------------
 api_bp.route('/comments', methods=['POST'])(create_comment)
+api_bp.route('/comments/bulk', methods=['POST'])(create_comments_bulk)
 
 # --------------------------
 # Media Routes
 # --------------------------
 api_bp.route('/media', methods=['POST'])(upload_media)
+api_bp.route('/media/bulk', methods=['POST'])(upload_media_bulk)
+api_bp.route('/media/upload', methods=['POST'])(upload_media_file)
+
+# --------------------------
+# Resumable Upload Routes
+# --------------------------
+api_bp.route('/media/uploads', methods=['POST'])(create_upload_session)
+api_bp.route('/media/uploads/<upload_id>', methods=['GET'])(get_upload_session)
+api_bp.route('/media/uploads/<upload_id>/chunks/<int:chunk_index>', methods=['PUT'])(upload_chunk)
+api_bp.route('/media/uploads/<upload_id>/complete', methods=['POST'])(complete_upload)
+
+# --------------------------
+# Search Routes
+# --------------------------
+api_bp.route('/search', methods=['GET'])(search_content)
+
+# --------------------------
+# Export Routes
+# --------------------------
+api_bp.route('/export/<table>', methods=['GET'])(export_table)
@@ -0,0 +1,20 @@
+# app/routes/async_routes.py
+"""
+Endpoints served natively by the ASGI app (app/asgi.py). The URLs and
+endpoint names match the Flask blueprint's, so metrics and clients see the
+same API in both serving modes.
+"""
+from werkzeug.routing import Rule
+
+
+def async_routes():
+    """
+Returns the (Rule, async view) pairs of the ASGI app.
+    """
+    from app.controllers.async_controller import get_room_feed, export_table, upload_media_file
+
+    return [
+        (Rule('/api/study_rooms/<int:id>/feed', methods=['GET'], endpoint='api.get_room_feed'), get_room_feed),
+        (Rule('/api/export/<table>', methods=['GET'], endpoint='api.export_table'), export_table),
+        (Rule('/api/media/upload', methods=['POST'], endpoint='api.upload_media_file'), upload_media_file),
+    ]
@@ -2,9 +2,17 @@
 
 from app.models import User
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_hasher import hash_password, verify_password, needs_rehash, HashingPoolBusy
 from flask_jwt_extended import create_access_token
 from datetime import timedelta
+from sqlalchemy import func
+
+def find_user_by_email(email: str) -> User:
+    """
+Looks a user up by email, ignoring case.
+The comparison matches the unique index on lower(email), so it is an index lookup.
+    """
+    return User.query.filter(func.lower(User.email) == email.lower()).first()
 
 def register_user(username: str, email: str, password: str) -> User:
     """
@@ -12,7 +20,7 @@ Registers a new user.
 
 Steps:
 1. Checks if a user with the given email already exists.
-2. If not, hashes the password.
+2. If not, hashes the password in the hashing pool.
 3. Creates a new User record and commits it to the database.
 
 Args:
@@ -23,14 +31,17 @@ password (str): The user's plain-text password.
 Returns:
 User: The newly created User object if registration is successful,
 or None if a user with the email already exists.
+
+Raises:
+HashingPoolBusy: If the hashing pool cannot take more work right now.
     """
     # Check if user already exists
-    existing_user = User.query.filter_by(email=email).first()
+    existing_user = find_user_by_email(email)
     if existing_user:
         return None
 
     # Hash the password
-    hashed_password = generate_password_hash(password)
+    hashed_password = hash_password(password)
 
     # Create a new user
     new_user = User(username=username, email=email, password=hashed_password)
@@ -49,7 +60,8 @@ Authenticates a user and generates a JWT token if the credentials are valid.
 Steps:
 1. Retrieves the user by email.
 2. Verifies the provided password against the hashed password.
-3. If authentication is successful, generates an access token.
+3. If the stored hash uses outdated parameters, rehashes it.
+4. If authentication is successful, generates an access token.
 
 Args:
 email (str): The user's email address.
@@ -58,16 +70,30 @@ password (str): The user's plain-text password.
 Returns:
 dict: A dictionary containing the access token and user information,
 or None if authentication fails.
+
+Raises:
+HashingPoolBusy: If the hashing pool cannot take more work right now.
     """
     # Retrieve the user from the database
-    user = User.query.filter_by(email=email).first()
+    user = find_user_by_email(email)
     if not user:
         return None
 
     # Verify the password
-    if not check_password_hash(user.password, password):
+    if not verify_password(user.password, password):
         return None
 
+    # Upgrade the stored hash to the current parameters while we know the password
+    if needs_rehash(user.password):
+        try:
+            user.password = hash_password(password)
+            db.session.commit()
+        except HashingPoolBusy:
+            # The old hash is still valid; try again on a later login
+            pass
+        except Exception:
+            db.session.rollback()
+
     # Generate an access token with an expiration of 1 hour
     access_token = create_access_token(identity=user.id, expires_delta=timedelta(hours=1))
     return {
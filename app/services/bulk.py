@@ -0,0 +1,174 @@
+# app/services/bulk.py
+"""
+Helpers shared by the bulk create endpoints (POST /api/posts/bulk,
+/api/comments/bulk and /api/media/bulk).
+
+A bulk request is validated item by item. Referenced ids are checked with one
+IN query per referenced table, the valid items are inserted with a single
+multi-row INSERT ... RETURNING, and the response reports the outcome of every
+item in request order.
+"""
+from flask import request, jsonify, current_app
+from sqlalchemy import insert, select
+from app import db
+
+
+class BulkRequestError(ValueError):
+    """
+Raised when the request as a whole is unusable; carries the HTTP status.
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ItemError(ValueError):
+    """
+Raised by item validators for a single invalid item.
+    """
+
+
+def get_bulk_items():
+    """
+Reads the items of a bulk request: either a JSON array or an object with an
+'items' array.
+
+Returns:
+list: The raw items.
+
+Raises:
+BulkRequestError: If the body is not a list or exceeds BULK_MAX_ITEMS.
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('items')
+    if not isinstance(data, list) or not data:
+        raise BulkRequestError("Expected a non-empty JSON array of items (or an object with an 'items' array)")
+
+    max_items = current_app.config['BULK_MAX_ITEMS']
+    if len(data) > max_items:
+        raise BulkRequestError(f'Too many items. At most {max_items} items per request.', 413)
+    return data
+
+
+def parse_int(item, field, required=True):
+    """
+Returns item[field] as an int (or None when optional and absent).
+    """
+    value = item.get(field)
+    if value is None:
+        if required:
+            raise ItemError(f"Missing required field '{field}'")
+        return None
+    if isinstance(value, bool):
+        raise ItemError(f'Invalid {field}. It must be an integer.')
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        raise ItemError(f'Invalid {field}. It must be an integer.')
+
+
+def parse_text(item, field):
+    """
+Returns item[field] as a stripped, non-empty string.
+    """
+    value = item.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise ItemError(f"'{field}' must be a non-empty string")
+    return value.strip()
+
+
+def existing_ids(column, ids):
+    """
+Returns the subset of ids present in column, using a single IN query.
+    """
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return set()
+    return set(db.session.scalars(select(column).where(column.in_(ids))))
+
+
+def insert_rows(model, key_column, rows):
+    """
+Inserts all rows in one multi-row INSERT ... RETURNING statement.
+
+Returns:
+list: The generated keys, in the order of rows.
+    """
+    if not rows:
+        return []
+    if db.engine.dialect.name == 'postgresql':
+        statement = insert(model).returning(key_column, sort_by_parameter_order=True)
+        return list(db.session.scalars(statement, rows))
+    # SQLite numbers the rows of one INSERT in order but does not promise the
+    # RETURNING order, and sort_by_parameter_order would fall back to one
+    # INSERT per row there, so sort the new keys instead
+    return sorted(db.session.scalars(insert(model).returning(key_column), rows))
+
+
+def run_bulk(items, parse_item, references, model, key_column, key_name):
+    """
+Validates, reference-checks and inserts a batch of items in one transaction.
+
+Args:
+items (list): The raw items from the request.
+parse_item (callable): Maps a raw item to a dict of column values; raises ItemError.
+references (dict): Field name -> (column, label) for foreign keys to check.
+model: The model class to insert.
+key_column: Primary key column returned for created rows.
+key_name (str): Name of the key in the per-item results.
+
+Returns:
+tuple: (response body, HTTP status).
+    """
+    results = [None] * len(items)
+    parsed = {}
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise ItemError('Item must be a JSON object')
+            parsed[index] = parse_item(item)
+        except ItemError as e:
+            results[index] = {'index': index, 'status': 'error', 'message': str(e)}
+
+    # One IN query per referenced table for the whole batch
+    for field, (column, label) in references.items():
+        found = existing_ids(column, (values[field] for values in parsed.values()))
+        for index in list(parsed):
+            value = parsed[index][field]
+            if value is not None and value not in found:
+                results[index] = {'index': index, 'status': 'error',
+                                  'message': f'{label} with id {value} not found.'}
+                del parsed[index]
+
+    indexes = sorted(parsed)
+    keys = insert_rows(model, key_column, [parsed[index] for index in indexes])
+    db.session.commit()
+
+    for index, key in zip(indexes, keys):
+        results[index] = {'index': index, 'status': 'created', key_name: key}
+
+    created = len(keys)
+    failed = len(items) - created
+    # 207 Multi-Status whenever any item was rejected
+    return {
+        'message': f'{created} created, {failed} failed',
+        'created': created,
+        'failed': failed,
+        'results': results
+    }, (201 if failed == 0 else 207)
+
+
+def bulk_endpoint(error_message, **kwargs):
+    """
+Runs run_bulk for the current request and maps errors to JSON responses.
+    """
+    try:
+        body, status = run_bulk(get_bulk_items(), **kwargs)
+        return jsonify(body), status
+    except BulkRequestError as e:
+        return jsonify({'message': str(e)}), e.status
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'message': error_message, 'error': str(e)}), 500
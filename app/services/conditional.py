@@ -0,0 +1,95 @@
+# app/services/conditional.py
+"""
+HTTP conditional requests (ETag / Last-Modified / 304 Not Modified).
+
+Read endpoints compute a validator from a small query over the primary keys
+and updated_at values of the rows they would return, answer 304 when the
+client's If-None-Match or If-Modified-Since still matches, and only otherwise
+load and serialize the full rows.
+"""
+import hashlib
+from datetime import datetime, timezone
+from flask import current_app, request
+from app import db
+from app.services.pagination import keyset_query
+
+
+class Validator:
+    """
+The ETag and Last-Modified time of a representation.
+    """
+
+    def __init__(self, parts, last_modified=None):
+        digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+        self.etag = digest
+        # Stored as naive UTC; HTTP dates have whole-second precision
+        self.last_modified = (
+            last_modified.replace(tzinfo=timezone.utc, microsecond=0) if last_modified else None
+        )
+
+    def matches(self):
+        """
+Whether the current request already holds this representation.
+If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        """
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        if request.if_modified_since and self.last_modified:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def apply(self, response):
+        """
+Adds the validators to a response. Clients may cache it but must revalidate.
+        """
+        # Weak: the JSON encoding (and any compression) may vary, the data does not
+        response.set_etag(self.etag, weak=True)
+        if self.last_modified:
+            response.last_modified = self.last_modified
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def not_modified(self):
+        return self.apply(current_app.response_class(status=304))
+
+
+def record_validator(table, key, updated_at):
+    """
+Validator for a single row given its updated_at (a datetime or ISO 8601 string,
+e.g. from a cached record).
+    """
+    if isinstance(updated_at, str):
+        updated_at = datetime.fromisoformat(updated_at)
+    return Validator((table, key, updated_at.isoformat()), updated_at)
+
+
+def row_validator(model, key, value):
+    """
+Validator for a single row, from its updated_at. Returns None if the row does not exist.
+    """
+    updated_at = db.session.query(model.updated_at).filter(key == value).scalar()
+    if updated_at is None:
+        return None
+    return record_validator(model.__tablename__, value, updated_at)
+
+
+def page_validator(query, columns, limit, after=None, descending=False):
+    """
+Validator for one page of a keyset-paginated listing.
+
+Reads only the sort key and updated_at of the rows on the page (plus the
+look-ahead row, so the ETag changes when a next page appears or disappears).
+Any insert, delete or update within the page changes the ETag.
+
+There is no Last-Modified: a row deleted from the page, or pushed off it,
+leaves the newest updated_at unchanged, so If-Modified-Since would answer
+304 for a page that did change.
+
+Raises:
+InvalidPageRequest: If 'after' is not a valid cursor.
+    """
+    model = query.column_descriptions[0]['entity']
+    window = keyset_query(query.with_entities(*columns, model.updated_at), columns, limit, after, descending)
+    rows = window.all()
+    parts = (model.__tablename__, limit, after, [tuple(row) for row in rows])
+    return Validator(parts)
@@ -0,0 +1,182 @@
+# app/services/export.py
+"""
+Streaming exports of study rooms, posts and comments as NDJSON or CSV.
+
+Rows are read with a server-side cursor (stream_results + yield_per, i.e. a
+psycopg named cursor on PostgreSQL) and encoded one batch at a time, so memory
+use depends on EXPORT_BATCH_SIZE and not on the size of the table. Output can
+be gzip-compressed on the fly.
+"""
+import csv
+import io
+import zlib
+from flask import current_app
+from sqlalchemy import select, text
+from app import db
+from app.models import StudyRoom, Post, Comment
+
+EXPORT_TABLES = {
+    'study_rooms': StudyRoom,
+    'posts': Post,
+    'comments': Comment,
+}
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def export_columns(table):
+    return [column.name for column in EXPORT_TABLES[table].__table__.columns]
+
+
+def export_statement(table, since=None):
+    """
+Builds the select() of an export table's rows, in primary key order.
+
+Args:
+table (str): One of EXPORT_TABLES.
+since (datetime): Only rows changed (updated_at, or created_at for tables
+without it) at or after this time, for incremental exports.
+    """
+    model = EXPORT_TABLES[table]
+    statement = select(*model.__table__.columns).order_by(*model.__table__.primary_key.columns)
+    if since is not None:
+        changed_at = getattr(model, 'updated_at', model.created_at)
+        statement = statement.where(changed_at >= since)
+    return statement
+
+
+def export_timeout():
+    """
+SET LOCAL statement for PostgreSQL: exports outlive the per-statement
+timeout applied to API requests.
+    """
+    return text(f"SET LOCAL statement_timeout = {int(current_app.config['EXPORT_STATEMENT_TIMEOUT_MS'])}")
+
+
+def iter_rows(table, since=None, batch_size=None):
+    """
+Yields the rows of an export table as tuples, in primary key order.
+
+Args:
+table (str): One of EXPORT_TABLES.
+since (datetime): Lower bound on the change time, see export_statement().
+batch_size (int): Rows fetched from the server per round trip.
+    """
+    batch_size = batch_size or current_app.config['EXPORT_BATCH_SIZE']
+    statement = export_statement(table, since)
+
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(export_timeout())
+
+    result = db.session.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+        # Ends the read transaction (and the SET LOCAL above)
+        db.session.rollback()
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_encoder(columns):
+    """
+Returns a function encoding a batch of rows as NDJSON bytes.
+    """
+    dumps = current_app.json.dumps
+
+    def encode(batch):
+        return ''.join(dumps(dict(zip(columns, row))) + '\n' for row in batch).encode('utf-8')
+    return encode
+
+
+def csv_encoder(columns):
+    """
+Returns a function encoding a batch of rows as CSV bytes. The output of the
+first call starts with the header row.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    def encode(batch):
+        writer.writerows(
+            [value.isoformat() if hasattr(value, 'isoformat') else value for value in row]
+            for row in batch
+        )
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+    return encode
+
+
+EXPORT_ENCODERS = {
+    'ndjson': ndjson_encoder,
+    'csv': csv_encoder,
+}
+
+
+def encode_batches(batches, fmt, columns):
+    """
+Encodes batches of rows, yielding one chunk per batch (plus the CSV header).
+    """
+    encode = EXPORT_ENCODERS[fmt](columns)
+    header = encode([])
+    if header:
+        yield header
+    for batch in batches:
+        yield encode(batch)
+
+
+def gzip_chunks(chunks, level=6):
+    """
+Compresses a stream of byte chunks into a single gzip member.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def gzip_chunks_async(chunks, level=6):
+    """
+gzip_chunks() for an async iterator of byte chunks.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(table, fmt='ndjson', since=None, compress=False):
+    """
+Returns an iterator of encoded byte chunks for an export.
+
+Args:
+table (str): One of EXPORT_TABLES.
+fmt (str): 'ndjson' or 'csv'.
+since (datetime): Lower bound on the change time, for incremental exports.
+compress (bool): Gzip the output.
+    """
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    columns = export_columns(table)
+    rows = iter_rows(table, since, batch_size)
+    chunks = encode_batches(_batches(rows, batch_size), fmt, columns)
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,324 @@
+# app/services/importer.py
+"""
+Bulk import of users, study rooms, posts and comments from NDJSON or CSV files
+(used by "flask import").
+
+Each file is streamed into a temporary staging table: COPY FROM STDIN on
+PostgreSQL (through database.py), batched executemany on SQLite. Everything
+after that is set-based SQL inside one transaction:
+
+1. Source ids are remapped by an offset (the table's current maximum id), so
+   imported rows never collide with existing ones. Foreign keys pointing at a
+   table imported in the same run are shifted by that table's offset; other
+   foreign keys must already exist in the database.
+2. Foreign keys are checked with one anti-join per reference, and user emails
+   against existing and other imported users. With keep_ids, the source ids
+   are checked against the existing rows instead of being remapped.
+3. Rows are copied from staging into the real tables with INSERT ... SELECT,
+   and PostgreSQL sequences are moved past the new maximum ids.
+
+Nothing is written unless every file imports cleanly (or, with skip_invalid,
+after the rows that fail the checks have been dropped).
+"""
+import csv
+import json
+import logging
+from datetime import datetime
+from app import db
+from app.models import User, StudyRoom, Post, Comment
+
+logger = logging.getLogger(__name__)
+
+# Dependency order: referenced tables first
+IMPORT_TABLES = {
+    'users': User,
+    'study_rooms': StudyRoom,
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+class ImportFailed(Exception):
+    """
+Raised when an import cannot be applied; nothing has been written.
+    """
+
+
+def read_records(stream, fmt):
+    """
+Yields dicts from an NDJSON or CSV text stream. Empty CSV fields become None.
+    """
+    if fmt == 'csv':
+        for record in csv.DictReader(stream):
+            yield {key: (value if value != '' else None) for key, value in record.items()}
+        return
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ImportFailed(f'Line {line_number}: invalid JSON ({e})')
+        if not isinstance(record, dict):
+            raise ImportFailed(f'Line {line_number}: expected a JSON object')
+        yield record
+
+
+def _foreign_keys(table):
+    """
+Returns (column, referenced table, referenced column) for each foreign key.
+    """
+    model = IMPORT_TABLES[table]
+    return [
+        (column.name, fk.column.table.name, fk.column.name)
+        for column in model.__table__.columns
+        for fk in column.foreign_keys
+    ]
+
+
+def _primary_key(table):
+    return IMPORT_TABLES[table].__table__.primary_key.columns[0].name
+
+
+class _Importer:
+    """
+Runs one import on a DB-API connection (psycopg on PostgreSQL, sqlite3 otherwise).
+    """
+
+    def __init__(self, conn, postgres, keep_ids, skip_invalid, progress, batch_size):
+        self.conn = conn
+        self.postgres = postgres
+        self.keep_ids = keep_ids
+        self.skip_invalid = skip_invalid
+        self.progress = progress
+        self.batch_size = batch_size
+        self.offsets = {}
+        self.summary = {}
+
+    def scalar(self, query):
+        cursor = self.conn.execute(query)
+        return cursor.fetchone()[0]
+
+    # ----------------------------------------------------------------
+    # Staging
+    # ----------------------------------------------------------------
+    def stage(self, table, records):
+        model = IMPORT_TABLES[table]
+        known = [column.name for column in model.__table__.columns]
+        staging = f'import_{table}'
+        # CREATE TABLE AS copies column types but no constraints, defaults or
+        # generated columns, so partial rows can be staged and fixed up later
+        on_commit = ' ON COMMIT DROP' if self.postgres else ''
+        self.conn.execute(f"DROP TABLE IF EXISTS {staging}")
+        self.conn.execute(
+            f"CREATE TEMP TABLE {staging}{on_commit} AS SELECT {', '.join(known)} FROM {table} WHERE 1 = 0"
+        )
+
+        records = iter(records)
+        first = next(records, None)
+        if first is None:
+            return 0
+        columns = [key for key in first if key in known]
+        unknown = [key for key in first if key not in known]
+        if unknown:
+            raise ImportFailed(f"{table}: unknown column(s) {', '.join(unknown)}")
+        if _primary_key(table) not in columns:
+            raise ImportFailed(f"{table}: every row needs its source id in '{_primary_key(table)}'")
+
+        datetime_columns = {
+            column.name for column in model.__table__.columns
+            if isinstance(column.type, db.DateTime)
+        }
+
+        def rows():
+            count = 0
+            for record in _chain(first, records):
+                row = []
+                for column in columns:
+                    value = record.get(column)
+                    if column in datetime_columns and isinstance(value, str):
+                        # Normalize ISO 8601 (including a trailing Z) to naive UTC text
+                        value = str(datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None))
+                    row.append(value)
+                yield row
+                count += 1
+                if count % self.batch_size == 0:
+                    self.progress(table, 'staged', count)
+
+        if self.postgres:
+            from database import copy_from_rows
+            count = copy_from_rows(staging, columns, rows(), conn=self.conn)
+        else:
+            count = self._executemany(staging, columns, rows())
+        self.progress(table, 'staged', count)
+        return count
+
+    def _executemany(self, staging, columns, rows):
+        query = f"INSERT INTO {staging} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.conn.executemany(query, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self.conn.executemany(query, batch)
+            count += len(batch)
+        return count
+
+    # ----------------------------------------------------------------
+    # Checks
+    # ----------------------------------------------------------------
+    def check(self, table, imported):
+        staging = f'import_{table}'
+        pk = _primary_key(table)
+        problems = []
+
+        duplicates = self.scalar(
+            f"SELECT COUNT(*) FROM (SELECT {pk} FROM {staging} GROUP BY {pk} HAVING COUNT(*) > 1) d"
+        )
+        if duplicates:
+            problems.append((f'{duplicates} duplicate {pk} value(s)', None))
+
+        if self.keep_ids:
+            # Kept ids are inserted as they are, so they must still be free
+            condition = f"FROM {staging} s WHERE EXISTS (SELECT 1 FROM {table} t WHERE t.{pk} = s.{pk})"
+            taken = self.scalar(f"SELECT COUNT(*) {condition}")
+            if taken:
+                problems.append((f'{taken} {pk} value(s) already in use (--keep-ids)',
+                                 f"DELETE FROM {staging} WHERE {pk} IN (SELECT s.{pk} {condition})"))
+
+        for column, ref_table, ref_column in _foreign_keys(table):
+            # Anti-join against the staged source ids, or against the live table
+            target = f'import_{ref_table}' if ref_table in imported else ref_table
+            condition = (
+                f"FROM {staging} s WHERE s.{column} IS NOT NULL AND NOT EXISTS "
+                f"(SELECT 1 FROM {target} r WHERE r.{ref_column} = s.{column})"
+            )
+            missing = self.scalar(f"SELECT COUNT(*) {condition}")
+            if missing:
+                problems.append((f'{missing} row(s) reference a missing {ref_table}.{ref_column} via {column}',
+                                 f"DELETE FROM {staging} WHERE {pk} IN (SELECT s.{pk} {condition})"))
+
+        if table == 'users':
+            condition = (
+                f"FROM {staging} s WHERE EXISTS (SELECT 1 FROM users u WHERE lower(u.email) = lower(s.email)) "
+                f"OR EXISTS (SELECT 1 FROM {staging} o WHERE lower(o.email) = lower(s.email) AND o.id < s.id)"
+            )
+            taken = self.scalar(f"SELECT COUNT(*) {condition}")
+            if taken:
+                problems.append((f'{taken} email(s) already in use',
+                                 f"DELETE FROM {staging} WHERE id IN (SELECT s.id {condition})"))
+
+        for message, fix in problems:
+            if not self.skip_invalid or fix is None:
+                raise ImportFailed(f'{table}: {message}')
+            self.conn.execute(fix)
+            self.progress(table, f'skipped ({message})', None)
+
+    # ----------------------------------------------------------------
+    # Apply
+    # ----------------------------------------------------------------
+    def apply(self, table):
+        model = IMPORT_TABLES[table]
+        staging = f'import_{table}'
+        pk = _primary_key(table)
+        if self.postgres:
+            # Keep API writes out while the id range is claimed
+            self.conn.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+        self.offsets[table] = 0 if self.keep_ids else self.scalar(f"SELECT COALESCE(MAX({pk}), 0) FROM {table}")
+
+        remap = {column: ref_table for column, ref_table, _ in _foreign_keys(table) if ref_table in self.offsets}
+        columns = [column.name for column in model.__table__.columns]
+        expressions = []
+        for column in columns:
+            if column == pk:
+                expressions.append(f"{pk} + {int(self.offsets[table])}")
+            elif column in remap:
+                expressions.append(f"{column} + {int(self.offsets[remap[column]])}")
+            elif column in ('created_at', 'updated_at'):
+                expressions.append(f"COALESCE({column}, CURRENT_TIMESTAMP)")
+            else:
+                expressions.append(column)
+
+        cursor = self.conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(expressions)} FROM {staging}"
+        )
+        self.summary[table] = {'rows': cursor.rowcount, 'id_offset': self.offsets[table]}
+        self.progress(table, 'inserted', cursor.rowcount)
+
+        if self.postgres:
+            self.conn.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{pk}'), "
+                f"GREATEST((SELECT MAX({pk}) FROM {table}), 1))"
+            )
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def import_files(sources, fmt='ndjson', keep_ids=False, skip_invalid=False, progress=None, batch_size=10000):
+    """
+Imports several tables in one transaction.
+
+Args:
+sources (dict): Table name -> text stream (open file) with its rows.
+fmt (str): 'ndjson' or 'csv'.
+keep_ids (bool): Insert the source ids unchanged instead of offsetting them.
+skip_invalid (bool): Drop rows that fail the checks instead of aborting.
+progress (callable): progress(table, stage, count), called every batch_size rows.
+batch_size (int): Rows per executemany batch / progress report.
+
+Returns:
+dict: Table name -> {'rows': inserted rows, 'id_offset': added to source ids}.
+
+Raises:
+ImportFailed: If a file is invalid or a check fails; nothing is written.
+    """
+    unknown = [table for table in sources if table not in IMPORT_TABLES]
+    if unknown:
+        raise ImportFailed(f"Cannot import {', '.join(unknown)}. Importable tables: {', '.join(IMPORT_TABLES)}")
+    tables = [table for table in IMPORT_TABLES if table in sources]
+    progress = progress or (lambda table, stage, count: logger.info("%s: %s %s", table, stage, count or ''))
+
+    if db.engine.dialect.name == 'postgresql':
+        from database import connection, get_conninfo
+        # COPY needs a psycopg 3 connection, which the engine's driver may not be
+        # (psycopg2 for postgresql:// URLs), so one is opened to the engine's own
+        # database. It commits when the block exits and rolls back on errors.
+        conninfo = get_conninfo(db.engine.url.render_as_string(hide_password=False))
+        with connection(conninfo) as conn:
+            importer = _Importer(conn, True, keep_ids, skip_invalid, progress, batch_size)
+            _run(importer, tables, sources, fmt)
+        return importer.summary
+
+    raw = db.engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        importer = _Importer(conn, False, keep_ids, skip_invalid, progress, batch_size)
+        try:
+            _run(importer, tables, sources, fmt)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            for table in tables:
+                conn.execute(f"DROP TABLE IF EXISTS import_{table}")
+    finally:
+        raw.close()
+    return importer.summary
+
+
+def _run(importer, tables, sources, fmt):
+    for table in tables:
+        importer.stage(table, read_records(sources[table], fmt))
+    for table in tables:
+        importer.check(table, tables)
+    for table in tables:
+        importer.apply(table)
@@ -0,0 +1,228 @@
+# app/services/job_queue.py
+
+import logging
+import multiprocessing
+import time
+import traceback
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, or_
+from app import db
+from app.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Registered handlers keyed by job kind: {kind: (handler, on_failure)}
+_handlers = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot succeed."""
+
+
+def job_handler(kind: str, on_failure=None):
+    """
+Registers a function as the handler for a job kind.
+
+The handler receives the decoded payload dict and runs inside an application
+context. 'on_failure', if given, is called with the payload and the error once
+the job has used up its attempts.
+    """
+    def decorator(func):
+        _handlers[kind] = (func, on_failure)
+        return func
+    return decorator
+
+
+def has_handler(kind: str) -> bool:
+    return kind in _handlers
+
+
+def enqueue(kind: str, payload: dict = None, max_attempts: int = None, session=None) -> Job:
+    """
+Adds a job to the current session (or 'session', e.g. an AsyncSession)
+without committing.
+
+Committing together with the rows the job refers to means the job exists
+exactly when those rows do.
+    """
+    job = Job(
+        kind=kind,
+        payload=payload,
+        max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS']
+    )
+    (session if session is not None else db.session).add(job)
+    return job
+
+
+def claim_next_job():
+    """
+Atomically marks the next runnable job as 'running' and returns it.
+
+A job is runnable when it is queued and due, or when it has been 'running'
+for longer than JOB_LOCK_TIMEOUT seconds (its worker died). The final UPDATE
+only succeeds if nobody claimed the job in between, so several worker
+processes can poll the same table; Postgres also skips rows locked by others.
+
+Every claim counts as an attempt, so a job that keeps killing its worker is
+not reclaimed forever: once a stale job has used up max_attempts it is marked
+'failed' instead.
+
+Returns:
+Job: The claimed job, or None if nothing is runnable.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=current_app.config['JOB_LOCK_TIMEOUT'])
+    runnable = or_(
+        and_(Job.status == 'queued', Job.run_after <= now),
+        and_(Job.status == 'running', Job.locked_at < stale)
+    )
+
+    candidates = (
+        db.session.query(Job.job_id, Job.status, Job.locked_at, Job.attempts, Job.max_attempts)
+        .filter(runnable)
+        .order_by(Job.run_after, Job.job_id)
+        .limit(10)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for job_id, status, locked_at, attempts, max_attempts in candidates:
+        same_lock = Job.locked_at.is_(None) if locked_at is None else Job.locked_at == locked_at
+        unchanged = Job.query.filter(Job.job_id == job_id, Job.status == status, same_lock)
+        if status == 'running' and attempts >= max_attempts:
+            abandoned = unchanged.update({
+                'status': 'failed',
+                'locked_at': None,
+                'last_error': f'Worker stopped responding on attempt {attempts}'
+            }, synchronize_session=False)
+            db.session.commit()
+            if abandoned:
+                logger.warning('Job %s failed: its worker stopped responding on the last attempt', job_id)
+                _run_failure_hook(db.session.get(Job, job_id), PermanentJobError('Worker stopped responding'))
+            continue
+        claimed = unchanged.update(
+            {'status': 'running', 'locked_at': now, 'attempts': Job.attempts + 1},
+            synchronize_session=False
+        )
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+    db.session.commit()
+    return None
+
+
+def run_job(job: Job) -> bool:
+    """
+Runs a claimed job and records the outcome.
+
+Failed jobs are re-queued with exponential backoff (JOB_RETRY_BASE_SECONDS *
+2 ** (attempts - 1)) until max_attempts is reached, then marked 'failed'.
+
+The outcome is only written while the job still carries the locked_at of
+this claim. If the job was reclaimed in the meantime (this worker took longer
+than JOB_LOCK_TIMEOUT), the new owner's state is left alone.
+
+Returns:
+bool: True if the handler succeeded.
+    """
+    job_id, kind, payload = job.job_id, job.kind, job.data
+    locked_at, attempts, max_attempts = job.locked_at, job.attempts, job.max_attempts
+    handler, _ = _handlers.get(kind, (None, None))
+    ours = Job.query.filter_by(job_id=job_id, status='running', locked_at=locked_at)
+    try:
+        if handler is None:
+            raise PermanentJobError(f'No handler registered for job kind {kind}')
+        handler(payload)
+        recorded = ours.update(
+            {'status': 'done', 'locked_at': None, 'last_error': None}, synchronize_session=False
+        )
+        db.session.commit()
+        if not recorded:
+            logger.warning('Job %s (%s) finished after it was reclaimed; result not recorded', job_id, kind)
+        return True
+    except Exception as e:
+        db.session.rollback()
+        give_up = isinstance(e, PermanentJobError) or attempts >= max_attempts
+        logger.warning('Job %s (%s) failed on attempt %s: %s', job_id, kind, attempts, e)
+
+        values = {'locked_at': None, 'last_error': traceback.format_exc()}
+        if give_up:
+            values['status'] = 'failed'
+        else:
+            delay = current_app.config['JOB_RETRY_BASE_SECONDS'] * 2 ** (attempts - 1)
+            values['status'] = 'queued'
+            values['run_after'] = datetime.utcnow() + timedelta(seconds=delay)
+        recorded = ours.update(values, synchronize_session=False)
+        db.session.commit()
+        if not recorded:
+            logger.warning('Job %s (%s) failed after it was reclaimed; result not recorded', job_id, kind)
+        elif give_up:
+            _run_failure_hook(job, e)
+        return False
+
+
+def _run_failure_hook(job: Job, error: Exception) -> None:
+    _, on_failure = _handlers.get(job.kind, (None, None))
+    if on_failure is None:
+        return
+    try:
+        on_failure(job.data, error)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.exception('Failure hook for job %s (%s) raised', job.job_id, job.kind)
+
+
+def run_pending_jobs(max_jobs: int = None) -> int:
+    """
+Runs runnable jobs in the current process until none are left.
+
+Returns:
+int: The number of jobs run.
+    """
+    count = 0
+    while max_jobs is None or count < max_jobs:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
+
+
+def work_forever(app, poll_interval: float = None) -> None:
+    """
+Worker loop: runs jobs as they become due, sleeping when the queue is empty.
+    """
+    with app.app_context():
+        # Import for the side effect of registering the built-in handlers
+        from app.services import media_jobs  # noqa: F401
+
+        interval = poll_interval or app.config['JOB_POLL_INTERVAL']
+        while True:
+            if not run_pending_jobs():
+                time.sleep(interval)
+
+
+def _worker_main(poll_interval):
+    from app import create_app
+    work_forever(create_app(), poll_interval)
+
+
+def run_worker_pool(processes: int, poll_interval: float = None) -> None:
+    """
+Starts 'processes' worker processes, each with its own application and
+database connections, and waits for them.
+    """
+    workers = [
+        multiprocessing.Process(target=_worker_main, args=(poll_interval,), daemon=True)
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
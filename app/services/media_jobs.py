@@ -0,0 +1,164 @@
+# app/services/media_jobs.py
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, delete, or_, update
+from app import db
+from app.models.media import Media
+from app.models.upload_session import UploadSession, UploadChunk
+from app.services.job_queue import job_handler, has_handler, enqueue, PermanentJobError
+from app.services.media_storage import absolute_path, discard_chunks
+
+try:
+    from PIL import Image, UnidentifiedImageError  # Optional: enables image probing and thumbnails
+except ImportError:
+    Image = None
+
+PROCESS_MEDIA = 'media.process'
+# No built-in handler; register one with @job_handler(TRANSCODE_MEDIA) to enable transcoding
+TRANSCODE_MEDIA = 'media.transcode'
+
+
+def enqueue_media_processing(media: Media, session=None) -> None:
+    """
+Marks a flushed Media row as 'pending' and queues its processing job in the
+same transaction, so the upload can return as soon as the bytes are stored.
+    """
+    media.status = 'pending'
+    enqueue(PROCESS_MEDIA, {'media_id': media.media_id}, session=session)
+
+
+def _mark_failed(payload, error):
+    Media.query.filter_by(media_id=payload['media_id']).update(
+        {'status': 'failed'}, synchronize_session=False
+    )
+
+
+@job_handler(PROCESS_MEDIA, on_failure=_mark_failed)
+def process_media(payload):
+    """
+Post-upload processing of a stored file:
+1. Verifies the file still matches its SHA-256.
+2. Probes image dimensions (Pillow) or audio/video duration and size (ffprobe).
+3. Generates a thumbnail for images.
+4. Queues transcoding for audio and video when a handler is registered.
+    """
+    media = db.session.get(Media, payload['media_id'])
+    if media is None:
+        raise PermanentJobError(f"Media {payload['media_id']} no longer exists")
+
+    path = absolute_path(media.file_path)
+    if not os.path.exists(path):
+        raise PermanentJobError(f'File {media.file_path} is missing')
+    if media.content_hash and _sha256(path) != media.content_hash:
+        raise PermanentJobError(f'Checksum mismatch for {media.file_path}')
+
+    if media.type == 'image':
+        _process_image(media, path)
+    else:
+        _probe_with_ffprobe(media, path)
+        if has_handler(TRANSCODE_MEDIA):
+            enqueue(TRANSCODE_MEDIA, {'media_id': media.media_id})
+
+    media.status = 'ready'
+    db.session.commit()
+
+
+def _sha256(path):
+    hasher = hashlib.sha256()
+    chunk_size = current_app.config['MEDIA_UPLOAD_CHUNK_SIZE']
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _process_image(media, path):
+    if Image is None:
+        return
+    try:
+        image = Image.open(path)
+    except UnidentifiedImageError:
+        # The bytes will not change between attempts, so retrying cannot help
+        raise PermanentJobError(f'{media.file_path} is not a readable image')
+    with image:
+        media.width, media.height = image.size
+        image.thumbnail(current_app.config['MEDIA_THUMBNAIL_SIZE'])
+        thumbnail_path = os.path.join('thumbnails', f'{media.content_hash}.png')
+        destination = absolute_path(thumbnail_path)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        image.save(destination, format='PNG')
+        media.thumbnail_path = thumbnail_path
+
+
+def _probe_with_ffprobe(media, path):
+    ffprobe = shutil.which('ffprobe')
+    if ffprobe is None:
+        return
+    try:
+        result = subprocess.run(
+            [ffprobe, '-v', 'error', '-print_format', 'json', '-show_format', '-show_streams', path],
+            capture_output=True, check=True, timeout=60
+        )
+        info = json.loads(result.stdout)
+    except (subprocess.CalledProcessError, json.JSONDecodeError):
+        # As for images: the bytes will not change between attempts
+        raise PermanentJobError(f'{media.file_path} is not a readable {media.type} file')
+    duration = info.get('format', {}).get('duration')
+    if duration is not None:
+        media.duration_seconds = float(duration)
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == 'video':
+            media.width = stream.get('width')
+            media.height = stream.get('height')
+            break
+
+
+def stale_assembly(now: datetime):
+    """
+SQL condition matching sessions left 'assembling' by a finalize call that
+stopped (killed, timed out) more than MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT seconds ago.
+    """
+    cutoff = now - timedelta(seconds=current_app.config['MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT'])
+    return and_(UploadSession.status == 'assembling', UploadSession.locked_at <= cutoff)
+
+
+def expire_upload_sessions(now: datetime = None) -> int:
+    """
+Marks resumable uploads whose expires_at has passed as 'expired' and
+removes their received chunks (rows and part files). Run it periodically
+with "flask expire-uploads".
+
+Open sessions expire, and so do sessions whose finalize call died (see
+stale_assembly()). A chunk that arrives concurrently either extends
+expires_at first, and the session is kept, or finds the session expired
+and is rejected.
+
+Returns:
+int: The number of sessions expired.
+    """
+    now = now or datetime.utcnow()
+    upload_ids = db.session.execute(
+        update(UploadSession)
+        .where(
+            UploadSession.expires_at <= now,
+            or_(UploadSession.status == 'open', stale_assembly(now))
+        )
+        .values(status='expired')
+        .returning(UploadSession.upload_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    if upload_ids:
+        db.session.execute(
+            delete(UploadChunk).where(UploadChunk.upload_id.in_(upload_ids))
+            .execution_options(synchronize_session=False)
+        )
+    db.session.commit()
+    for upload_id in upload_ids:
+        discard_chunks(upload_id)
+    return len(upload_ids)
@@ -0,0 +1,219 @@
+# app/services/media_storage.py
+
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import namedtuple
+from flask import current_app
+
+# Result of storing a file: 'created' is False when identical bytes were already stored
+StoredFile = namedtuple('StoredFile', ['content_hash', 'size', 'file_path', 'created'])
+
+
+class MediaTooLarge(Exception):
+    """Raised when an upload exceeds MEDIA_MAX_UPLOAD_BYTES."""
+
+
+class EmptyUpload(Exception):
+    """Raised when an upload has no content; nothing is stored."""
+
+
+class ChunkSizeMismatch(Exception):
+    """Raised when a resumable upload chunk is not the size its offset requires."""
+
+
+def storage_root() -> str:
+    return current_app.config['MEDIA_STORAGE_ROOT']
+
+
+def content_path(content_hash: str) -> str:
+    """
+Returns the storage path of a blob relative to MEDIA_STORAGE_ROOT.
+Two levels of fan-out keep directories small (e.g. "ab/cd/abcd...").
+    """
+    return os.path.join(content_hash[:2], content_hash[2:4], content_hash)
+
+
+def absolute_path(file_path: str) -> str:
+    return os.path.join(storage_root(), file_path)
+
+
+def temporary_file(subdir: str = 'tmp'):
+    """
+Opens a temporary file on the same filesystem as the storage root, so it can
+later be moved into place with an atomic rename.
+    """
+    directory = os.path.join(storage_root(), subdir)
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=directory, delete=False)
+
+
+class ContentWriter:
+    """
+Writes an upload to a temporary file while hashing it (SHA-256), then moves
+it into content-addressed storage with commit(). Used by store_stream() and
+by uploads whose body arrives asynchronously.
+
+Raises:
+MediaTooLarge: From write(), once more than max_size bytes were written.
+EmptyUpload: From commit(), when nothing was written.
+    """
+
+    def __init__(self, max_size: int = None):
+        self.max_size = max_size or current_app.config['MEDIA_MAX_UPLOAD_BYTES']
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        self._tmp = temporary_file()
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_size:
+            raise MediaTooLarge(f'Upload exceeds {self.max_size} bytes')
+        self._hasher.update(chunk)
+        self._tmp.write(chunk)
+
+    def commit(self) -> StoredFile:
+        if self.size == 0:
+            raise EmptyUpload('Uploaded file is empty')
+        self._tmp.flush()
+        os.fsync(self._tmp.fileno())
+        self._tmp.close()
+        return commit_file(self._tmp.name, self._hasher.hexdigest(), self.size)
+
+    def discard(self) -> None:
+        """Removes the temporary file unless commit() already moved it."""
+        self._tmp.close()
+        if os.path.exists(self._tmp.name):
+            os.unlink(self._tmp.name)
+
+
+def store_stream(stream, chunk_size: int = None, max_size: int = None) -> StoredFile:
+    """
+Copies a binary stream into content-addressed storage.
+
+The stream is read in fixed-size chunks and hashed (SHA-256) while it is
+written to a temporary file, so the upload is never held in memory. The file
+is then renamed to its content path; if that path already exists the new copy
+is discarded and the stored blob is shared.
+
+Args:
+stream: Any object with a read(size) method.
+chunk_size (int): Bytes per read, defaults to MEDIA_UPLOAD_CHUNK_SIZE.
+max_size (int): Upper bound on the stream size, defaults to MEDIA_MAX_UPLOAD_BYTES.
+
+Returns:
+StoredFile: The hash, size and relative path of the stored blob.
+
+Raises:
+MediaTooLarge: If the stream is longer than max_size.
+EmptyUpload: If the stream is empty.
+    """
+    chunk_size = chunk_size or current_app.config['MEDIA_UPLOAD_CHUNK_SIZE']
+    writer = ContentWriter(max_size)
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            writer.write(chunk)
+        return writer.commit()
+    finally:
+        writer.discard()
+
+
+def commit_file(tmp_path: str, content_hash: str, size: int) -> StoredFile:
+    """
+Moves a fully written temporary file to its content-addressed location.
+    """
+    file_path = content_path(content_hash)
+    destination = absolute_path(file_path)
+    if os.path.exists(destination):
+        os.unlink(tmp_path)
+        return StoredFile(content_hash, size, file_path, False)
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(tmp_path, destination)
+    return StoredFile(content_hash, size, file_path, True)
+
+
+def chunk_directory(upload_id: str) -> str:
+    return os.path.join(storage_root(), 'uploads', upload_id)
+
+
+def write_chunk(upload_id: str, chunk_index: int, stream, expected_size: int, claim=None):
+    """
+Streams one chunk of a resumable upload to '<root>/uploads/<id>/<index>.part'.
+
+The chunk is written to a temporary file first and renamed into place, so a
+retried or concurrent PUT of the same chunk never leaves a partial part file.
+The storage root must be shared by all workers for any worker to accept any chunk.
+
+'claim', if given, is called once the body is on disk and right before the
+rename. When it returns False the chunk is dropped and None is returned, so
+the caller can check that the upload still accepts chunks and keep it locked
+while the part file changes.
+
+Raises:
+ChunkSizeMismatch: If the body is not exactly expected_size bytes.
+    """
+    chunk_size = current_app.config['MEDIA_UPLOAD_CHUNK_SIZE']
+    directory = chunk_directory(upload_id)
+    os.makedirs(directory, exist_ok=True)
+
+    size = 0
+    tmp = tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False)
+    try:
+        with tmp:
+            while True:
+                data = stream.read(chunk_size)
+                if not data:
+                    break
+                size += len(data)
+                if size > expected_size:
+                    break
+                tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        if size != expected_size:
+            raise ChunkSizeMismatch(f'Chunk {chunk_index} must be {expected_size} bytes')
+        if claim is not None and not claim():
+            return None
+        os.replace(tmp.name, os.path.join(directory, f'{chunk_index}.part'))
+        return size
+    finally:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+
+
+def assemble_chunks(upload_id: str, chunk_count: int) -> StoredFile:
+    """
+Concatenates the part files of an upload into content-addressed storage,
+hashing the bytes on the way through.
+    """
+    read_size = current_app.config['MEDIA_UPLOAD_CHUNK_SIZE']
+    directory = chunk_directory(upload_id)
+    hasher = hashlib.sha256()
+    size = 0
+    tmp = temporary_file()
+    try:
+        with tmp:
+            for chunk_index in range(chunk_count):
+                with open(os.path.join(directory, f'{chunk_index}.part'), 'rb') as part:
+                    while True:
+                        data = part.read(read_size)
+                        if not data:
+                            break
+                        size += len(data)
+                        hasher.update(data)
+                        tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        return commit_file(tmp.name, hasher.hexdigest(), size)
+    finally:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+
+
+def discard_chunks(upload_id: str) -> None:
+    shutil.rmtree(chunk_directory(upload_id), ignore_errors=True)
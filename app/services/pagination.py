@@ -0,0 +1,142 @@
+# app/services/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from flask import current_app, request
+from sqlalchemy import and_, or_
+
+
+class InvalidPageRequest(ValueError):
+    """Raised when the 'limit' or 'after' query parameters cannot be used."""
+
+
+def encode_cursor(values: list) -> str:
+    """
+Encodes the sort-key values of the last row on a page into an opaque cursor.
+
+Datetimes are stored as ISO 8601 strings and restored by decode_cursor().
+    """
+    payload = [
+        {'dt': value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+Decodes a cursor produced by encode_cursor().
+
+Raises:
+InvalidPageRequest: If the cursor is malformed or does not hold 'size' values.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError('unexpected cursor shape')
+        return [
+            datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise InvalidPageRequest('Invalid cursor')
+
+
+def get_page_args() -> tuple:
+    """
+Reads 'limit' and 'after' from the query string.
+
+The limit defaults to PAGINATION_DEFAULT_LIMIT and is capped at
+PAGINATION_MAX_LIMIT so a client can never request an unbounded page.
+
+Returns:
+tuple: (limit, after) where 'after' is the raw cursor string or None.
+    """
+    return parse_page_args(request.args, current_app.config)
+
+
+def parse_page_args(args, config) -> tuple:
+    """
+get_page_args() for an explicit query-string mapping and configuration,
+e.g. outside of a Flask request.
+    """
+    default_limit = config['PAGINATION_DEFAULT_LIMIT']
+    max_limit = config['PAGINATION_MAX_LIMIT']
+
+    raw_limit = args.get('limit')
+    if raw_limit is None or raw_limit == '':
+        limit = default_limit
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise InvalidPageRequest('Limit must be an integer')
+        if limit <= 0:
+            raise InvalidPageRequest('Limit must be greater than zero')
+
+    after = args.get('after') or None
+    return min(limit, max_limit), after
+
+
+def keyset_query(query, columns: list, limit: int, after: str = None, descending: bool = False):
+    """
+Restricts a query to one page of the key order, plus one look-ahead row
+that tells whether another page exists. See paginate() for the arguments.
+
+Raises:
+InvalidPageRequest: If 'after' is not a valid cursor for these columns.
+    """
+    if after is not None:
+        values = decode_cursor(after, len(columns))
+        # Expand (a, b) > (x, y) into a OR-chain so every backend can use the index
+        clauses = []
+        for position, column in enumerate(columns):
+            equal = [columns[i] == values[i] for i in range(position)]
+            beyond = column < values[position] if descending else column > values[position]
+            clauses.append(and_(*equal, beyond))
+        query = query.filter(or_(*clauses))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*order).limit(limit + 1)
+
+
+def paginate(query, columns: list, limit: int, after: str = None, descending: bool = False) -> tuple:
+    """
+Applies keyset pagination to a query.
+
+The page is ordered by 'columns' (all ascending or all descending) and starts
+strictly after the row identified by 'after'. The last column should be
+unique, usually the primary key, so ties in earlier columns are broken.
+
+Args:
+query: A SQLAlchemy query or select() returning ORM rows.
+columns (list): Model attributes forming the sort key.
+limit (int): Maximum number of rows to return.
+after (str): Cursor from a previous page, or None for the first page.
+descending (bool): Whether to walk the key from newest to oldest.
+
+Returns:
+tuple: (rows, next_cursor) where next_cursor is None on the last page.
+    """
+    # Fetch one extra row to find out whether another page exists
+    rows = keyset_query(query, columns, limit, after, descending).all()
+    return split_page(rows, columns, limit)
+
+
+def split_page(rows: list, columns: list, limit: int) -> tuple:
+    """
+Drops the look-ahead row fetched by keyset_query() and builds the cursor of
+the next page from the last row kept.
+
+Returns:
+tuple: (rows, next_cursor) where next_cursor is None on the last page.
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+    return rows, next_cursor
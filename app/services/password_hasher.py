@@ -0,0 +1,121 @@
+# app/services/password_hasher.py
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HashingPoolBusy(Exception):
+    """Raised when the hashing pool has too much queued work to accept more."""
+
+    def __init__(self, retry_after: int):
+        super().__init__('Password hashing pool is busy')
+        self.retry_after = retry_after
+
+
+_executor = None
+_executor_pid = None
+_pending = 0
+_lock = threading.Lock()
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """
+Returns this process's hashing pool, creating it on first use.
+
+The pool is tied to the PID that created it so a forked server worker never
+reuses the parent's pool.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        # forkserver avoids forking a process that already runs request threads
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def _run(func, *args):
+    """
+Runs a hashing function in the pool, or inline when PASSWORD_HASH_WORKERS is 0.
+
+Raises:
+HashingPoolBusy: If PASSWORD_HASH_MAX_PENDING calls are already in flight,
+the call does not finish within PASSWORD_HASH_TIMEOUT seconds, or a pool
+worker died (the pool is then replaced on the next call).
+    """
+    global _pending
+    config = current_app.config
+    workers = config['PASSWORD_HASH_WORKERS']
+    if workers <= 0:
+        return func(*args)
+
+    retry_after = config['PASSWORD_HASH_RETRY_AFTER']
+    with _lock:
+        if _pending >= config['PASSWORD_HASH_MAX_PENDING']:
+            raise HashingPoolBusy(retry_after)
+        _pending += 1
+        executor = _get_executor(workers)
+
+    try:
+        future = executor.submit(func, *args)
+    except BrokenProcessPool:
+        _release()
+        _discard_executor(executor)
+        raise HashingPoolBusy(retry_after)
+    except BaseException:
+        _release()
+        raise
+    # A call that timed out still occupies the pool until it finishes, so the
+    # slot is only given back when the future completes
+    future.add_done_callback(_release)
+
+    try:
+        return future.result(timeout=config['PASSWORD_HASH_TIMEOUT'])
+    except FutureTimeoutError:
+        raise HashingPoolBusy(retry_after)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed by the OOM killer); start a fresh pool next time
+        _discard_executor(executor)
+        raise HashingPoolBusy(retry_after)
+
+
+def _release(future=None):
+    global _pending
+    with _lock:
+        _pending -= 1
+
+
+def _discard_executor(executor):
+    global _executor
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def hash_password(password: str) -> str:
+    """
+Hashes a password with PASSWORD_HASH_METHOD outside the request thread.
+    """
+    return _run(generate_password_hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+Checks a password against a stored hash outside the request thread.
+    """
+    return _run(check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """
+Tells whether a stored hash was made with parameters other than the
+configured PASSWORD_HASH_METHOD (e.g. "scrypt:32768:8:1").
+    """
+    return password_hash.split('$', 1)[0] != current_app.config['PASSWORD_HASH_METHOD']
@@ -0,0 +1,315 @@
+# app/services/record_cache.py
+"""
+Read-through cache of serialized study room and user records.
+
+Lookups go through a per-worker LRU with a short TTL, then an optional shared
+backend (Redis, or an in-memory stand-in for tests), then the database.
+Records are invalidated after every commit that inserted, changed or deleted
+a StudyRoom or User (SQLAlchemy session events), so writes through the ORM
+are visible immediately on this worker and through the shared backend.
+Other workers' local entries expire after RECORD_CACHE_TTL seconds. Code that
+changes these tables with raw SQL should call invalidate() itself.
+
+Missing records are not cached, so a newly created room or user is found on
+the next lookup.
+
+A record loaded from the database is only stored if no invalidation of its key
+happened while it was being loaded: invalidate() bumps a per-key generation in
+the shared backend, and the store is skipped when it changed. Otherwise a
+reader that loaded just before a writer's commit could put the old record back
+for RECORD_CACHE_SHARED_TTL seconds.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app import db
+from app.models import StudyRoom, User
+from app.metrics import RECORD_CACHE_LOOKUPS
+
+
+def room_record(room) -> dict:
+    return {
+        'room_id': room.room_id,
+        'name': room.name,
+        'description': room.description,
+        'capacity': room.capacity,
+        'creator_id': room.creator_id,
+        'updated_at': room.updated_at.isoformat()
+    }
+
+
+def user_record(user) -> dict:
+    # Never includes the password hash
+    return {
+        'id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'updated_at': user.updated_at.isoformat()
+    }
+
+
+# Kind -> (model, serializer)
+RECORD_KINDS = {
+    'study_room': (StudyRoom, room_record),
+    'user': (User, user_record),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _) in RECORD_KINDS.items()}
+
+
+class InMemoryCacheBackend:
+    """
+Process-local stand-in for a shared cache, for tests and single-process
+development servers.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._values[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float, generation: int = None) -> bool:
+        with self._lock:
+            if generation is not None and self._generations.get(key, 0) != generation:
+                return False
+            self._values[key] = (value, time.monotonic() + ttl)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+
+class RedisCacheBackend:
+    """
+Shares cached records between workers and nodes through a Redis-compatible server.
+    """
+
+    # Generation keys outlive any record; a lost one only reads as 0 again,
+    # which still differs from the value a reader saw before it expired
+    GENERATION_TTL = 24 * 60 * 60
+
+    def __init__(self, url: str, prefix: str = 'record:'):
+        import redis  # Optional dependency, only needed for this backend
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._watch_error = redis.WatchError
+
+    def get(self, key: str):
+        value = self._client.get(self._prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key: str, value: str, ttl: float, generation: int = None) -> bool:
+        if generation is None:
+            self._client.set(self._prefix + key, value, ex=max(1, int(ttl)))
+            return True
+        generation_key = self._generation_key(key)
+        with self._client.pipeline() as pipe:
+            try:
+                # The SET is discarded if the generation changes after WATCH
+                pipe.watch(generation_key)
+                if int(pipe.get(generation_key) or 0) != generation:
+                    return False
+                pipe.multi()
+                pipe.set(self._prefix + key, value, ex=max(1, int(ttl)))
+                pipe.execute()
+                return True
+            except self._watch_error:
+                return False
+
+    def delete(self, key: str) -> None:
+        generation_key = self._generation_key(key)
+        with self._client.pipeline() as pipe:
+            pipe.delete(self._prefix + key)
+            pipe.incr(generation_key)
+            pipe.expire(generation_key, self.GENERATION_TTL)
+            pipe.execute()
+
+    def generation(self, key: str) -> int:
+        return int(self._client.get(self._generation_key(key)) or 0)
+
+    def _generation_key(self, key):
+        return f'{self._prefix}generation:{key}'
+
+
+class RecordCache:
+    """
+Two-tier cache: a local LRU with a TTL in front of an optional shared backend.
+    """
+
+    def __init__(self, ttl: float = 5.0, max_entries: int = 10000, backend=None, shared_ttl: float = 300.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.backend = backend
+        self.shared_ttl = shared_ttl
+        self._entries = OrderedDict()
+        # Bumped by every invalidate(), so a load that overlapped one is not kept locally
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key, loader):
+        """
+Returns the cached record for (kind, key), calling loader() on a miss.
+loader returns the serialized record or None if it does not exist.
+        """
+        cache_key = f'{kind}:{key}'
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                record, valid_until = entry
+                if valid_until > now:
+                    self._entries.move_to_end(cache_key)
+                    RECORD_CACHE_LOOKUPS.labels(kind, 'local_hit').inc()
+                    return record
+                del self._entries[cache_key]
+
+            invalidations = self._invalidations
+
+        generation = None
+        if self.backend is not None:
+            value = self.backend.get(cache_key)
+            if value is not None:
+                record = json.loads(value)
+                self._remember(cache_key, record, now, invalidations)
+                RECORD_CACHE_LOOKUPS.labels(kind, 'shared_hit').inc()
+                return record
+            generation = self.backend.generation(cache_key)
+
+        RECORD_CACHE_LOOKUPS.labels(kind, 'miss').inc()
+        record = loader()
+        if record is not None:
+            if self.backend is not None and not self.backend.set(
+                cache_key, json.dumps(record), self.shared_ttl, generation
+            ):
+                # Invalidated while loading: the record may predate that write
+                return record
+            self._remember(cache_key, record, now, invalidations)
+        return record
+
+    def invalidate(self, kind: str, key) -> None:
+        cache_key = f'{kind}:{key}'
+        with self._lock:
+            self._entries.pop(cache_key, None)
+            self._invalidations += 1
+        if self.backend is not None:
+            self.backend.delete(cache_key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, cache_key, record, now, invalidations):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            if self._invalidations != invalidations:
+                return
+            self._entries[cache_key] = (record, now + self.ttl)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def create_record_cache(config):
+    """
+Builds the record cache. RECORD_CACHE_BACKEND selects the shared tier:
+'none' (local LRU only), 'redis' or 'memory'.
+    """
+    backend_name = config.get('RECORD_CACHE_BACKEND', 'none').lower()
+    if backend_name == 'none':
+        backend = None
+    elif backend_name == 'redis':
+        backend = RedisCacheBackend(config['REDIS_URL'])
+    elif backend_name == 'memory':
+        backend = InMemoryCacheBackend()
+    else:
+        raise ValueError(f"Unknown RECORD_CACHE_BACKEND: {backend_name}")
+    return RecordCache(
+        ttl=config.get('RECORD_CACHE_TTL', 5.0),
+        max_entries=config.get('RECORD_CACHE_SIZE', 10000),
+        backend=backend,
+        shared_ttl=config.get('RECORD_CACHE_SHARED_TTL', 300.0)
+    )
+
+
+def get_record_cache():
+    """
+Returns the record cache registered on the current application.
+    """
+    return current_app.extensions['record_cache']
+
+
+def _get_record(kind, key):
+    model, serialize = RECORD_KINDS[kind]
+
+    def load():
+        obj = db.session.get(model, key)
+        return serialize(obj) if obj is not None else None
+
+    return get_record_cache().get(kind, key, load)
+
+
+def get_room_record(room_id):
+    """
+Returns the serialized study room, or None if it does not exist.
+    """
+    return _get_record('study_room', room_id)
+
+
+def get_user_record(user_id):
+    """
+Returns the serialized user (without the password), or None if it does not exist.
+    """
+    return _get_record('user', user_id)
+
+
+# --------------------------
+# Invalidation from session events
+# --------------------------
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    changed = session.info.setdefault('record_cache_changed', set())
+    for obj in list(session.dirty) + list(session.deleted):
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind is not None:
+            key = inspect(obj).identity
+            if key is not None:
+                changed.add((kind, key[0]))
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session):
+    changed = session.info.pop('record_cache_changed', None)
+    if not changed or not has_app_context():
+        return
+    cache = current_app.extensions.get('record_cache')
+    if cache is None:
+        return
+    for kind, key in changed:
+        cache.invalidate(kind, key)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_rolled_back(session):
+    session.info.pop('record_cache_changed', None)
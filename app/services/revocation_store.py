@@ -0,0 +1,198 @@
+# app/services/revocation_store.py
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from app import db
+from app.models.revoked_token import RevokedToken
+
+
+class InMemoryRevocationStore:
+    """
+Keeps revoked token identifiers in a process-local dict.
+
+Only suitable for tests and single-process development servers, because
+revocations are not visible to other workers.
+    """
+
+    def __init__(self):
+        self._expiry = {}
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: datetime = None) -> None:
+        with self._lock:
+            self._expiry[jti] = expires_at
+
+    def is_revoked(self, jti: str) -> bool:
+        with self._lock:
+            if jti not in self._expiry:
+                return False
+            expires_at = self._expiry[jti]
+            if expires_at is not None and expires_at <= datetime.utcnow():
+                del self._expiry[jti]
+                return False
+            return True
+
+    def purge_expired(self) -> int:
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [jti for jti, exp in self._expiry.items() if exp is not None and exp <= now]
+            for jti in expired:
+                del self._expiry[jti]
+        return len(expired)
+
+
+class DatabaseRevocationStore:
+    """
+Stores revoked token identifiers in the 'revoked_tokens' table so every
+worker and node sees the same revocations.
+    """
+
+    def revoke(self, jti: str, expires_at: datetime = None) -> None:
+        try:
+            db.session.merge(RevokedToken(jti=jti, expires_at=expires_at))
+            # Expired rows can never match a valid token; drop them as we go
+            self.purge_expired(commit=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def is_revoked(self, jti: str) -> bool:
+        expires_at = db.session.query(RevokedToken.expires_at).filter_by(jti=jti).first()
+        if expires_at is None:
+            return False
+        return expires_at[0] is None or expires_at[0] > datetime.utcnow()
+
+    def purge_expired(self, commit: bool = True) -> int:
+        deleted = RevokedToken.query.filter(
+            RevokedToken.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+        if commit:
+            db.session.commit()
+        return deleted
+
+
+class RedisRevocationStore:
+    """
+Stores revoked token identifiers in a Redis-compatible server.
+Each key expires together with the token, so the store never grows unbounded.
+    """
+
+    def __init__(self, url: str, prefix: str = 'revoked_jti:'):
+        import redis  # Optional dependency, only needed for this backend
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def revoke(self, jti: str, expires_at: datetime = None) -> None:
+        ttl = None
+        if expires_at is not None:
+            ttl = max(1, int((expires_at - datetime.utcnow()).total_seconds()))
+        self._client.set(self._prefix + jti, 1, ex=ttl)
+
+    def is_revoked(self, jti: str) -> bool:
+        return bool(self._client.exists(self._prefix + jti))
+
+    def purge_expired(self) -> int:
+        # Redis expires keys on its own
+        return 0
+
+
+class CachedRevocationStore:
+    """
+Wraps a shared store with a small per-worker cache.
+
+Revoked identifiers are cached until the token expires, since a revocation is
+never undone. Identifiers that are not revoked are cached for 'ttl' seconds
+only, which bounds how long a logout on another worker can go unnoticed.
+    """
+
+    def __init__(self, backend, ttl: float = 2.0, max_entries: int = 10000):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, expires_at: datetime = None) -> None:
+        self.backend.revoke(jti, expires_at)
+        self._remember(jti, True, self._revoked_until(expires_at))
+
+    def is_revoked(self, jti: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is not None:
+                revoked, valid_until = entry
+                if valid_until > now:
+                    self._entries.move_to_end(jti)
+                    return revoked
+                del self._entries[jti]
+
+        revoked = self.backend.is_revoked(jti)
+        if revoked:
+            # The backend knows the real expiry; the JWT layer rejects expired tokens anyway
+            self._remember(jti, True, float('inf'))
+        else:
+            self._remember(jti, False, now + self.ttl)
+        return revoked
+
+    def purge_expired(self) -> int:
+        return self.backend.purge_expired()
+
+    def _revoked_until(self, expires_at):
+        if expires_at is None:
+            return float('inf')
+        remaining = (expires_at - datetime.utcnow()).total_seconds()
+        return time.monotonic() + max(remaining, 0)
+
+    def _remember(self, jti, revoked, valid_until):
+        with self._lock:
+            self._entries[jti] = (revoked, valid_until)
+            self._entries.move_to_end(jti)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def create_revocation_store(config):
+    """
+Builds the revocation store selected by JWT_REVOCATION_BACKEND
+('database', 'redis' or 'memory') and wraps it in the local cache.
+    """
+    backend_name = config.get('JWT_REVOCATION_BACKEND', 'database').lower()
+    if backend_name == 'database':
+        backend = DatabaseRevocationStore()
+    elif backend_name == 'redis':
+        backend = RedisRevocationStore(config['REDIS_URL'])
+    elif backend_name == 'memory':
+        backend = InMemoryRevocationStore()
+    else:
+        raise ValueError(f"Unknown JWT_REVOCATION_BACKEND: {backend_name}")
+
+    ttl = config.get('JWT_REVOCATION_CACHE_TTL', 2.0)
+    if not ttl:
+        return backend
+    return CachedRevocationStore(
+        backend,
+        ttl=ttl,
+        max_entries=config.get('JWT_REVOCATION_CACHE_SIZE', 10000)
+    )
+
+
+def get_revocation_store():
+    """
+Returns the revocation store registered on the current application.
+    """
+    return current_app.extensions['revocation_store']
+
+
+def revoke_token(jwt_payload: dict) -> None:
+    """
+Revokes a decoded JWT until its 'exp' claim passes.
+    """
+    exp = jwt_payload.get('exp')
+    expires_at = datetime.utcfromtimestamp(exp) if exp is not None else None
+    get_revocation_store().revoke(jwt_payload['jti'], expires_at)
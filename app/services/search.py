@@ -0,0 +1,119 @@
+# app/services/search.py
+
+from sqlalchemy import text, Integer, Float, DateTime, Text
+from app import db
+from app.services.pagination import encode_cursor, decode_cursor
+
+SEARCH_TYPES = ['posts', 'comments']
+
+# Matching rows per search type; {room_filter} is filled in per request
+_POSTGRES_SOURCES = {
+    'posts': """
+        SELECT p.post_id AS id, p.post_id AS post_id, p.room_id, p.creator_id, p.content, p.created_at,
+               ts_rank_cd(p.search_vector, q)::float8 AS score
+        FROM posts p
+        CROSS JOIN websearch_to_tsquery('english', :q) q
+        WHERE p.search_vector @@ q {room_filter}
+    """,
+    'comments': """
+        SELECT c.comment_id AS id, c.post_id, p.room_id, c.creator_id, c.content, c.created_at,
+               ts_rank_cd(c.search_vector, q)::float8 AS score
+        FROM comments c
+        JOIN posts p ON p.post_id = c.post_id
+        CROSS JOIN websearch_to_tsquery('english', :q) q
+        WHERE c.search_vector @@ q {room_filter}
+    """,
+}
+
+# bm25() is lower for better matches, so it is negated to sort like ts_rank
+_SQLITE_SOURCES = {
+    'posts': """
+        SELECT p.post_id AS id, p.post_id AS post_id, p.room_id, p.creator_id, p.content, p.created_at,
+               -bm25(posts_fts) AS score
+        FROM posts_fts
+        JOIN posts p ON p.post_id = posts_fts.rowid
+        WHERE posts_fts MATCH :q {room_filter}
+    """,
+    'comments': """
+        SELECT c.comment_id AS id, c.post_id, p.room_id, c.creator_id, c.content, c.created_at,
+               -bm25(comments_fts) AS score
+        FROM comments_fts
+        JOIN comments c ON c.comment_id = comments_fts.rowid
+        JOIN posts p ON p.post_id = c.post_id
+        WHERE comments_fts MATCH :q {room_filter}
+    """,
+}
+
+
+def _fts5_query(query_text: str) -> str:
+    """
+Quotes every word so user input is matched literally by FTS5 (implicit AND)
+instead of being parsed as FTS5 query syntax.
+    """
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in query_text.split())
+
+
+def search(query_text: str, search_type: str = 'posts', room_id: int = None, limit: int = 20, after: str = None):
+    """
+Runs a ranked full-text search over posts or comments.
+
+Results are ordered by relevance, then id, and paginated on that key: the
+cursor holds the (score, id) of the last result of the page.
+
+Args:
+query_text (str): The user's search terms.
+search_type (str): 'posts' or 'comments'.
+room_id (int): Restricts the search to one study room if given.
+limit (int): Page size.
+after (str): Cursor from the previous page.
+
+Returns:
+tuple: (results, next_cursor) where results are dicts with a 'score'.
+    """
+    if db.engine.dialect.name == 'postgresql':
+        source = _POSTGRES_SOURCES[search_type]
+        match = query_text
+    else:
+        source = _SQLITE_SOURCES[search_type]
+        match = _fts5_query(query_text)
+
+    params = {'q': match, 'limit': limit + 1}
+    room_filter = ''
+    if room_id is not None:
+        room_filter = 'AND p.room_id = :room_id'
+        params['room_id'] = room_id
+
+    cursor_filter = ''
+    if after is not None:
+        params['after_score'], params['after_id'] = decode_cursor(after, 2)
+        cursor_filter = 'WHERE score < :after_score OR (score = :after_score AND id > :after_id)'
+
+    statement = text(
+        f"SELECT * FROM ({source.format(room_filter=room_filter)}) ranked "
+        f"{cursor_filter} ORDER BY score DESC, id ASC LIMIT :limit"
+    ).columns(
+        id=Integer, post_id=Integer, room_id=Integer, creator_id=Integer,
+        content=Text, created_at=DateTime, score=Float
+    )
+    rows = db.session.execute(statement, params).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].id])
+
+    key = 'post_id' if search_type == 'posts' else 'comment_id'
+    results = []
+    for row in rows:
+        result = {
+            key: row.id,
+            'room_id': row.room_id,
+            'creator_id': row.creator_id,
+            'content': row.content,
+            'created_at': row.created_at.isoformat(),
+            'score': row.score
+        }
+        if search_type == 'comments':
+            result['post_id'] = row.post_id
+        results.append(result)
+    return results, next_cursor
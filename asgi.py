@@ -0,0 +1,7 @@
+# asgi.py
+from app.asgi import create_asgi_app
+
+# ASGI entry point: "uvicorn asgi:application" (or gunicorn with uvicorn workers).
+# Feeds, exports and raw media uploads run as native coroutines; every other
+# endpoint is served by the Flask app. The schema is managed separately, as for run.py.
+application = create_asgi_app()
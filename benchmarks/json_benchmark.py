@@ -0,0 +1,60 @@
+# benchmarks/json_benchmark.py
+"""
+Micro-benchmark of the JSON provider against Flask's stdlib provider.
+
+Serializes and parses list payloads shaped like GET /api/users and
+GET /api/study_rooms pages. Run from the project root:
+
+    python -m benchmarks.json_benchmark [--rows 5000] [--repeat 20]
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.json_provider import JSONProvider, orjson
+
+
+def make_payload(rows):
+    start = datetime(2024, 1, 1, 8, 30)
+    return {
+        'study_rooms': [{
+            'room_id': i,
+            'name': f'Study room {i} – café',
+            'capacity': 10 + i % 40,
+            'creator_id': i % 97,
+            'created_at': (start + timedelta(minutes=i)).isoformat()
+        } for i in range(rows)],
+        'next_cursor': 'WzUwMDBd'
+    }
+
+
+def measure(provider, app, payload, body, repeat):
+    with app.test_request_context():
+        dump = min(timeit.repeat(lambda: provider.response(payload), number=1, repeat=repeat))
+    load = min(timeit.repeat(lambda: provider.loads(body), number=1, repeat=repeat))
+    return dump, load
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    payload = make_payload(args.rows)
+    stdlib = DefaultJSONProvider(app)
+    fast = JSONProvider(app)
+    body = stdlib.dumps(payload).encode('utf-8')
+
+    print(f'{args.rows} rows, {len(body) / 1024:.0f} KiB, orjson {"installed" if orjson else "NOT installed"}')
+    base_dump, base_load = measure(stdlib, app, payload, body, args.repeat)
+    dump, load = measure(fast, app, payload, body, args.repeat)
+    print(f'{"":10}{"stdlib":>12}{"provider":>12}{"speedup":>10}')
+    print(f'{"response":10}{base_dump * 1000:>10.2f}ms{dump * 1000:>10.2f}ms{base_dump / dump:>9.1f}x')
+    print(f'{"loads":10}{base_load * 1000:>10.2f}ms{load * 1000:>10.2f}ms{base_load / load:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,455 @@
+# benchmarks/load_test.py
+"""
+Seed, load-test and compare runs of the API.
+
+Runs offline against SQLite or a local PostgreSQL, either in-process through
+the Flask test client or against a running server over HTTP. Results are
+written as JSON so runs from different commits can be compared.
+
+    # Seed realistic volumes (once per database)
+    python -m benchmarks.load_test seed --database-url sqlite:///bench.db --users 100000 --posts 1000000
+
+    # Drive every endpoint with 16 concurrent clients for 10 s each
+    python -m benchmarks.load_test run --database-url sqlite:///bench.db -c 16 -d 10 -o before.json
+    python -m benchmarks.load_test run --database-url sqlite:///bench.db --base-url http://127.0.0.1:5000 -o after.json
+
+    # Compare two runs (exit status 1 if a scenario's p95 regressed past the threshold)
+    python -m benchmarks.load_test compare before.json after.json --threshold 10
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+# Password of every seeded user, used by the login scenario
+SEED_PASSWORD = 'benchmark-password'
+SEED_EMAIL = 'bench-user-{}@example.com'
+# Ids sampled from each table to build requests
+ID_SAMPLE_SIZE = 10000
+
+
+# --------------------------
+# Application setup
+# --------------------------
+def make_app(database_url):
+    """
+Creates the application for a benchmark database, without touching .env settings.
+    """
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app
+    from app.config import Config, engine_options
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        SQLALCHEMY_ENGINE_OPTIONS = engine_options(database_url)
+
+    return create_app(BenchmarkConfig)
+
+
+# --------------------------
+# Seeding
+# --------------------------
+def _insert_batches(model, rows, batch_size, label):
+    from sqlalchemy import insert
+    from app import db
+
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(insert(model), batch)
+            db.session.commit()
+            count += len(batch)
+            batch = []
+            print(f'  {label}: {count}', end='\r', file=sys.stderr)
+    if batch:
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        count += len(batch)
+    print(f'  {label}: {count}', file=sys.stderr)
+
+
+def seed(app, users, rooms, posts, comments, batch_size, rng):
+    """
+Fills an empty database with generated users, rooms, posts and comments.
+    """
+    from sqlalchemy import select
+    from app import db
+    from app.models import User, StudyRoom, Post, Comment
+    from app.services.password_hasher import hash_password
+
+    with app.app_context():
+        result = app.test_cli_runner().invoke(args=['migrate'])
+        if result.exit_code != 0:
+            raise SystemExit(f'Schema setup failed: {result.output}')
+        if db.session.scalar(select(User.id).limit(1)) is not None:
+            raise SystemExit('The database already has users; seed an empty database.')
+
+        # Hashing is deliberately slow, so every seeded user shares one hash
+        password = hash_password(SEED_PASSWORD)
+        start = datetime.utcnow() - timedelta(days=365)
+
+        def timestamp():
+            return start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+        _insert_batches(User, ({
+            'username': f'bench_user_{i}', 'email': SEED_EMAIL.format(i),
+            'password': password, 'created_at': timestamp(), 'updated_at': timestamp()
+        } for i in range(users)), batch_size, 'users')
+        user_ids = db.session.scalars(select(User.id)).all()
+
+        _insert_batches(StudyRoom, ({
+            'name': f'Study room {i}', 'description': 'Generated for benchmarks',
+            'capacity': rng.randint(2, 50), 'creator_id': rng.choice(user_ids),
+            'created_at': timestamp(), 'updated_at': timestamp()
+        } for i in range(rooms)), batch_size, 'study_rooms')
+        room_ids = db.session.scalars(select(StudyRoom.room_id)).all()
+
+        _insert_batches(Post, ({
+            'content': f'Benchmark post {i} about chapter {rng.randint(1, 30)} and exam preparation',
+            'creator_id': rng.choice(user_ids), 'room_id': rng.choice(room_ids), 'created_at': timestamp()
+        } for i in range(posts)), batch_size, 'posts')
+        first_post, last_post = db.session.execute(
+            select(db.func.min(Post.post_id), db.func.max(Post.post_id))
+        ).one()
+
+        if first_post is not None:
+            _insert_batches(Comment, ({
+                'post_id': rng.randint(first_post, last_post), 'creator_id': rng.choice(user_ids),
+                'content': f'Benchmark comment {i}', 'created_at': timestamp()
+            } for i in range(comments)), batch_size, 'comments')
+
+
+# --------------------------
+# Scenarios
+# --------------------------
+def load_samples(app, rng):
+    """
+Samples existing ids to build requests from.
+    """
+    from sqlalchemy import select
+    from app import db
+    from app.models import User, StudyRoom, Post
+
+    with app.app_context():
+        samples = {}
+        for name, column in (('users', User.id), ('rooms', StudyRoom.room_id), ('posts', Post.post_id)):
+            ids = db.session.scalars(select(column).order_by(db.func.random()).limit(ID_SAMPLE_SIZE)).all()
+            if not ids:
+                raise SystemExit('The database is empty; run the seed command first.')
+            samples[name] = ids
+        emails = db.session.scalars(
+            select(User.email).where(User.email.like('bench-user-%')).limit(ID_SAMPLE_SIZE)
+        ).all()
+        samples['emails'] = emails
+    return samples
+
+
+def scenarios(samples):
+    """
+Returns scenario name -> function(rng) building (method, path, json body).
+    """
+    def signup(rng):
+        name = uuid.uuid4().hex[:16]
+        return 'POST', '/api/signup', {'username': name, 'email': f'{name}@load.example.com',
+                                       'password': SEED_PASSWORD}
+
+    def login(rng):
+        return 'POST', '/api/login', {'login': rng.choice(samples['emails']), 'password': SEED_PASSWORD}
+
+    def room_list(rng):
+        return 'GET', '/api/study_rooms?limit=50', None
+
+    def room_get(rng):
+        return 'GET', f"/api/study_rooms/{rng.choice(samples['rooms'])}", None
+
+    def room_feed(rng):
+        return 'GET', f"/api/study_rooms/{rng.choice(samples['rooms'])}/feed?limit=20", None
+
+    def post_create(rng):
+        return 'POST', '/api/posts', {'content': 'Load test post', 'creator_id': rng.choice(samples['users']),
+                                      'room_id': rng.choice(samples['rooms'])}
+
+    def comment_create(rng):
+        return 'POST', '/api/comments', {'post_id': rng.choice(samples['posts']),
+                                         'creator_id': rng.choice(samples['users']),
+                                         'content': 'Load test comment'}
+
+    def media_create(rng):
+        return 'POST', '/api/media', {'type': 'image', 'file_path': f'/media/{uuid.uuid4().hex}.png',
+                                      'post_id': rng.choice(samples['posts'])}
+
+    all_scenarios = {
+        'signup': signup, 'login': login, 'room_list': room_list, 'room_get': room_get,
+        'room_feed': room_feed, 'post_create': post_create, 'comment_create': comment_create,
+        'media_create': media_create,
+    }
+    if not samples['emails']:
+        del all_scenarios['login']
+    return all_scenarios
+
+
+# --------------------------
+# Clients
+# --------------------------
+class InProcessSession:
+    """
+Sends requests in-process through the Flask test client.
+    """
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def send(self, method, path, body):
+        response = self.client.open(path, method=method, json=body)
+        response.close()
+        return response.status_code
+
+
+class HTTPSession:
+    """
+Sends requests over one keep-alive HTTP connection.
+    """
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.connection = connection_class(parts.hostname, parts.port, timeout=30)
+        self.prefix = parts.path.rstrip('/')
+
+    def send(self, method, path, body):
+        headers = {'Accept-Encoding': 'gzip'}
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.connection.request(method, self.prefix + path, body=data, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            return 599
+
+
+# --------------------------
+# Load generation
+# --------------------------
+def percentile(sorted_values, fraction):
+    # Nearest rank; the tolerance keeps float error (0.1 * 30 = 3.0000000000000004) off the next rank
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values) - 1e-9) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(make_session, build_request, concurrency, duration, warmup, seed_value):
+    """
+Runs one scenario with 'concurrency' threads for 'duration' seconds.
+
+Returns:
+dict: Request count, errors, req/s and latency percentiles in milliseconds.
+    """
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    statuses = [{} for _ in range(concurrency)]
+    start_barrier = threading.Barrier(concurrency + 1)
+    timing = {}
+
+    def worker(index):
+        rng = random.Random(seed_value + index)
+        session = make_session()
+        warm_until = time.perf_counter() + warmup
+        while time.perf_counter() < warm_until:
+            session.send(*build_request(rng))
+        start_barrier.wait()
+        stop_at = timing['stop_at']
+        while True:
+            request = build_request(rng)
+            started = time.perf_counter()
+            if started >= stop_at:
+                break
+            status = session.send(*request)
+            latencies[index].append(time.perf_counter() - started)
+            statuses[index][status] = statuses[index].get(status, 0) + 1
+            if status >= 400:
+                errors[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    # Workers finish their warm-up, then all start measuring at the same moment
+    timing['stop_at'] = float('inf')
+    while start_barrier.n_waiting < concurrency:
+        time.sleep(0.01)
+    started = time.perf_counter()
+    timing['stop_at'] = started + duration
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    merged = sorted(value for values in latencies for value in values)
+    status_counts = {}
+    for counts in statuses:
+        for status, count in counts.items():
+            status_counts[str(status)] = status_counts.get(str(status), 0) + count
+    ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        'requests': len(merged),
+        'errors': sum(errors),
+        'statuses': status_counts,
+        'requests_per_second': round(len(merged) / elapsed, 2) if elapsed else 0,
+        'latency_ms': {
+            'mean': ms(sum(merged) / len(merged)) if merged else None,
+            'p50': ms(percentile(merged, 0.50)),
+            'p95': ms(percentile(merged, 0.95)),
+            'p99': ms(percentile(merged, 0.99)),
+            'max': ms(merged[-1]) if merged else None,
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    app = make_app(args.database_url)
+    rng = random.Random(args.seed)
+    samples = load_samples(app, rng)
+    available = scenarios(samples)
+    selected = args.scenario or list(available)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}. Available: {', '.join(available)}")
+
+    if args.base_url:
+        make_session = lambda: HTTPSession(args.base_url)
+    else:
+        make_session = lambda: InProcessSession(app)
+
+    results = {}
+    for name in selected:
+        print(f'{name}: {args.concurrency} clients for {args.duration}s...', file=sys.stderr)
+        results[name] = run_scenario(make_session, available[name], args.concurrency, args.duration,
+                                     args.warmup, args.seed)
+        print_result(name, results[name])
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'git_commit': git_commit(),
+            'target': args.base_url or 'in-process',
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split('@')[-1],
+            'concurrency': args.concurrency,
+            'duration_seconds': args.duration,
+            'python': platform.python_version(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'Wrote {args.output}', file=sys.stderr)
+
+
+def fmt(value, spec=''):
+    """Formats a number for the reports, or '-' when a run recorded no samples."""
+    return '-' if value is None else format(value, spec)
+
+
+def print_result(name, result):
+    latency = result['latency_ms']
+    print(f"{name:16}{result['requests_per_second']:>10.1f} req/s  p50 {fmt(latency['p50'])}ms  "
+          f"p95 {fmt(latency['p95'])}ms  p99 {fmt(latency['p99'])}ms  errors {result['errors']}/{result['requests']}")
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    def change(old, new):
+        if not old or new is None:
+            return None
+        return (new - old) / old * 100
+
+    regressed = []
+    print(f"{'scenario':16}{'req/s':>20}{'p95 ms':>24}")
+    for name, new in candidate['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        rps_change = change(old['requests_per_second'], new['requests_per_second'])
+        p95_change = change(old['latency_ms']['p95'], new['latency_ms']['p95'])
+        print(f"{name:16}{old['requests_per_second']:>8.1f} -> {new['requests_per_second']:<8.1f}"
+              f"{'' if rps_change is None else f'{rps_change:+.1f}%':>7}"
+              f"{fmt(old['latency_ms']['p95']):>9} -> {fmt(new['latency_ms']['p95']):<8}"
+              f"{'' if p95_change is None else f'{p95_change:+.1f}%':>7}")
+        if p95_change is not None and p95_change > args.threshold:
+            regressed.append(name)
+    if regressed:
+        print(f"p95 regressed by more than {args.threshold}%: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Seed, load-test and compare runs of the API.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = commands.add_parser('seed', help='Fill an empty database with generated data.')
+    seed_parser.add_argument('--database-url', required=True)
+    seed_parser.add_argument('--users', type=int, default=10000)
+    seed_parser.add_argument('--rooms', type=int, default=None, help='Default: users / 20')
+    seed_parser.add_argument('--posts', type=int, default=100000)
+    seed_parser.add_argument('--comments', type=int, default=None, help='Default: 2 * posts')
+    seed_parser.add_argument('--batch-size', type=int, default=10000)
+    seed_parser.add_argument('--seed', type=int, default=1)
+
+    run_parser = commands.add_parser('run', help='Drive the endpoints and report latency and throughput.')
+    run_parser.add_argument('--database-url', required=True, help='Database to sample ids from (and serve, in-process).')
+    run_parser.add_argument('--base-url', help='Target a running server instead of the in-process test client.')
+    run_parser.add_argument('-c', '--concurrency', type=int, default=8)
+    run_parser.add_argument('-d', '--duration', type=float, default=10.0, help='Seconds per scenario.')
+    run_parser.add_argument('--warmup', type=float, default=1.0, help='Unmeasured seconds per scenario.')
+    run_parser.add_argument('-s', '--scenario', action='append', help='Run only this scenario (repeatable).')
+    run_parser.add_argument('-o', '--output', help='Write the results as JSON.')
+    run_parser.add_argument('--seed', type=int, default=1)
+
+    compare_parser = commands.add_parser('compare', help='Compare two result files.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help='Allowed p95 increase in percent.')
+
+    args = parser.parse_args(argv)
+    if args.command == 'seed':
+        app = make_app(args.database_url)
+        rooms = args.rooms if args.rooms is not None else max(1, args.users // 20)
+        comments = args.comments if args.comments is not None else args.posts * 2
+        seed(app, args.users, rooms, args.posts, comments, args.batch_size, random.Random(args.seed))
+    elif args.command == 'run':
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == '__main__':
+    main()
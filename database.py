@@ -1,100 +1,344 @@
 # database.py
-import psycopg
-from psycopg import OperationalError
+import asyncio
+import atexit
+import logging
 import os
+import threading
+from contextlib import contextmanager, asynccontextmanager
+import psycopg
+from psycopg import OperationalError, sql
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_pid = None
+_async_pool = None
+# (pid, event loop) that opened _async_pool, and the asyncio.Lock guarding it there
+_async_pool_owner = None
+_async_pool_lock = None
+_async_pool_lock_owner = None
+_pool_lock = threading.Lock()
+
+def get_conninfo(database_url=None):
+    """
+    Build the psycopg connection string from DATABASE_URL (when it points at
+    PostgreSQL) or from the individual DB_* environment variables.
+
+    Args:
+        database_url (str): A PostgreSQL URL to use instead of the environment,
+            e.g. the Flask app's SQLALCHEMY_DATABASE_URI.
+
+    Returns:
+        str: A libpq connection string or URL.
+
+    Raises:
+        ValueError: If no PostgreSQL configuration is available.
+    """
+    database_url = database_url or os.getenv("DATABASE_URL")
+    if database_url and database_url.startswith("postgres"):
+        # Accept SQLAlchemy-style URLs such as postgresql+psycopg://
+        scheme, rest = database_url.split("://", 1)
+        return f"{scheme.split('+', 1)[0]}://{rest}"
+
+    host = os.getenv("DB_HOST")
+    db_name = os.getenv("DB_NAME")
+    db_user = os.getenv("DB_USER")
+    db_password = os.getenv("DB_PASSWORD")
+    db_port = os.getenv("DB_PORT")
+
+    if not all([host, db_name, db_user, db_password, db_port]):
+        raise ValueError("Missing required database configuration in environment variables")
+
+    return psycopg.conninfo.make_conninfo(
+        host=host,
+        dbname=db_name,
+        user=db_user,
+        password=db_password,
+        port=db_port
+    )
+
 def create_connection():
     """
-    Create and return a new PostgreSQL database connection using credentials
-    from environment variables.
+    Create and return a new, unpooled PostgreSQL connection using credentials
+    from environment variables. Prefer connection() for repeated work.
 
     Returns:
         connection: psycopg connection object if successful; otherwise, None.
     """
     try:
-        host = os.getenv("DB_HOST")
-        db_name = os.getenv("DB_NAME")
-        db_user = os.getenv("DB_USER")
-        db_password = os.getenv("DB_PASSWORD")
-        db_port = os.getenv("DB_PORT")
-        # DATABASE_URL = os.getenv("DATABASE_URL")
-
-        if not all([host, db_name, db_user, db_password, db_port]):
-            raise ValueError("Missing required database configuration in environment variables")
-
-        conn = psycopg.connect(
-            host=host,
-            dbname=db_name,
-            user=db_user,
-            password=db_password,
-            port=db_port
-        )
-        print("Database connection successful")
+        conn = psycopg.connect(get_conninfo())
+        logger.info("Database connection successful")
         return conn
     except OperationalError as e:
-        print(f"OperationalError: {e}")
+        logger.error("OperationalError: %s", e)
         return None
     except ValueError as e:
-        print(f"ValueError: {e}")
+        logger.error("ValueError: %s", e)
         return None
 
-def init_db():
+def get_pool():
     """
-Initialize the database by creating tables defined in schema.sql.
-The function checks if a known table (e.g., 'comments') exists. If it does,
-it assumes that the database is already initialized.
+    Return the process-wide connection pool, creating it on first use.
 
-Returns:
-bool: True if tables are created or already exist; False if an error occurs.
+    Connections are health-checked when they are handed out, so a restarted
+    server does not surface as errors in callers. The pool is recreated after
+    a fork because connections cannot be shared between processes.
+
+    Returns:
+        ConnectionPool: The shared psycopg_pool pool.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool(
+                get_conninfo(),
+                min_size=int(os.getenv("PSYCOPG_POOL_MIN_SIZE", "1")),
+                max_size=int(os.getenv("PSYCOPG_POOL_MAX_SIZE", "5")),
+                timeout=float(os.getenv("PSYCOPG_POOL_TIMEOUT", "30")),
+                check=ConnectionPool.check_connection,
+                name="database.py",
+                open=True
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+async def get_async_pool():
+    """
+    Return the asyncio connection pool for the running process and event loop,
+    opening it on first use.
+
+    Concurrent first callers wait on one asyncio.Lock, so a single pool is
+    opened. Like get_pool(), the pool is tied to the pid that opened it, and
+    also to its event loop: its connections and background tasks cannot be
+    used from another process or loop, which get a pool of their own.
+
+    Returns:
+        AsyncConnectionPool: The shared psycopg_pool asyncio pool.
+    """
+    global _async_pool, _async_pool_owner, _async_pool_lock, _async_pool_lock_owner
+    owner = (os.getpid(), asyncio.get_running_loop())
+    if _async_pool is not None and _async_pool_owner == owner:
+        return _async_pool
+
+    with _pool_lock:
+        if _async_pool_lock is None or _async_pool_lock_owner != owner:
+            _async_pool_lock = asyncio.Lock()
+            _async_pool_lock_owner = owner
+        lock = _async_pool_lock
+
+    async with lock:
+        if _async_pool is None or _async_pool_owner != owner:
+            pool = AsyncConnectionPool(
+                get_conninfo(),
+                min_size=int(os.getenv("PSYCOPG_POOL_MIN_SIZE", "1")),
+                max_size=int(os.getenv("PSYCOPG_POOL_MAX_SIZE", "5")),
+                timeout=float(os.getenv("PSYCOPG_POOL_TIMEOUT", "30")),
+                check=AsyncConnectionPool.check_connection,
+                name="database.py-async",
+                open=False
+            )
+            await pool.open()
+            _async_pool = pool
+            _async_pool_owner = owner
+        return _async_pool
+
+@contextmanager
+def connection(conninfo=None):
+    """
+    Borrow a pooled connection. The transaction is committed when the block
+    exits normally and rolled back if it raises; the connection then goes back
+    to the pool.
+
+    Args:
+        conninfo (str): Open a dedicated connection to this database instead,
+            with the same transaction handling; it is closed afterwards.
+    """
+    if conninfo is not None:
+        with psycopg.connect(conninfo) as conn:
+            yield conn
+        return
+    with get_pool().connection() as conn:
+        yield conn
+
+@asynccontextmanager
+async def async_connection():
+    """
+    Asyncio counterpart of connection().
+    """
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+def close_pool():
+    """
+    Close the pools owned by this process.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+        _pool_pid = None
+
+async def close_async_pool():
+    """
+    Close the asyncio pool if it belongs to this process and event loop.
+    """
+    global _async_pool, _async_pool_owner
+    if _async_pool is not None and _async_pool_owner == (os.getpid(), asyncio.get_running_loop()):
+        await _async_pool.close()
+    _async_pool = None
+    _async_pool_owner = None
+
+atexit.register(close_pool)
+
+def executemany(query, rows, conn=None):
+    """
+    Run one parameterized statement for many rows in a single round trip per
+    batch (psycopg pipelines executemany).
+
+    Args:
+        query (str): SQL with %s placeholders.
+        rows (iterable): Parameter tuples.
+        conn: An open connection; a pooled one is borrowed if omitted.
+
+    Returns:
+        int: The number of affected rows.
     """
-    conn = create_connection()
     if conn is None:
-        print("Failed to initialize database: No connection")
-        return False
+        with connection() as conn:
+            return executemany(query, rows, conn)
+    with conn.cursor() as cursor:
+        cursor.executemany(query, rows)
+        return cursor.rowcount
 
+def copy_from_rows(table, columns, rows, conn=None):
+    """
+    Bulk load rows into a table with COPY FROM STDIN.
+
+    Args:
+        table (str): Target table name.
+        columns (list): Column names, in the order of the values in each row.
+        rows (iterable): Sequences of values; consumed lazily.
+        conn: An open connection; a pooled one is borrowed if omitted.
+
+    Returns:
+        int: The number of rows copied.
+    """
+    if conn is None:
+        with connection() as conn:
+            return copy_from_rows(table, columns, rows, conn)
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+    )
+    count = 0
+    with conn.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+    return count
+
+def copy_to(query, out, conn=None, fmt="csv"):
+    """
+    Stream the result of a query to a binary file-like object with COPY TO STDOUT.
+
+    Args:
+        query (str or sql.Composable): A SELECT statement.
+        out: Object with a write(bytes) method.
+        conn: An open connection; a pooled one is borrowed if omitted.
+        fmt (str): COPY format, "csv" (with header) or "text".
+    """
+    if conn is None:
+        with connection() as conn:
+            return copy_to(query, out, conn, fmt)
+    if isinstance(query, str):
+        query = sql.SQL(query)
+    options = sql.SQL("(FORMAT csv, HEADER true)" if fmt == "csv" else "(FORMAT text)")
+    statement = sql.SQL("COPY ({}) TO STDOUT {}").format(query, options)
+    with conn.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for data in copy:
+                out.write(data)
+
+# Arbitrary constant identifying the migration advisory lock
+MIGRATION_LOCK_ID = 727_001
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+
+def list_migrations():
+    """
+    Return the migration files as (version, path) pairs in the order they apply.
+    Versions are the file names without extension, e.g. "0002_tokens_uploads_jobs".
+    """
+    names = sorted(name for name in os.listdir(MIGRATIONS_DIR) if name.endswith('.sql'))
+    return [(name[:-4], os.path.join(MIGRATIONS_DIR, name)) for name in names]
+
+def migrate(conninfo=None):
+    """
+    Apply every migration in migrations/ that the database has not seen yet.
+
+    Applied versions are recorded in the schema_migrations table. A session
+    advisory lock serializes concurrent runs (e.g. several instances starting
+    at once), and each migration runs in its own transaction, so a failure
+    leaves the database at the last fully applied version. Running it again
+    is a no-op.
+
+    Args:
+        conninfo (str): Database to migrate; defaults to the environment's (get_conninfo()).
+
+    Returns:
+        list: The versions applied by this call.
+    """
+    applied_now = []
+    with connection(conninfo) as conn:
+        conn.autocommit = True
+        conn.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS schema_migrations ("
+                " version VARCHAR(255) PRIMARY KEY,"
+                " applied_at TIMESTAMP NOT NULL DEFAULT NOW())"
+            )
+            applied = {row[0] for row in conn.execute("SELECT version FROM schema_migrations")}
+            for version, path in list_migrations():
+                if version in applied:
+                    continue
+                with open(path, 'r') as f:
+                    script = f.read()
+                # The whole file is sent at once; no naive splitting on ';'
+                with conn.transaction():
+                    conn.execute(script)
+                    conn.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+                logger.info("Applied migration %s", version)
+                applied_now.append(version)
+        finally:
+            conn.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            conn.autocommit = False
+    return applied_now
+
+def init_db():
+    """
+Bring the database schema up to date by applying pending migrations.
+
+Returns:
+bool: True if the schema is up to date; False if an error occurs.
+    """
     try:
-        # Use a context manager so that commit/rollback and cleanup are handled automatically.
-        with conn:
-            with conn.cursor() as cursor:
-                # Check if the 'comments' table exists
-                cursor.execute(
-                    "SELECT EXISTS (SELECT 1 FROM information_schema.tables WHERE table_name = 'comments')"
-                )
-                exists = cursor.fetchone()
-                if exists and exists[0]:
-                    print("Database tables already exist, skipping creation")
-                    return True
-
-                # Read SQL commands from schema.sql
-                schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
-                # with open('schema.sql', 'r') as f:        
-                with open(schema_path, 'r') as f:
-                    sql_commands = f.read()
-
-                # Split and execute each non-empty SQL command
-                commands = sql_commands.split(';')
-                for command in commands:
-                    command = command.strip()
-                    if command:
-                        cursor.execute(command)
-
-                # Commit is automatically handled by the 'with conn:' block.
-                print("Database tables created successfully")
-                return True
+        migrate()
+        return True
     except Exception as e:
-        # Even though the context manager handles rollback, we catch and log the exception.
-        print(f"Error creating tables: {e}")
+        logger.error("Error applying migrations: %s", e)
         return False
-    finally:
-        conn.close()
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     if init_db():
-        print("Database initialization test passed.")
+        print("Database migrations applied.")
     else:
-        print("Database initialization test failed.")
-        
\ No newline at end of file
+        print("Database migration failed.")
@@ -0,0 +1,94 @@
+# gunicorn.conf.py
+"""
+Production server settings: "gunicorn -c gunicorn.conf.py wsgi:app".
+
+Every setting can be overridden with the environment variable named next to it.
+Send SIGHUP to reload gracefully: new workers start before the old ones finish
+their in-flight requests. With preload_app, new code is only picked up by a
+binary upgrade (USR2, then WINCH/QUIT to the old master) or a restart.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+from dotenv import load_dotenv
+
+# Read .env now, so the defaults below do not shadow values set there
+load_dotenv()
+
+# --------------------------
+# Sockets and workers
+# --------------------------
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+# Requests mostly wait on the database, so threads per worker add cheap concurrency
+worker_class = "gthread"
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+backlog = int(os.getenv("GUNICORN_BACKLOG", "2048"))
+
+# --------------------------
+# Per-worker resources
+# --------------------------
+# The app sizes these per process, so every worker multiplies them. Unless set
+# explicitly, they follow the worker and thread counts to keep host totals bounded:
+# - database connections: workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) = workers * threads,
+#   which must fit into PostgreSQL's max_connections together with every other host
+# - password hashing processes: workers * PASSWORD_HASH_WORKERS. Every worker needs at
+#   least one, so this is one per CPU only while workers <= CPUs; with the default
+#   2 * CPUs + 1 workers it is about two per CPU. They only use CPU during signups and
+#   logins, at most PASSWORD_HASH_MAX_PENDING hashes per worker; lower GUNICORN_WORKERS
+#   if concurrent logins must not oversubscribe the CPUs
+os.environ.setdefault("DB_POOL_SIZE", str(threads))
+os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", str(max(1, multiprocessing.cpu_count() // workers)))
+# Workers write their metrics here so /metrics aggregates all of them (app/metrics.py).
+# prometheus_client reads this when it is imported, i.e. while the app is preloaded,
+# and the metrics created then need the directory, so it is created right away.
+# Separate gunicorn instances on one host need separate directories.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "prometheus_multiproc"))
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# --------------------------
+# Timeouts and recycling
+# --------------------------
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+# Seconds an idle keep-alive connection stays open; keep it below the proxy's idle timeout
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+# Recycle workers periodically, with jitter so they do not all restart together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# --------------------------
+# Application loading
+# --------------------------
+# Import the app once in the master and fork it; workers then drop the
+# inherited database connections in post_fork
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() in ["true", "1", "t"]
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # Samples of workers from a previous run would otherwise be aggregated into /metrics.
+    # Runs once per master, unlike this module, which SIGHUP evaluates again.
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    # Connections opened in the master (if any) must not be shared with the workers
+    app = server.app.wsgi()
+    from app import db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    from app.metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -0,0 +1,56 @@
+-- 0002: revoked tokens, content-addressed media, resumable uploads and the job queue
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(36) PRIMARY KEY,
+    expires_at TIMESTAMP,
+    revoked_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+
+ALTER TABLE media ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE media ADD COLUMN IF NOT EXISTS size_bytes BIGINT;
+ALTER TABLE media ADD COLUMN IF NOT EXISTS mime_type VARCHAR(255);
+ALTER TABLE media ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'ready';
+ALTER TABLE media ADD COLUMN IF NOT EXISTS width INTEGER;
+ALTER TABLE media ADD COLUMN IF NOT EXISTS height INTEGER;
+ALTER TABLE media ADD COLUMN IF NOT EXISTS duration_seconds DOUBLE PRECISION;
+ALTER TABLE media ADD COLUMN IF NOT EXISTS thumbnail_path VARCHAR(255);
+
+CREATE INDEX IF NOT EXISTS ix_media_content_hash ON media (content_hash);
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    upload_id VARCHAR(32) PRIMARY KEY,
+    type VARCHAR(50) NOT NULL,
+    mime_type VARCHAR(255) NOT NULL,
+    post_id INTEGER REFERENCES posts(post_id),
+    total_size BIGINT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    expected_hash VARCHAR(64),
+    status VARCHAR(20) NOT NULL DEFAULT 'open',
+    media_id INTEGER REFERENCES media(media_id),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS upload_chunks (
+    upload_id VARCHAR(32) NOT NULL REFERENCES upload_sessions(upload_id),
+    chunk_index INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (upload_id, chunk_index)
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id SERIAL PRIMARY KEY,
+    kind VARCHAR(100) NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_status_run_after ON jobs (status, run_after);
@@ -0,0 +1,18 @@
+-- 0003: indexes for foreign keys, feed ordering and case-insensitive login
+-- Creating ix_users_email_lower fails if two accounts differ only by email case;
+-- merge those accounts first.
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email));
+
+CREATE INDEX IF NOT EXISTS ix_study_rooms_creator_id ON study_rooms (creator_id);
+CREATE INDEX IF NOT EXISTS ix_study_rooms_created_at ON study_rooms (created_at);
+
+CREATE INDEX IF NOT EXISTS ix_posts_room_id_created_at ON posts (room_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS ix_posts_creator_id ON posts (creator_id);
+
+CREATE INDEX IF NOT EXISTS ix_comments_post_id_created_at ON comments (post_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_comments_creator_id ON comments (creator_id);
+
+CREATE INDEX IF NOT EXISTS ix_media_post_id ON media (post_id);
+
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_post_id ON upload_sessions (post_id);
@@ -0,0 +1,10 @@
+-- 0004: full-text search over posts and comments
+-- The generated columns are computed by PostgreSQL on every insert/update.
+
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector);
+
+ALTER TABLE comments ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+CREATE INDEX IF NOT EXISTS ix_comments_search_vector ON comments USING GIN (search_vector);
@@ -0,0 +1,23 @@
+-- 0005: updated_at on users and study_rooms, for ETag/Last-Modified validators
+-- and incremental exports. The trigger keeps it current for writes that do
+-- not go through the ORM.
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT NOW();
+UPDATE users SET updated_at = created_at WHERE created_at IS NOT NULL;
+DROP TRIGGER IF EXISTS trg_users_updated_at ON users;
+CREATE TRIGGER trg_users_updated_at BEFORE UPDATE ON users
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+ALTER TABLE study_rooms ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT NOW();
+UPDATE study_rooms SET updated_at = created_at WHERE created_at IS NOT NULL;
+DROP TRIGGER IF EXISTS trg_study_rooms_updated_at ON study_rooms;
+CREATE TRIGGER trg_study_rooms_updated_at BEFORE UPDATE ON study_rooms
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+CREATE INDEX IF NOT EXISTS ix_study_rooms_updated_at ON study_rooms (updated_at);
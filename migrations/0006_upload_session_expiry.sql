@@ -0,0 +1,8 @@
+-- 0006: expiry for resumable upload sessions, so abandoned ones can be removed
+-- with "flask expire-uploads". Existing sessions get a day from their creation.
+
+ALTER TABLE upload_sessions ADD COLUMN IF NOT EXISTS expires_at TIMESTAMP;
+UPDATE upload_sessions SET expires_at = COALESCE(created_at, NOW()) + INTERVAL '1 day' WHERE expires_at IS NULL;
+ALTER TABLE upload_sessions ALTER COLUMN expires_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_status_expires_at ON upload_sessions (status, expires_at);
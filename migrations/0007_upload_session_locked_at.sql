@@ -0,0 +1,6 @@
+-- 0007: claim time of a resumable upload's finalize call, so a session left
+-- 'assembling' by a call that died can be completed again or expired.
+-- Sessions already stuck in 'assembling' count as claimed now.
+
+ALTER TABLE upload_sessions ADD COLUMN IF NOT EXISTS locked_at TIMESTAMP;
+UPDATE upload_sessions SET locked_at = NOW() WHERE status = 'assembling' AND locked_at IS NULL;
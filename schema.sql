@@ -1,40 +1,136 @@
+-- Full current schema, for reference and for creating a database by hand.
+-- Deployed databases are changed only through the versioned files in migrations/
+-- (applied by "flask migrate"); keep this file in sync with them.
+
+-- Keeps updated_at current on every UPDATE (see migrations/0005_updated_at.sql)
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE TABLE IF NOT EXISTS users (
     id SERIAL PRIMARY KEY,
     username VARCHAR(255) NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
     password VARCHAR(255) NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email));
+DROP TRIGGER IF EXISTS trg_users_updated_at ON users;
+CREATE TRIGGER trg_users_updated_at BEFORE UPDATE ON users
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 CREATE TABLE IF NOT EXISTS study_rooms (
     room_id SERIAL PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
     description TEXT,
     capacity INTEGER CHECK (capacity > 0),
     creator_id INTEGER NOT NULL REFERENCES users(id),
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
 );
 
+CREATE INDEX IF NOT EXISTS ix_study_rooms_creator_id ON study_rooms (creator_id);
+CREATE INDEX IF NOT EXISTS ix_study_rooms_created_at ON study_rooms (created_at);
+CREATE INDEX IF NOT EXISTS ix_study_rooms_updated_at ON study_rooms (updated_at);
+DROP TRIGGER IF EXISTS trg_study_rooms_updated_at ON study_rooms;
+CREATE TRIGGER trg_study_rooms_updated_at BEFORE UPDATE ON study_rooms
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
 CREATE TABLE IF NOT EXISTS posts (
     post_id SERIAL PRIMARY KEY,
     content TEXT NOT NULL,
     creator_id INTEGER NOT NULL REFERENCES users(id),
     room_id INTEGER REFERENCES study_rooms(room_id),
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED
 );
 
+CREATE INDEX IF NOT EXISTS ix_posts_room_id_created_at ON posts (room_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS ix_posts_creator_id ON posts (creator_id);
+CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector);
+
 CREATE TABLE IF NOT EXISTS comments (
     comment_id SERIAL PRIMARY KEY,
     post_id INTEGER NOT NULL REFERENCES posts(post_id),
     creator_id INTEGER NOT NULL REFERENCES users(id),
     content TEXT NOT NULL,
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED
 );
 
+CREATE INDEX IF NOT EXISTS ix_comments_post_id_created_at ON comments (post_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_comments_creator_id ON comments (creator_id);
+CREATE INDEX IF NOT EXISTS ix_comments_search_vector ON comments USING GIN (search_vector);
+
 CREATE TABLE IF NOT EXISTS media (
     media_id SERIAL PRIMARY KEY,
     type VARCHAR(50) NOT NULL,
     file_path VARCHAR(255) NOT NULL,
     post_id INTEGER REFERENCES posts(post_id),
+    content_hash VARCHAR(64),
+    size_bytes BIGINT,
+    mime_type VARCHAR(255),
+    status VARCHAR(20) NOT NULL DEFAULT 'ready',
+    width INTEGER,
+    height INTEGER,
+    duration_seconds DOUBLE PRECISION,
+    thumbnail_path VARCHAR(255),
     created_at TIMESTAMP DEFAULT NOW()
 );
+
+CREATE INDEX IF NOT EXISTS ix_media_post_id ON media (post_id);
+CREATE INDEX IF NOT EXISTS ix_media_content_hash ON media (content_hash);
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(36) PRIMARY KEY,
+    expires_at TIMESTAMP,
+    revoked_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_expires_at ON revoked_tokens (expires_at);
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    upload_id VARCHAR(32) PRIMARY KEY,
+    type VARCHAR(50) NOT NULL,
+    mime_type VARCHAR(255) NOT NULL,
+    post_id INTEGER REFERENCES posts(post_id),
+    total_size BIGINT NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    expected_hash VARCHAR(64),
+    status VARCHAR(20) NOT NULL DEFAULT 'open',
+    media_id INTEGER REFERENCES media(media_id),
+    created_at TIMESTAMP DEFAULT NOW(),
+    expires_at TIMESTAMP NOT NULL,
+    locked_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS upload_chunks (
+    upload_id VARCHAR(32) NOT NULL REFERENCES upload_sessions(upload_id),
+    chunk_index INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (upload_id, chunk_index)
+);
+
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_post_id ON upload_sessions (post_id);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_status_expires_at ON upload_sessions (status, expires_at);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id SERIAL PRIMARY KEY,
+    kind VARCHAR(100) NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+    locked_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_status_run_after ON jobs (status, run_after);
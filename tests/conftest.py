@@ -0,0 +1,63 @@
+# tests/conftest.py
+import os
+from contextlib import contextmanager
+import pytest
+
+# Fail any request that repeats a statement once per row (app/query_detector.py).
+# Set before the app (and its Config) is imported by the test modules.
+os.environ.setdefault("QUERY_DETECTOR", "raise")
+
+from app import create_app, db  # noqa: E402
+from app.config import Config  # noqa: E402
+
+class TestConfig(Config):
+    """
+Settings for the test apps. Test modules subclass it in their own 'app_config'
+fixture to change settings; those must be class attributes, since create_app()
+reads them while building the app.
+    """
+    __test__ = False  # Not a test class, despite the name
+
+    TESTING = True
+    # Use an in-memory SQLite database for testing purposes
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+
+@pytest.fixture
+def app_config():
+    return TestConfig
+
+@pytest.fixture
+def app_instance(app_config):
+    app = create_app(app_config)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+@pytest.fixture
+def client(app_instance):
+    return app_instance.test_client()
+
+@pytest.fixture
+def query_budget(app_instance):
+    """
+Asserts that the block executes at most 'max_queries' statements:
+
+    with query_budget(3) as statements:
+        client.get("/api/study_rooms/1/feed")
+    """
+    from app.query_tracker import count_queries
+
+    with app_instance.app_context():
+        engine = db.engine
+
+    @contextmanager
+    def budget(max_queries):
+        with count_queries(engine) as statements:
+            yield statements
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} statements executed, budget is {max_queries}:\n" + "\n".join(statements)
+        )
+
+    return budget
@@ -0,0 +1,162 @@
+# tests/test_asgi.py
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import pytest
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from app import db
+from app.asgi import create_asgi_app
+from app.models import Comment, Job, Media, Post, StudyRoom, User
+from app.services.media_storage import ContentWriter
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def asgi_app(tmp_path):
+    class AsgiConfig(TestConfig):
+        # A file, so the sync and async engines see the same database
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'asgi.db'}"
+        MEDIA_STORAGE_ROOT = str(tmp_path / "media")
+        FEED_COMMENTS_PER_POST = 2
+        EXPORT_BATCH_SIZE = 4
+
+    application = create_asgi_app(AsgiConfig)
+    with application.flask_app.app_context():
+        db.create_all()
+        author = User(username="author", email="author@example.com", password="x")
+        db.session.add(author)
+        db.session.flush()
+        room = StudyRoom(name="Async room", capacity=10, creator_id=author.id)
+        db.session.add(room)
+        db.session.flush()
+        for i in range(7):
+            post = Post(content=f"Post {i}", creator_id=author.id, room_id=room.room_id)
+            db.session.add(post)
+            db.session.flush()
+            db.session.add(Media(type="image", file_path=f"/media/{i}.png", post_id=post.post_id))
+            for j in range(3):
+                db.session.add(Comment(post_id=post.post_id, creator_id=author.id, content=f"Comment {j}"))
+        db.session.commit()
+    loop = asyncio.new_event_loop()
+    application.loop = loop
+    yield application
+    loop.run_until_complete(application.engine.dispose())
+    loop.close()
+    with application.flask_app.app_context():
+        db.drop_all()
+
+def call(application, method, path, query="", body=b"", headers=()):
+    """
+Sends one request through the ASGI app. Returns (status, headers, body).
+    """
+    incoming = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0) if incoming else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in [*headers, ("Content-Length", str(len(body)))]],
+        "client": ("127.0.0.1", 1234), "server": ("localhost", 80),
+    }
+    application.loop.run_until_complete(application(scope, receive, send))
+    start = sent[0]
+    response_headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+    return start["status"], response_headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+def test_feed_matches_the_flask_view(asgi_app):
+    client = asgi_app.flask_app.test_client()
+    status, headers, body = call(asgi_app, "GET", "/api/study_rooms/1/feed", "limit=3")
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    expected = client.get("/api/study_rooms/1/feed?limit=3").get_json()
+    assert json.loads(body) == expected
+    assert len(expected["posts"]) == 3
+
+    cursor = expected["next_cursor"]
+    _, _, body = call(asgi_app, "GET", "/api/study_rooms/1/feed", f"limit=3&after={cursor}")
+    assert json.loads(body) == client.get(f"/api/study_rooms/1/feed?limit=3&after={cursor}").get_json()
+
+def test_feed_errors(asgi_app):
+    assert call(asgi_app, "GET", "/api/study_rooms/99/feed")[0] == 404
+    assert call(asgi_app, "GET", "/api/study_rooms/1/feed", "limit=abc")[0] == 400
+
+def test_feed_is_compressed_when_accepted(asgi_app):
+    status, headers, body = call(asgi_app, "GET", "/api/study_rooms/1/feed", headers=[("Accept-Encoding", "gzip")])
+    assert status == 200
+    assert headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body))["room_id"] == 1
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_matches_the_flask_view(asgi_app, fmt):
+    status, headers, body = call(asgi_app, "GET", "/api/export/comments", f"format={fmt}")
+    assert status == 200
+    assert headers["content-disposition"] == f'attachment; filename="comments.{fmt}"'
+    expected = asgi_app.flask_app.test_client().get(f"/api/export/comments?format={fmt}").get_data()
+    assert body == expected
+    assert len(expected.splitlines()) == 21 + (fmt == "csv")
+
+def test_export_gzip_and_validation(asgi_app):
+    status, headers, body = call(asgi_app, "GET", "/api/export/posts", "gzip=true")
+    assert headers["content-encoding"] == "gzip"
+    assert len(gzip.decompress(body).splitlines()) == 7
+    assert call(asgi_app, "GET", "/api/export/users")[0] == 404
+    assert call(asgi_app, "GET", "/api/export/posts", "since=yesterday")[0] == 400
+
+def test_raw_upload_is_stored_and_queued(asgi_app):
+    body = b"\x89PNG" + b"x" * 5000
+    status, _, response = call(asgi_app, "POST", "/api/media/upload", "post_id=1", body,
+                               headers=[("Content-Type", "image/png")])
+    assert status == 201
+    data = json.loads(response)
+    assert data["content_hash"] == hashlib.sha256(body).hexdigest()
+    assert data["status"] == "pending"
+    with asgi_app.flask_app.app_context():
+        assert db.session.get(Media, data["media_id"]).size_bytes == len(body)
+        assert Job.query.filter_by(kind="media.process").count() == 1
+
+def test_upload_file_work_runs_off_the_event_loop(asgi_app, monkeypatch):
+    asgi_app.flask_app.config["MEDIA_UPLOAD_CHUNK_SIZE"] = 1024
+    writes = []
+    original = ContentWriter.write
+
+    def write(self, chunk):
+        writes.append((threading.get_ident(), len(chunk)))
+        original(self, chunk)
+
+    monkeypatch.setattr(ContentWriter, "write", write)
+    body = b"\x89PNG" + b"y" * 5000
+    status, _, response = call(asgi_app, "POST", "/api/media/upload", "", body,
+                               headers=[("Content-Type", "image/png")])
+    assert status == 201
+    assert json.loads(response)["content_hash"] == hashlib.sha256(body).hexdigest()
+    assert writes and all(thread != threading.get_ident() for thread, _ in writes)
+
+def test_upload_validation(asgi_app):
+    assert call(asgi_app, "POST", "/api/media/upload", "post_id=99", b"abc",
+                headers=[("Content-Type", "image/png")])[0] == 404
+    assert call(asgi_app, "POST", "/api/media/upload", "", b"abc",
+                headers=[("Content-Type", "application/pdf")])[0] == 400
+
+def test_other_routes_are_served_by_flask(asgi_app):
+    status, _, body = call(asgi_app, "GET", "/api/study_rooms")
+    assert status == 200
+    assert json.loads(body)["study_rooms"][0]["name"] == "Async room"
+    boundary = "boundary"
+    multipart = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+        f"Content-Type: image/png\r\n\r\nimage bytes\r\n--{boundary}--\r\n"
+    ).encode()
+    status, _, _ = call(asgi_app, "POST", "/api/media/upload", "", multipart,
+                        headers=[("Content-Type", f"multipart/form-data; boundary={boundary}")])
+    assert status == 201
@@ -1,24 +1,6 @@
 # tests/test_auth.py
-import pytest
-from app import create_app, db
 from flask import json
 
-@pytest.fixture
-def app_instance():
-    app = create_app()
-    app.config["TESTING"] = True
-    # Use an in-memory SQLite database for testing purposes
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    with app.app_context():
-        db.create_all()
-    yield app
-    with app.app_context():
-        db.drop_all()
-
-@pytest.fixture
-def client(app_instance):
-    return app_instance.test_client()
-
 def test_signup_missing_fields(client):
     # Test signup endpoint with missing data
     response = client.post("/api/signup", json={})
@@ -0,0 +1,104 @@
+# tests/test_bulk.py
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Comment, Media, Post, StudyRoom, User
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class BulkConfig(TestConfig):
+        BULK_MAX_ITEMS = 50
+    return BulkConfig
+
+@pytest.fixture
+def ids(app_instance):
+    with app_instance.app_context():
+        author = User(username="author", email="author@example.com", password="x")
+        db.session.add(author)
+        db.session.commit()
+        room = StudyRoom(name="Bulk room", capacity=10, creator_id=author.id)
+        db.session.add(room)
+        db.session.commit()
+        post = Post(content="Existing post", creator_id=author.id, room_id=room.room_id)
+        db.session.add(post)
+        db.session.commit()
+        return author.id, room.room_id, post.post_id
+
+def count_statements(app_instance, send):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app_instance.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = send()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, statements
+
+def test_bulk_posts_use_constant_number_of_queries(app_instance, client, ids):
+    user_id, room_id, _ = ids
+    items = [{"content": f"Post {i}", "creator_id": user_id, "room_id": room_id} for i in range(40)]
+    response, statements = count_statements(
+        app_instance, lambda: client.post("/api/posts/bulk", json=items)
+    )
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["created"] == 40
+    assert [result["index"] for result in data["results"]] == list(range(40))
+    # One IN query per referenced table plus one INSERT ... RETURNING
+    assert len(statements) == 3
+    with app_instance.app_context():
+        created = [db.session.get(Post, result["post_id"]).content for result in data["results"]]
+    assert created == [item["content"] for item in items]
+
+def test_bulk_posts_report_partial_failures(client, ids):
+    user_id, room_id, _ = ids
+    items = [
+        {"content": "ok", "creator_id": user_id},
+        {"content": "  ", "creator_id": user_id},
+        {"content": "unknown room", "creator_id": user_id, "room_id": 999},
+        {"content": "unknown user", "creator_id": 999},
+        "not an object",
+        {"content": "ok too", "creator_id": str(user_id), "room_id": room_id},
+    ]
+    response = client.post("/api/posts/bulk", json={"items": items})
+    assert response.status_code == 207
+    data = response.get_json()
+    assert data["created"] == 2 and data["failed"] == 4
+    assert [result["status"] for result in data["results"]] == [
+        "created", "error", "error", "error", "error", "created"
+    ]
+    assert "Study room with id 999" in data["results"][2]["message"]
+
+def test_bulk_comments_and_media(app_instance, client, ids):
+    user_id, _, post_id = ids
+    response = client.post("/api/comments/bulk", json=[
+        {"post_id": post_id, "creator_id": user_id, "content": " Nice "},
+        {"post_id": 12345, "creator_id": user_id, "content": "Missing post"},
+    ])
+    assert response.status_code == 207
+    assert response.get_json()["results"][1]["message"] == "Post with id 12345 not found."
+
+    response = client.post("/api/media/bulk", json=[
+        {"type": "IMAGE", "file_path": "/media/a.png", "post_id": post_id},
+        {"type": "document", "file_path": "/media/a.pdf"},
+    ])
+    assert response.status_code == 207
+    results = response.get_json()["results"]
+    assert results[0]["status"] == "created"
+    assert results[1]["status"] == "error"
+    with app_instance.app_context():
+        assert Comment.query.one().content == "Nice"
+        assert db.session.get(Media, results[0]["media_id"]).type == "image"
+
+def test_bulk_rejects_bad_and_oversized_batches(client, ids):
+    assert client.post("/api/posts/bulk", json={"content": "x"}).status_code == 400
+    assert client.post("/api/posts/bulk", json=[]).status_code == 400
+    items = [{"content": "x", "creator_id": ids[0]}] * 51
+    response = client.post("/api/posts/bulk", json=items)
+    assert response.status_code == 413
@@ -0,0 +1,76 @@
+# tests/test_compression.py
+import gzip
+import json
+import zlib
+import pytest
+from app import db, compression
+from app.models import Post, StudyRoom, User
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class CompressionConfig(TestConfig):
+        EXPORT_BATCH_SIZE = 10
+    return CompressionConfig
+
+@pytest.fixture
+def app_instance(app_instance):
+    with app_instance.app_context():
+        owner = User(username="owner", email="owner@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        room = StudyRoom(name="Room", capacity=4, creator_id=owner.id)
+        db.session.add(room)
+        db.session.commit()
+        db.session.add_all([Post(content=f"Post {i}", creator_id=owner.id, room_id=room.room_id) for i in range(50)])
+        db.session.commit()
+    return app_instance
+
+def test_gzip_is_negotiated_and_cached_by_etag(app_instance, client, monkeypatch):
+    plain = client.get("/")
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    calls = []
+    original = compression._gzip_compressor
+    monkeypatch.setattr(compression, "_gzip_compressor", lambda level: calls.append(level) or original(level))
+    first = client.get("/", headers={"Accept-Encoding": "br;q=0, gzip"})
+    second = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(first.get_data())) == plain.get_json()
+    assert second.get_data() == first.get_data()
+    # The second response reused the cached body
+    assert len(calls) == 1
+    assert len(first.get_data()) < len(plain.get_data())
+
+def test_small_and_refused_responses_are_not_compressed(client):
+    small = client.get("/api/study_rooms/1", headers={"Accept-Encoding": "gzip"})
+    assert small.status_code == 200
+    assert "Content-Encoding" not in small.headers
+    refused = client.get("/", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in refused.headers
+    not_modified = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": refused.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert "Content-Encoding" not in not_modified.headers
+
+def test_streamed_export_is_compressed_incrementally(client):
+    response = client.get("/api/export/posts", headers={"Accept-Encoding": "gzip"}, buffered=False)
+    assert response.headers["Content-Encoding"] == "gzip"
+    chunks = list(response.response)
+    assert len(chunks) > 2
+    lines = gzip.decompress(b"".join(chunks)).decode("utf-8").splitlines()
+    assert len(lines) == 50
+    # Each chunk is flushed, so the first one already decodes to complete rows
+    partial = zlib.decompressobj(31).decompress(chunks[0])
+    assert partial.endswith(b"\n")
+
+def test_already_encoded_exports_are_left_alone(client):
+    response = client.get("/api/export/posts", query_string={"gzip": "true"}, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert len(gzip.decompress(response.get_data()).splitlines()) == 50
+
+def test_brotli_is_preferred_when_available(client):
+    brotli = pytest.importorskip("brotli")
+    response = client.get("/", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(brotli.decompress(response.get_data()))["message"]
@@ -0,0 +1,77 @@
+# tests/test_conditional.py
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import StudyRoom, User
+
+@pytest.fixture
+def room_id(app_instance):
+    with app_instance.app_context():
+        owner = User(username="owner", email="owner@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        rooms = [StudyRoom(name=f"Room {i}", capacity=4, creator_id=owner.id) for i in range(3)]
+        db.session.add_all(rooms)
+        db.session.commit()
+        return rooms[0].room_id
+
+def record_statements(app_instance):
+    statements = []
+    with app_instance.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+def test_unchanged_room_returns_304_without_queries(app_instance, client, room_id):
+    first = client.get(f"/api/study_rooms/{room_id}")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    statements = record_statements(app_instance)
+    second = client.get(f"/api/study_rooms/{room_id}", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.get_data() == b""
+    assert second.headers["ETag"] == etag
+    # The room's updated_at comes from the record cache
+    assert statements == []
+
+    with app_instance.app_context():
+        db.session.get(StudyRoom, room_id).name = "Renamed"
+        db.session.commit()
+    third = client.get(f"/api/study_rooms/{room_id}", headers={"If-None-Match": etag})
+    assert third.status_code == 200
+    assert third.get_json()["name"] == "Renamed"
+    assert third.headers["ETag"] != etag
+
+def test_if_modified_since(client, room_id):
+    first = client.get(f"/api/study_rooms/{room_id}")
+    last_modified = first.headers["Last-Modified"]
+    assert client.get(f"/api/study_rooms/{room_id}", headers={"If-Modified-Since": last_modified}).status_code == 304
+    old = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert client.get(f"/api/study_rooms/{room_id}", headers={"If-Modified-Since": old}).status_code == 200
+
+def test_list_etag_changes_with_page_contents(app_instance, client, room_id):
+    first = client.get("/api/study_rooms", query_string={"limit": 2})
+    etag = first.headers["ETag"]
+    # Deleting a row would not move a Last-Modified forward, so lists have none
+    assert "Last-Modified" not in first.headers
+    assert client.get("/api/study_rooms", query_string={"limit": 2},
+                      headers={"If-None-Match": etag}).status_code == 304
+    # A different page has a different representation
+    assert client.get("/api/study_rooms", query_string={"limit": 3},
+                      headers={"If-None-Match": etag}).status_code == 200
+
+    with app_instance.app_context():
+        db.session.delete(db.session.get(StudyRoom, room_id))
+        db.session.commit()
+    assert client.get("/api/study_rooms", query_string={"limit": 2},
+                      headers={"If-None-Match": etag}).status_code == 200
+
+    users = client.get("/api/users")
+    assert client.get("/api/users", headers={"If-None-Match": users.headers["ETag"]}).status_code == 304
+
+def test_missing_room_is_still_404(client, room_id):
+    assert client.get("/api/study_rooms/9999", headers={"If-None-Match": "*"}).status_code == 404
@@ -0,0 +1,63 @@
+# tests/test_export.py
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+import pytest
+from app import db
+from app.models import Post, StudyRoom, User
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class ExportConfig(TestConfig):
+        EXPORT_BATCH_SIZE = 4
+    return ExportConfig
+
+@pytest.fixture
+def posts(app_instance):
+    with app_instance.app_context():
+        author = User(username="author", email="author@example.com", password="x")
+        db.session.add(author)
+        db.session.commit()
+        room = StudyRoom(name="Export room", capacity=10, creator_id=author.id)
+        db.session.add(room)
+        db.session.commit()
+        for i in range(10):
+            post = Post(content=f"Post {i}, with a comma", creator_id=author.id, room_id=room.room_id)
+            post.created_at = datetime(2024, 1, 1 + i)
+            db.session.add(post)
+        db.session.commit()
+
+def test_export_ndjson_streams_all_rows(client, posts):
+    response = client.get("/api/export/posts")
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["content"] for row in rows] == [f"Post {i}, with a comma" for i in range(10)]
+    assert rows[0]["created_at"] == "2024-01-01T00:00:00"
+
+def test_export_csv_since_and_gzip(client, posts):
+    response = client.get("/api/export/posts", query_string={"format": "csv", "since": "2024-01-08", "gzip": "true"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    text = gzip.decompress(response.get_data()).decode("utf-8")
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [row["content"] for row in rows] == [f"Post {i}, with a comma" for i in (7, 8, 9)]
+    assert rows[0]["created_at"] == "2024-01-08T00:00:00"
+
+def test_export_validates_parameters(client, posts):
+    assert client.get("/api/export/users").status_code == 404
+    assert client.get("/api/export/posts", query_string={"format": "xml"}).status_code == 400
+    assert client.get("/api/export/posts", query_string={"since": "yesterday"}).status_code == 400
+    response = client.get("/api/export/comments", query_string={"format": "csv"})
+    assert response.get_data(as_text=True).strip() == "comment_id,post_id,creator_id,content,created_at"
+
+def test_export_command_writes_file(app_instance, posts, tmp_path):
+    output = tmp_path / "rooms.ndjson"
+    result = app_instance.test_cli_runner().invoke(args=["export", "study_rooms", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert [row["name"] for row in rows] == ["Export room"]
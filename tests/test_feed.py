@@ -0,0 +1,65 @@
+# tests/test_feed.py
+import pytest
+from sqlalchemy import event
+from app import db
+from app.models import Comment, Media, Post, StudyRoom, User
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class FeedConfig(TestConfig):
+        FEED_COMMENTS_PER_POST = 2
+    return FeedConfig
+
+@pytest.fixture
+def room_id(app_instance):
+    with app_instance.app_context():
+        author = User(username="author", email="author@example.com", password="x")
+        db.session.add(author)
+        db.session.commit()
+        room = StudyRoom(name="Feed room", capacity=10, creator_id=author.id)
+        db.session.add(room)
+        db.session.commit()
+        for i in range(12):
+            post = Post(content=f"Post {i}", creator_id=author.id, room_id=room.room_id)
+            db.session.add(post)
+            db.session.flush()
+            db.session.add(Media(type="image", file_path=f"/media/{i}.png", post_id=post.post_id))
+            for j in range(3):
+                db.session.add(Comment(post_id=post.post_id, creator_id=author.id, content=f"Comment {j}"))
+        db.session.commit()
+        return room.room_id
+
+def count_feed_queries(app_instance, client, room_id, limit):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app_instance.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(f"/api/study_rooms/{room_id}/feed", query_string={"limit": limit})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return response.get_json(), len(statements)
+
+def test_feed_returns_posts_with_media_and_recent_comments(app_instance, client, room_id):
+    data, _ = count_feed_queries(app_instance, client, room_id, 5)
+    assert [post["content"] for post in data["posts"]] == [f"Post {i}" for i in range(11, 6, -1)]
+    first = data["posts"][0]
+    assert len(first["media"]) == 1
+    assert [c["content"] for c in first["recent_comments"]] == ["Comment 2", "Comment 1"]
+    assert data["next_cursor"] is not None
+
+def test_feed_query_count_does_not_grow_with_page_size(app_instance, client, room_id):
+    _, small_page_queries = count_feed_queries(app_instance, client, room_id, 2)
+    _, large_page_queries = count_feed_queries(app_instance, client, room_id, 10)
+    assert small_page_queries == large_page_queries
+    assert large_page_queries <= 4
+
+def test_feed_unknown_room(client):
+    response = client.get("/api/study_rooms/999/feed")
+    assert response.status_code == 404
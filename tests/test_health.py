@@ -0,0 +1,28 @@
+# tests/test_health.py
+from sqlalchemy.exc import OperationalError
+from app import db
+
+def test_liveness_never_queries(client, query_budget):
+    with query_budget(0):
+        response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+def test_readiness_check_is_cached(client, query_budget):
+    with query_budget(1) as statements:
+        for _ in range(5):
+            response = client.get("/readyz")
+            assert response.status_code == 200
+    assert statements == ["SELECT 1"]
+
+def test_readiness_fails_when_the_database_is_down(app_instance, client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    app_instance.extensions["readiness"].ttl = 0
+    monkeypatch.setattr(db.session, "execute", fail)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "unavailable"
+    monkeypatch.undo()
+    assert client.get("/readyz").status_code == 200
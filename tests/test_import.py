@@ -0,0 +1,94 @@
+# tests/test_import.py
+import json
+import pytest
+from app import db
+from app.models import Comment, Post, StudyRoom, User
+
+@pytest.fixture
+def app_instance(app_instance):
+    with app_instance.app_context():
+        # Existing rows force the imported ids to be remapped
+        existing = User(username="existing", email="existing@example.com", password="x")
+        db.session.add(existing)
+        db.session.commit()
+        db.session.add(StudyRoom(name="Existing room", capacity=5, creator_id=existing.id))
+        db.session.commit()
+    return app_instance
+
+def write_ndjson(path, rows):
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+    return str(path)
+
+def import_args(tmp_path, users=None, posts=None, comments=None):
+    users = users if users is not None else [
+        {"id": 1, "username": "ana", "email": "ana@example.com", "password": "h1"},
+        {"id": 2, "username": "ben", "email": "ben@example.com", "password": "h2"},
+    ]
+    posts = posts if posts is not None else [
+        {"post_id": 1, "content": "Hello", "creator_id": 2, "room_id": 1, "created_at": "2024-03-01T10:00:00Z"},
+    ]
+    comments = comments if comments is not None else [
+        {"comment_id": 1, "post_id": 1, "creator_id": 1, "content": "Hi Ben"},
+    ]
+    return [
+        write_ndjson(tmp_path / "users.ndjson", users),
+        write_ndjson(tmp_path / "posts.ndjson", posts),
+        write_ndjson(tmp_path / "comments.ndjson", comments),
+    ]
+
+def test_import_remaps_ids_and_foreign_keys(app_instance, tmp_path):
+    result = app_instance.test_cli_runner().invoke(args=["import", *import_args(tmp_path), "--batch-size", "1"])
+    assert result.exit_code == 0, result.output
+    assert "users: imported 2 rows (new id = source id + 1)" in result.output
+
+    with app_instance.app_context():
+        ben = User.query.filter_by(username="ben").one()
+        ana = User.query.filter_by(username="ana").one()
+        assert ben.id == 3
+        post = Post.query.one()
+        # room_id 1 was not part of the import, so it points at the existing room
+        assert (post.creator_id, post.room_id) == (ben.id, 1)
+        assert post.created_at.isoformat() == "2024-03-01T10:00:00"
+        comment = Comment.query.one()
+        assert (comment.post_id, comment.creator_id) == (post.post_id, ana.id)
+
+def test_import_aborts_on_broken_references(app_instance, tmp_path):
+    args = import_args(tmp_path, comments=[{"comment_id": 1, "post_id": 7, "creator_id": 1, "content": "Orphan"}])
+    result = app_instance.test_cli_runner().invoke(args=["import", *args])
+    assert result.exit_code == 1
+    assert "missing posts.post_id via post_id" in result.output
+    with app_instance.app_context():
+        assert User.query.count() == 1
+        assert Post.query.count() == 0
+
+def test_import_keep_ids_rejects_ids_in_use(app_instance, tmp_path):
+    # User 1 already exists
+    result = app_instance.test_cli_runner().invoke(args=["import", *import_args(tmp_path), "--keep-ids"])
+    assert result.exit_code == 1
+    assert "users: 1 id value(s) already in use" in result.output
+    with app_instance.app_context():
+        assert User.query.count() == 1
+
+def test_import_skip_invalid_drops_dependent_rows(app_instance, tmp_path):
+    users = [
+        {"id": 1, "username": "ana", "email": "ana@example.com", "password": "h1"},
+        {"id": 2, "username": "dup", "email": "EXISTING@example.com", "password": "h2"},
+    ]
+    args = import_args(tmp_path, users=users)
+    result = app_instance.test_cli_runner().invoke(args=["import", *args, "--skip-invalid"])
+    assert result.exit_code == 0, result.output
+    with app_instance.app_context():
+        # The user with a taken email is dropped, and with it the post by that user
+        assert [user.username for user in User.query.order_by(User.id)] == ["existing", "ana"]
+        assert Post.query.count() == 0
+        assert Comment.query.count() == 0
+
+def test_import_csv(app_instance, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("id,username,email,password,created_at\n10,cara,cara@example.com,h3,\n")
+    result = app_instance.test_cli_runner().invoke(args=["import", str(path), "--keep-ids"])
+    assert result.exit_code == 0, result.output
+    with app_instance.app_context():
+        cara = db.session.get(User, 10)
+        assert cara.email == "cara@example.com"
+        assert cara.created_at is not None
@@ -0,0 +1,76 @@
+# tests/test_indexes.py
+import os
+import re
+import pytest
+from sqlalchemy import func, select, text
+from app import db
+from app.models import Comment, Media, Post, StudyRoom, User
+from app.models.search_index import FULL_TEXT_INDEXES
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "schema.sql")
+
+@pytest.fixture
+def seeded(app_instance):
+    with app_instance.app_context():
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password="x") for i in range(50)]
+        db.session.add_all(users)
+        db.session.flush()
+        rooms = [StudyRoom(name=f"Room {i}", capacity=5, creator_id=users[i].id) for i in range(10)]
+        db.session.add_all(rooms)
+        db.session.flush()
+        for i in range(500):
+            post = Post(content=f"Post {i}", creator_id=users[i % 50].id, room_id=rooms[i % 10].room_id)
+            db.session.add(post)
+            db.session.flush()
+            db.session.add(Comment(post_id=post.post_id, creator_id=users[i % 50].id, content="hi"))
+            db.session.add(Media(type="image", file_path=f"{i}.png", post_id=post.post_id))
+        db.session.commit()
+        db.session.execute(text("ANALYZE"))
+    return app_instance
+
+def query_plan(statement):
+    compiled = statement.compile(dialect=db.engine.dialect, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return " | ".join(row[-1] for row in rows)
+
+def test_models_and_schema_declare_the_same_indexes(app_instance):
+    with open(SCHEMA_PATH) as f:
+        schema_indexes = set(re.findall(r"CREATE (?:UNIQUE )?INDEX IF NOT EXISTS (\w+)", f.read()))
+    model_indexes = {
+        index.name
+        for table in db.metadata.tables.values()
+        for index in table.indexes
+    }
+    assert schema_indexes == model_indexes | set(FULL_TEXT_INDEXES)
+
+@pytest.mark.parametrize("name, build, index", [
+    (
+        "room feed",
+        lambda: select(Post).where(Post.room_id == 3).order_by(Post.created_at.desc(), Post.post_id.desc()).limit(20),
+        "ix_posts_room_id_created_at",
+    ),
+    (
+        "posts by author",
+        lambda: select(Post).where(Post.creator_id == 7),
+        "ix_posts_creator_id",
+    ),
+    (
+        "comments of posts",
+        lambda: select(Comment).where(Comment.post_id.in_([1, 2, 3])).order_by(Comment.post_id, Comment.created_at),
+        "ix_comments_post_id_created_at",
+    ),
+    (
+        "media of posts",
+        lambda: select(Media).where(Media.post_id.in_([1, 2, 3])),
+        "ix_media_post_id",
+    ),
+    (
+        "login lookup",
+        lambda: select(User).where(func.lower(User.email) == "user7@example.com"),
+        "ix_users_email_lower",
+    ),
+])
+def test_hot_queries_use_indexes(seeded, name, build, index):
+    with seeded.app_context():
+        plan = query_plan(build())
+    assert index in plan, f"{name}: {plan}"
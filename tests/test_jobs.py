@@ -0,0 +1,116 @@
+# tests/test_jobs.py
+import os
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models import Job, Media
+from app.services.job_queue import claim_next_job, enqueue, job_handler, run_job, run_pending_jobs
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config(tmp_path):
+    class JobsConfig(TestConfig):
+        MEDIA_STORAGE_ROOT = str(tmp_path)
+        JOB_RETRY_BASE_SECONDS = 0
+    return JobsConfig
+
+def test_upload_is_processed_in_background(app_instance, client):
+    response = client.post("/api/media/upload", data=b"\x00" * 2048, content_type="audio/wav")
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["status"] == "pending"
+
+    with app_instance.app_context():
+        assert Job.query.filter_by(kind="media.process", status="queued").count() == 1
+        assert run_pending_jobs() == 1
+        assert db.session.get(Media, data["media_id"]).status == "ready"
+        assert Job.query.one().status == "done"
+
+def test_corrupted_file_marks_media_failed(app_instance, client):
+    data = client.post("/api/media/upload", data=b"original", content_type="image/png").get_json()
+    with open(os.path.join(app_instance.config["MEDIA_STORAGE_ROOT"], data["file_path"]), "wb") as f:
+        f.write(b"tampered")
+
+    with app_instance.app_context():
+        run_pending_jobs()
+        assert db.session.get(Media, data["media_id"]).status == "failed"
+        assert Job.query.one().status == "failed"
+
+def test_failed_jobs_are_retried_until_max_attempts(app_instance):
+    calls = []
+
+    @job_handler("test.flaky")
+    def flaky(payload):
+        calls.append(payload["n"])
+        if len(calls) < 3:
+            raise RuntimeError("try again")
+
+    with app_instance.app_context():
+        enqueue("test.flaky", {"n": 1}, max_attempts=3)
+        db.session.commit()
+        assert run_pending_jobs() == 3
+        job = Job.query.one()
+        assert job.status == "done"
+        assert job.attempts == 3
+
+def test_stale_jobs_count_attempts_and_fail_at_max(app_instance):
+    failures = []
+
+    @job_handler("test.crashing", on_failure=lambda payload, error: failures.append(payload["n"]))
+    def crashing(payload):
+        pass
+
+    with app_instance.app_context():
+        enqueue("test.crashing", {"n": 1}, max_attempts=2)
+        db.session.commit()
+        stale = datetime.utcnow() - timedelta(seconds=app_instance.config["JOB_LOCK_TIMEOUT"] + 1)
+        for attempt in (1, 2):
+            # The worker that claimed the job dies without recording anything
+            job = claim_next_job()
+            assert job.attempts == attempt
+            Job.query.update({"locked_at": stale})
+            db.session.commit()
+
+        assert claim_next_job() is None
+        job = Job.query.one()
+        assert job.status == "failed"
+        assert job.attempts == 2
+        assert failures == [1]
+
+def test_reclaimed_job_outcome_is_not_overwritten(app_instance):
+    @job_handler("test.slow")
+    def slow(payload):
+        # Meanwhile another worker reclaims the job as stale
+        Job.query.update({"locked_at": datetime.utcnow() + timedelta(seconds=1)})
+        db.session.commit()
+
+    with app_instance.app_context():
+        enqueue("test.slow")
+        db.session.commit()
+        assert run_job(claim_next_job()) is True
+        job = Job.query.one()
+        assert job.status == "running"
+        assert job.locked_at is not None
+
+def test_unreadable_image_fails_without_retrying(app_instance, client):
+    pytest.importorskip("PIL")
+    data = client.post("/api/media/upload", data=b"not an image", content_type="image/png").get_json()
+    with app_instance.app_context():
+        assert run_pending_jobs() == 1
+        job = Job.query.one()
+        assert job.status == "failed"
+        assert job.attempts == 1
+        assert db.session.get(Media, data["media_id"]).status == "failed"
+
+def test_unreadable_video_fails_without_retrying(app_instance, client, tmp_path, monkeypatch):
+    ffprobe = tmp_path / "ffprobe"
+    ffprobe.write_text("#!/bin/sh\necho 'Invalid data found when processing input' >&2\nexit 1\n")
+    ffprobe.chmod(0o755)
+    monkeypatch.setattr("app.services.media_jobs.shutil.which", lambda name: str(ffprobe))
+    data = client.post("/api/media/upload", data=b"not a video", content_type="video/mp4").get_json()
+    with app_instance.app_context():
+        assert run_pending_jobs() == 1
+        job = Job.query.one()
+        assert job.status == "failed"
+        assert job.attempts == 1
+        assert db.session.get(Media, data["media_id"]).status == "failed"
@@ -0,0 +1,50 @@
+# tests/test_json_provider.py
+import json
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from flask import request
+from werkzeug.exceptions import BadRequest
+from app import db
+from app import json_provider
+from app.models import User
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    return request.param
+
+def test_provider_encodes_datetimes_models_and_decimals(app_instance, encoder):
+    with app_instance.app_context():
+        user = User(username="ana", email="ana@example.com", password="hash")
+        user.created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+        db.session.add(user)
+        db.session.commit()
+        with app_instance.test_request_context():
+            response = app_instance.json.response(
+                user=user, at=datetime(2024, 1, 2, 3, 4, 5), price=Decimal("1.50"), ids={3}
+            )
+    data = json.loads(response.get_data())
+    assert data["at"] == "2024-01-02T03:04:05"
+    assert data["price"] == "1.50"
+    assert data["ids"] == [3]
+    assert data["user"] == {
+        "id": user.id, "username": "ana", "email": "ana@example.com",
+        "created_at": "2024-05-01T12:30:15.123456", "updated_at": user.updated_at.isoformat()
+    }
+
+def test_encoders_produce_the_same_output(app_instance, monkeypatch):
+    payload = {"b": [1, 2.5, None, True], "a": "café", "c": {"z": 1, "y": 2}}
+    with app_instance.app_context():
+        fast = app_instance.json.dumps(payload)
+        monkeypatch.setattr(json_provider, "orjson", None)
+        assert app_instance.json.dumps(payload) == fast
+    assert fast == '{"a":"café","b":[1,2.5,null,true],"c":{"y":2,"z":1}}'
+
+def test_request_parsing_uses_provider(app_instance, encoder):
+    with app_instance.test_request_context(json={"content": "hi", "n": [1, 2]}):
+        assert request.get_json() == {"content": "hi", "n": [1, 2]}
+    with app_instance.test_request_context(data="{not json", content_type="application/json"):
+        with pytest.raises(BadRequest):
+            request.get_json()
@@ -0,0 +1,58 @@
+# tests/test_media_upload.py
+import hashlib
+import io
+import os
+import pytest
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config(tmp_path):
+    class MediaUploadConfig(TestConfig):
+        MEDIA_STORAGE_ROOT = str(tmp_path)
+        MEDIA_UPLOAD_CHUNK_SIZE = 1024
+    return MediaUploadConfig
+
+def test_raw_upload_is_content_addressed(app_instance, client):
+    body = os.urandom(10 * 1024 + 7)
+    response = client.post("/api/media/upload", data=body, content_type="image/png")
+    assert response.status_code == 201
+    data = response.get_json()
+    digest = hashlib.sha256(body).hexdigest()
+    assert data["type"] == "image"
+    assert data["mime_type"] == "image/png"
+    assert data["content_hash"] == digest
+    assert data["size_bytes"] == len(body)
+    stored = os.path.join(app_instance.config["MEDIA_STORAGE_ROOT"], data["file_path"])
+    with open(stored, "rb") as f:
+        assert f.read() == body
+
+def test_identical_uploads_are_deduplicated(app_instance, client):
+    body = b"same bytes" * 500
+    first = client.post("/api/media/upload", data=body, content_type="audio/mpeg").get_json()
+    second = client.post(
+        "/api/media/upload",
+        data={"file": (io.BytesIO(body), "clip.mp3", "audio/mpeg")},
+        content_type="multipart/form-data"
+    ).get_json()
+    assert first["deduplicated"] is False
+    assert second["deduplicated"] is True
+    assert first["file_path"] == second["file_path"]
+    assert first["media_id"] != second["media_id"]
+
+def test_upload_rejects_unknown_type(client):
+    response = client.post("/api/media/upload", data=b"abc", content_type="application/pdf")
+    assert response.status_code == 400
+
+def test_upload_too_large(app_instance, client):
+    app_instance.config["MEDIA_MAX_UPLOAD_BYTES"] = 2048
+    response = client.post("/api/media/upload", data=b"x" * 4096, content_type="video/mp4")
+    assert response.status_code == 413
+    leftovers = os.listdir(os.path.join(app_instance.config["MEDIA_STORAGE_ROOT"], "tmp"))
+    assert leftovers == []
+
+def test_empty_upload_stores_nothing(app_instance, client):
+    response = client.post("/api/media/upload", data=b"", content_type="image/png")
+    assert response.status_code == 400
+    root = app_instance.config["MEDIA_STORAGE_ROOT"]
+    assert os.listdir(os.path.join(root, "tmp")) == []
+    assert sorted(os.listdir(root)) == ["tmp"]
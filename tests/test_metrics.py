@@ -0,0 +1,104 @@
+# tests/test_metrics.py
+import pytest
+from flask import Flask
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app import db
+from app.models import StudyRoom, User
+from app.config import Config, engine_options
+from app.metrics import POOL_CAPACITY, InstrumentedQueuePool, configure_engine_options, instrument_engine
+
+def test_engine_options_for_postgres(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "1500")
+    monkeypatch.setenv("DB_LOCK_TIMEOUT_MS", "0")
+    options = engine_options("postgresql://user:pw@db:5432/app")
+    assert options["pool_size"] == 7
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"options": "-c statement_timeout=1500"}
+    assert engine_options("sqlite:///:memory:") == {}
+
+def test_engine_options_follow_the_final_database_uri():
+    class PostgresConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "postgresql://user:pw@db:5432/app"
+
+    app = Flask(__name__)
+    app.config.from_object(PostgresConfig)
+    configure_engine_options(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"]["poolclass"] is InstrumentedQueuePool
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    app.config.pop("SQLALCHEMY_ENGINE_OPTIONS")
+    configure_engine_options(app)
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {}
+
+def test_pool_wait_and_saturation_are_recorded(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01
+    )
+    POOL_CAPACITY.set(0)
+    instrument_engine(engine)
+    # Set by the process that uses the pool, not the one that instruments it
+    assert REGISTRY.get_sample_value("db_pool_capacity_connections") == 0
+    waits_before = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+    timeouts_before = REGISTRY.get_sample_value("db_pool_checkout_timeouts_total") or 0
+
+    with engine.connect():
+        assert REGISTRY.get_sample_value("db_pool_checked_out_connections") == 1
+        assert REGISTRY.get_sample_value("db_pool_capacity_connections") == 1
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    assert REGISTRY.get_sample_value("db_pool_checked_out_connections") == 0
+    assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") == waits_before + 2
+    assert REGISTRY.get_sample_value("db_pool_checkout_timeouts_total") == timeouts_before + 1
+    engine.dispose()
+
+def test_metrics_endpoint(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "db_pool_checkout_wait_seconds" in response.get_data(as_text=True)
+
+def sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+def test_request_metrics_per_endpoint(app_instance, client):
+    with app_instance.app_context():
+        owner = User(username="owner", email="owner@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        db.session.add(StudyRoom(name="Room", capacity=3, creator_id=owner.id))
+        db.session.commit()
+    labels = {"endpoint": "api.get_all_study_rooms"}
+    requests_before = sample("http_requests_total", {**labels, "method": "GET", "status": "200"})
+    queries_before = sample("db_queries_per_request_sum", labels)
+    statements_before = sample("db_query_duration_seconds_count")
+
+    assert client.get("/api/study_rooms").status_code == 200
+    assert sample("http_requests_total", {**labels, "method": "GET", "status": "200"}) == requests_before + 1
+    assert sample("http_request_duration_seconds_count", {**labels, "method": "GET"}) >= 1
+    assert sample("http_response_size_bytes_sum", labels) > 0
+    # The ETag query plus the page query
+    assert sample("db_queries_per_request_sum", labels) == queries_before + 2
+    assert sample("db_query_duration_seconds_count") >= statements_before + 2
+
+    not_found = {"endpoint": "unmatched", "method": "GET", "status": "404"}
+    before = sample("http_requests_total", not_found)
+    client.get("/no/such/path")
+    assert sample("http_requests_total", not_found) == before + 1
+
+def test_revocation_checks_are_timed(client):
+    before = sample("jwt_revocation_check_seconds_count")
+    client.post("/api/logout", headers={"Authorization": "Bearer not-a-token"})
+    with client.application.app_context():
+        from flask_jwt_extended import create_access_token
+        token = create_access_token(identity="1")
+    client.post("/api/logout", headers={"Authorization": f"Bearer {token}"})
+    assert sample("jwt_revocation_check_seconds_count") == before + 1
+
+def test_multiprocess_metrics_endpoint(client, tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
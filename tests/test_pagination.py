@@ -0,0 +1,57 @@
+# tests/test_pagination.py
+import pytest
+from app import db
+from app.models import StudyRoom, User
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class PaginationConfig(TestConfig):
+        PAGINATION_MAX_LIMIT = 5
+    return PaginationConfig
+
+@pytest.fixture
+def rooms(app_instance):
+    with app_instance.app_context():
+        creator = User(username="owner", email="owner@example.com", password="x")
+        db.session.add(creator)
+        db.session.commit()
+        db.session.add_all([
+            StudyRoom(name=f"Room {i}", capacity=4, creator_id=creator.id)
+            for i in range(12)
+        ])
+        db.session.commit()
+        return [room.room_id for room in StudyRoom.query.order_by(StudyRoom.room_id)]
+
+def test_study_rooms_walks_every_page(client, rooms):
+    seen = []
+    after = None
+    while True:
+        query = {"limit": 4}
+        if after:
+            query["after"] = after
+        response = client.get("/api/study_rooms", query_string=query)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data["study_rooms"]) <= 4
+        seen.extend(room["room_id"] for room in data["study_rooms"])
+        after = data["next_cursor"]
+        if after is None:
+            break
+    assert seen == rooms
+
+def test_limit_is_capped_by_server(client, rooms):
+    response = client.get("/api/study_rooms", query_string={"limit": 1000})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert len(data["study_rooms"]) == 5
+    assert data["next_cursor"] is not None
+
+def test_invalid_cursor_rejected(client, rooms):
+    response = client.get("/api/study_rooms", query_string={"after": "not-a-cursor"})
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.get_json()["message"]
+
+def test_invalid_limit_rejected(client):
+    response = client.get("/api/users", query_string={"limit": "abc"})
+    assert response.status_code == 400
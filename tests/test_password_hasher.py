@@ -0,0 +1,68 @@
+# tests/test_password_hasher.py
+import os
+import time
+import pytest
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import User
+from app.services.auth_service import login_user_service
+from app.services import password_hasher
+from app.services.password_hasher import HashingPoolBusy, hash_password, verify_password
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class PasswordHasherConfig(TestConfig):
+        PASSWORD_HASH_WORKERS = 1
+    return PasswordHasherConfig
+
+def test_hash_and_verify_in_pool(app_instance):
+    with app_instance.app_context():
+        password_hash = hash_password("s3cret")
+        assert password_hash.startswith(app_instance.config["PASSWORD_HASH_METHOD"] + "$")
+        assert verify_password(password_hash, "s3cret") is True
+        assert verify_password(password_hash, "wrong") is False
+
+def test_signup_returns_503_when_pool_is_full(app_instance, client):
+    app_instance.config["PASSWORD_HASH_MAX_PENDING"] = 0
+    payload = {
+        "username": "busyuser",
+        "email": "busy@example.com",
+        "password": "password123"
+    }
+    response = client.post("/api/signup", json=payload)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(app_instance.config["PASSWORD_HASH_RETRY_AFTER"])
+
+def test_login_upgrades_outdated_hash(app_instance):
+    with app_instance.app_context():
+        old_hash = generate_password_hash("s3cret", method="pbkdf2:sha256:1000")
+        user = User(username="legacy", email="legacy@example.com", password=old_hash)
+        db.session.add(user)
+        db.session.commit()
+
+        assert login_user_service("legacy@example.com", "s3cret") is not None
+        refreshed = db.session.get(User, user.id)
+        assert refreshed.password != old_hash
+        assert refreshed.password.startswith(app_instance.config["PASSWORD_HASH_METHOD"] + "$")
+
+def test_timed_out_calls_keep_their_slot_until_done(app_instance):
+    app_instance.config["PASSWORD_HASH_TIMEOUT"] = 0.05
+    with app_instance.app_context():
+        with pytest.raises(HashingPoolBusy):
+            password_hasher._run(time.sleep, 0.5)
+        # Still running in the pool, so it still counts against PASSWORD_HASH_MAX_PENDING
+        assert password_hasher._pending == 1
+        deadline = time.monotonic() + 5
+        while password_hasher._pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert password_hasher._pending == 0
+
+def test_broken_pool_is_replaced(app_instance):
+    with app_instance.app_context():
+        with pytest.raises(HashingPoolBusy):
+            # Kills the pool's worker process, like the OOM killer would
+            password_hasher._run(os._exit, 1)
+        assert password_hasher._pending == 0
+        password_hash = hash_password("s3cret")
+        assert verify_password(password_hash, "s3cret") is True
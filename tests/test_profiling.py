@@ -0,0 +1,84 @@
+# tests/test_profiling.py
+import json
+import logging
+import pytest
+from sqlalchemy import create_engine, text
+from app import create_app, db
+from app.models import StudyRoom, User
+from app.profiling import instrument_slow_queries
+from app.query_tracker import instrument_queries
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    return tmp_path / "profiles"
+
+@pytest.fixture
+def app_config(profile_dir):
+    class ProfilingConfig(TestConfig):
+        PROFILING_ENABLED = True
+        PROFILING_TOKEN = "secret"
+        PROFILING_SAMPLE_RATE = 0.0
+        PROFILING_DIR = str(profile_dir)
+        PROFILING_MAX_REPORTS = 2
+    return ProfilingConfig
+
+@pytest.fixture
+def app_instance(app_instance):
+    with app_instance.app_context():
+        user = User(username="owner", email="owner@example.com", password="x")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(StudyRoom(name="Algebra", capacity=5, creator_id=user.id))
+        db.session.commit()
+    return app_instance
+
+def test_profiled_request_writes_report(client, profile_dir):
+    response = client.get("/api/study_rooms/1", headers={"X-Profile": "secret"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    report = json.loads((profile_dir / f"{profile_id}.json").read_text())
+    assert (profile_dir / f"{profile_id}.prof").exists()
+    assert report["endpoint"] == "api.get_study_room"
+    assert report["status"] == 200
+    assert report["sql"]["count"] == len(report["sql"]["statements"]) >= 1
+    assert any("FROM study_rooms" in s["statement"] for s in report["sql"]["statements"])
+    assert "cumulative" in report["top_functions"]
+
+def test_requests_without_valid_header_are_not_profiled(client, profile_dir):
+    assert "X-Profile-Id" not in client.get("/api/study_rooms/1").headers
+    assert "X-Profile-Id" not in client.get("/api/study_rooms/1", headers={"X-Profile": "wrong"}).headers
+    assert not profile_dir.exists()
+
+def test_only_newest_reports_are_kept(client, profile_dir):
+    ids = [client.get("/api/study_rooms", headers={"X-Profile": "secret"}).headers["X-Profile-Id"]
+           for _ in range(3)]
+    kept = sorted(path.name for path in profile_dir.iterdir())
+    assert len(kept) == 4
+    assert f"{ids[0]}.json" not in kept
+
+def test_slow_queries_are_logged_with_plan(caplog):
+    engine = create_engine("sqlite://")
+    instrument_queries(engine)
+    instrument_slow_queries(engine, threshold_ms=0)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, v INTEGER)"))
+        with caplog.at_level(logging.WARNING, logger="app.profiling"):
+            conn.execute(text("SELECT * FROM t WHERE id = :id"), {"id": 1})
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("Slow query" in m and "SELECT * FROM t" in m and "Plan:" in m for m in messages)
+    assert not any("Parameters:" in m for m in messages)
+    engine.dispose()
+
+def test_header_is_ignored_without_a_token(profile_dir):
+    class NoTokenConfig(TestConfig):
+        PROFILING_ENABLED = True
+        PROFILING_DIR = str(profile_dir)
+
+    app = create_app(NoTokenConfig)
+    with app.app_context():
+        db.create_all()
+    response = app.test_client().get("/", headers={"X-Profile": ""})
+    assert "X-Profile-Id" not in response.headers
+    assert not profile_dir.exists()
@@ -0,0 +1,62 @@
+# tests/test_query_detector.py
+import logging
+import pytest
+from flask import jsonify
+from app import db
+from app.models import Post, StudyRoom, User
+from app.query_detector import RepeatedQueryError, query_shape, repeated_queries
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config():
+    class QueryDetectorConfig(TestConfig):
+        QUERY_DETECTOR = "raise"
+        QUERY_DETECTOR_THRESHOLD = 3
+    return QueryDetectorConfig
+
+@pytest.fixture
+def app_instance(app_instance):
+    # Touches a lazy relationship per row: one extra query per room
+    @app_instance.route("/rooms-with-creators")
+    def rooms_with_creators():
+        return jsonify([room.creator.username for room in StudyRoom.query.all()])
+
+    with app_instance.app_context():
+        users = [User(username=f"user{i}", email=f"user{i}@example.com", password="x") for i in range(5)]
+        db.session.add_all(users)
+        db.session.flush()
+        rooms = [StudyRoom(name=f"Room {i}", capacity=5, creator_id=user.id) for i, user in enumerate(users)]
+        db.session.add_all(rooms)
+        db.session.flush()
+        for room in rooms:
+            db.session.add_all([Post(content=f"Post {j}", creator_id=room.creator_id, room_id=room.room_id)
+                                for j in range(3)])
+        db.session.commit()
+    return app_instance
+
+def test_query_shape_ignores_whitespace_and_in_list_length():
+    assert query_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == "SELECT * FROM t WHERE id IN (...)"
+    assert query_shape("SELECT * FROM t WHERE id IN (?)") == query_shape("SELECT * FROM t WHERE id IN (?, ?)")
+    assert repeated_queries([("SELECT 1", 0.0)] * 3 + [("SELECT 2", 0.0)], 3) == [("SELECT 1", 3)]
+
+def test_per_row_queries_raise(client):
+    with pytest.raises(RepeatedQueryError, match="5x SELECT"):
+        client.get("/rooms-with-creators")
+
+def test_per_row_queries_warn(app_instance, client, caplog):
+    app_instance.config["QUERY_DETECTOR"] = "warn"
+    with caplog.at_level(logging.WARNING, logger="app.query_detector"):
+        response = client.get("/rooms-with-creators")
+    assert response.status_code == 200
+    assert any("Possible N+1 queries" in record.getMessage() for record in caplog.records)
+
+def test_endpoints_stay_within_budget(client, query_budget):
+    with query_budget(3):
+        assert client.get("/api/study_rooms").status_code == 200
+    with query_budget(4):
+        assert client.get("/api/study_rooms/1/feed").status_code == 200
+
+def test_budget_reports_overruns(client, query_budget):
+    with pytest.raises(AssertionError, match="budget is 1"):
+        with query_budget(1):
+            client.get("/api/study_rooms/1/feed")
@@ -0,0 +1,113 @@
+# tests/test_record_cache.py
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import event
+from app import db
+from app.models import StudyRoom, User
+from app.services.record_cache import RecordCache, InMemoryCacheBackend
+
+@pytest.fixture
+def ids(app_instance):
+    with app_instance.app_context():
+        owner = User(username="owner", email="owner@example.com", password="x")
+        db.session.add(owner)
+        db.session.commit()
+        room = StudyRoom(name="Hot room", capacity=4, creator_id=owner.id)
+        db.session.add(room)
+        db.session.commit()
+        return owner.id, room.room_id
+
+def count_statements(app_instance, send):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app_instance.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = send()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, statements
+
+def lookups(kind, result):
+    return REGISTRY.get_sample_value("record_cache_lookups_total", {"kind": kind, "result": result}) or 0
+
+def test_hot_room_reads_skip_the_database(app_instance, client, ids):
+    _, room_id = ids
+    misses = lookups("study_room", "miss")
+    hits = lookups("study_room", "local_hit")
+    client.get(f"/api/study_rooms/{room_id}")
+    response, statements = count_statements(app_instance, lambda: client.get(f"/api/study_rooms/{room_id}"))
+    assert response.status_code == 200
+    assert response.get_json()["name"] == "Hot room"
+    assert statements == []
+    assert lookups("study_room", "miss") == misses + 1
+    assert lookups("study_room", "local_hit") == hits + 1
+
+def test_commits_invalidate_cached_records(app_instance, client, ids):
+    _, room_id = ids
+    client.get(f"/api/study_rooms/{room_id}")
+    with app_instance.app_context():
+        db.session.get(StudyRoom, room_id).capacity = 12
+        db.session.commit()
+    assert client.get(f"/api/study_rooms/{room_id}").get_json()["capacity"] == 12
+
+    with app_instance.app_context():
+        db.session.get(StudyRoom, room_id).capacity = 30
+        db.session.rollback()
+    assert client.get(f"/api/study_rooms/{room_id}").get_json()["capacity"] == 12
+
+def test_create_post_checks_use_the_cache(app_instance, client, ids):
+    user_id, room_id = ids
+    payload = {"content": "Hello", "creator_id": user_id, "room_id": room_id}
+    client.post("/api/posts", json=payload)
+    response, statements = count_statements(app_instance, lambda: client.post("/api/posts", json=payload))
+    assert response.status_code == 201
+    assert not any("FROM users" in statement or "FROM study_rooms" in statement for statement in statements)
+    assert client.post("/api/posts", json={**payload, "creator_id": 999}).status_code == 404
+
+def test_shared_backend_serves_other_workers():
+    backend = InMemoryCacheBackend()
+    first = RecordCache(ttl=60, backend=backend)
+    second = RecordCache(ttl=60, backend=backend)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"room_id": 1, "name": "Shared"}
+
+    assert first.get("study_room", 1, loader)["name"] == "Shared"
+    assert second.get("study_room", 1, loader)["name"] == "Shared"
+    assert len(loads) == 1
+
+    second.invalidate("study_room", 1)
+    first.clear()
+    first.get("study_room", 1, loader)
+    assert len(loads) == 2
+
+def test_load_that_overlaps_an_invalidation_is_not_cached():
+    backend = InMemoryCacheBackend()
+    reader = RecordCache(ttl=60, backend=backend)
+    writer = RecordCache(ttl=60, backend=backend)
+    rows = {1: {"room_id": 1, "capacity": 4}}
+
+    def stale_loader():
+        record = dict(rows[1])
+        # Another worker commits and invalidates after this read, before the set
+        rows[1] = {"room_id": 1, "capacity": 12}
+        writer.invalidate("study_room", 1)
+        return record
+
+    assert reader.get("study_room", 1, stale_loader)["capacity"] == 4
+    assert backend.get("study_room:1") is None
+    # Neither tier kept the old record
+    assert reader.get("study_room", 1, lambda: dict(rows[1]))["capacity"] == 12
+    assert writer.get("study_room", 1, lambda: None)["capacity"] == 12
+
+def test_missing_records_are_not_cached():
+    cache = RecordCache(ttl=60)
+    assert cache.get("user", 5, lambda: None) is None
+    assert cache.get("user", 5, lambda: {"id": 5})["id"] == 5
@@ -0,0 +1,163 @@
+# tests/test_resumable_upload.py
+import hashlib
+import os
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.controllers import upload_controller
+from app.models import Media, UploadChunk, UploadSession
+from app.services.media_jobs import expire_upload_sessions
+from tests.conftest import TestConfig
+
+@pytest.fixture
+def app_config(tmp_path):
+    class ResumableUploadConfig(TestConfig):
+        MEDIA_STORAGE_ROOT = str(tmp_path)
+    return ResumableUploadConfig
+
+def start_upload(client, body, chunk_size, **extra):
+    payload = {
+        "type": "video",
+        "mime_type": "video/mp4",
+        "total_size": len(body),
+        "chunk_size": chunk_size
+    }
+    payload.update(extra)
+    response = client.post("/api/media/uploads", json=payload)
+    assert response.status_code == 201
+    return response.get_json()
+
+def test_chunks_in_any_order_then_complete(app_instance, client):
+    body = os.urandom(2500)
+    session = start_upload(client, body, 1000, sha256=hashlib.sha256(body).hexdigest())
+    upload_id = session["upload_id"]
+    assert session["total_chunks"] == 3
+
+    for index in (2, 0):
+        chunk = body[index * 1000:(index + 1) * 1000]
+        response = client.put(f"/api/media/uploads/{upload_id}/chunks/{index}", data=chunk)
+        assert response.status_code == 200
+
+    status = client.get(f"/api/media/uploads/{upload_id}").get_json()
+    assert status["received_chunks"] == [0, 2]
+    assert status["received_offsets"] == [0, 2000]
+    assert status["missing_chunks"] == [1]
+
+    # Finalizing before every chunk arrived must not create media
+    assert client.post(f"/api/media/uploads/{upload_id}/complete").status_code == 409
+
+    client.put(f"/api/media/uploads/{upload_id}/chunks/1", data=body[1000:2000])
+    response = client.post(f"/api/media/uploads/{upload_id}/complete")
+    assert response.status_code == 201
+    data = response.get_json()
+    assert data["size_bytes"] == len(body)
+    stored = os.path.join(app_instance.config["MEDIA_STORAGE_ROOT"], data["file_path"])
+    with open(stored, "rb") as f:
+        assert f.read() == body
+
+    status = client.get(f"/api/media/uploads/{upload_id}").get_json()
+    assert status["status"] == "completed"
+    assert status["media_id"] == data["media_id"]
+
+def test_chunk_with_wrong_size_is_rejected(client):
+    session = start_upload(client, b"x" * 1500, 1000)
+    response = client.put(f"/api/media/uploads/{session['upload_id']}/chunks/0", data=b"x" * 10)
+    assert response.status_code == 400
+
+def test_hash_mismatch_keeps_session_open(client):
+    body = b"abc" * 100
+    session = start_upload(client, body, 1000, sha256="0" * 64)
+    upload_id = session["upload_id"]
+    client.put(f"/api/media/uploads/{upload_id}/chunks/0", data=body)
+    response = client.post(f"/api/media/uploads/{upload_id}/complete")
+    assert response.status_code == 422
+    assert client.get(f"/api/media/uploads/{upload_id}").get_json()["status"] == "open"
+
+def test_chunk_size_is_capped(app_instance, client):
+    payload = {"type": "video", "mime_type": "video/mp4", "total_size": 10 ** 9, "chunk_size": 2 ** 31}
+    assert client.post("/api/media/uploads", json=payload).status_code == 400
+    payload["chunk_size"] = app_instance.config["MEDIA_RESUMABLE_MAX_CHUNK_SIZE"]
+    assert client.post("/api/media/uploads", json=payload).status_code == 201
+
+def test_chunks_are_rejected_once_completion_started(app_instance, client):
+    session = start_upload(client, b"x" * 1500, 1000)
+    upload_id = session["upload_id"]
+    with app_instance.app_context():
+        UploadSession.query.filter_by(upload_id=upload_id).update({"status": "assembling"})
+        db.session.commit()
+    response = client.put(f"/api/media/uploads/{upload_id}/chunks/0", data=b"x" * 1000)
+    assert response.status_code == 409
+    assert not os.path.exists(os.path.join(app_instance.config["MEDIA_STORAGE_ROOT"], "uploads", upload_id, "0.part"))
+
+def test_abandoned_sessions_expire(app_instance, client):
+    stale = start_upload(client, b"x" * 1500, 1000)["upload_id"]
+    active = start_upload(client, b"y" * 1500, 1000)["upload_id"]
+    for upload_id in (stale, active):
+        client.put(f"/api/media/uploads/{upload_id}/chunks/0", data=b"x" * 1000)
+
+    later = datetime.utcnow() + timedelta(seconds=app_instance.config["MEDIA_RESUMABLE_SESSION_TTL"] + 60)
+    with app_instance.app_context():
+        # Only the active session received a chunk recently
+        UploadSession.query.filter_by(upload_id=active).update({"expires_at": later + timedelta(hours=1)})
+        db.session.commit()
+        assert expire_upload_sessions(later) == 1
+        assert UploadChunk.query.filter_by(upload_id=stale).count() == 0
+        assert UploadChunk.query.filter_by(upload_id=active).count() == 1
+
+    uploads = os.path.join(app_instance.config["MEDIA_STORAGE_ROOT"], "uploads")
+    assert os.listdir(uploads) == [active]
+    assert client.get(f"/api/media/uploads/{stale}").get_json()["status"] == "expired"
+    assert client.put(f"/api/media/uploads/{stale}/chunks/1", data=b"x" * 500).status_code == 409
+
+def test_abandoned_completion_is_taken_over(app_instance, client):
+    body = b"z" * 1500
+    upload_id = start_upload(client, body, 1000)["upload_id"]
+    client.put(f"/api/media/uploads/{upload_id}/chunks/0", data=body[:1000])
+    client.put(f"/api/media/uploads/{upload_id}/chunks/1", data=body[1000:])
+
+    # A finalize call that claimed the session and then died
+    claimed_at = datetime.utcnow()
+    with app_instance.app_context():
+        UploadSession.query.filter_by(upload_id=upload_id).update({"status": "assembling", "locked_at": claimed_at})
+        db.session.commit()
+    assert client.post(f"/api/media/uploads/{upload_id}/complete").status_code == 409
+
+    timeout = timedelta(seconds=app_instance.config["MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT"] + 1)
+    with app_instance.app_context():
+        UploadSession.query.filter_by(upload_id=upload_id).update({"locked_at": claimed_at - timeout})
+        db.session.commit()
+    response = client.post(f"/api/media/uploads/{upload_id}/complete")
+    assert response.status_code == 201
+    assert response.get_json()["content_hash"] == hashlib.sha256(body).hexdigest()
+    assert client.get(f"/api/media/uploads/{upload_id}").get_json()["status"] == "completed"
+
+def test_abandoned_completion_expires(app_instance, client):
+    upload_id = start_upload(client, b"x" * 1500, 1000)["upload_id"]
+    client.put(f"/api/media/uploads/{upload_id}/chunks/0", data=b"x" * 1000)
+    later = datetime.utcnow() + timedelta(seconds=app_instance.config["MEDIA_RESUMABLE_SESSION_TTL"] + 60)
+    with app_instance.app_context():
+        UploadSession.query.filter_by(upload_id=upload_id).update({"status": "assembling", "locked_at": later})
+        db.session.commit()
+        # Past its expiry, but the finalize call may still be running
+        assert expire_upload_sessions(later) == 0
+        timeout = timedelta(seconds=app_instance.config["MEDIA_RESUMABLE_ASSEMBLY_TIMEOUT"])
+        assert expire_upload_sessions(later + timeout) == 1
+    assert client.get(f"/api/media/uploads/{upload_id}").get_json()["status"] == "expired"
+
+def test_completion_taken_over_meanwhile_is_discarded(app_instance, client, monkeypatch):
+    upload_id = start_upload(client, b"w" * 500, 1000)["upload_id"]
+    client.put(f"/api/media/uploads/{upload_id}/chunks/0", data=b"w" * 500)
+    original = upload_controller.assemble_chunks
+
+    def assemble_then_lose_claim(*args):
+        stored = original(*args)
+        # Another call took the claim over while this one was assembling
+        UploadSession.query.filter_by(upload_id=upload_id).update({"locked_at": datetime.utcnow() + timedelta(hours=1)})
+        db.session.commit()
+        return stored
+
+    monkeypatch.setattr(upload_controller, "assemble_chunks", assemble_then_lose_claim)
+    assert client.post(f"/api/media/uploads/{upload_id}/complete").status_code == 409
+    with app_instance.app_context():
+        assert Media.query.count() == 0
+        assert db.session.get(UploadSession, upload_id).status == "assembling"
@@ -0,0 +1,57 @@
+# tests/test_revocation.py
+from datetime import datetime, timedelta
+from app.services.revocation_store import CachedRevocationStore, InMemoryRevocationStore
+
+def signup_token(client):
+    payload = {
+        "username": "logoutuser",
+        "email": "logout@example.com",
+        "password": "password123"
+    }
+    response = client.post("/api/signup", json=payload)
+    assert response.status_code == 201
+    return response.get_json()["access_token"]
+
+def test_logout_revokes_token(client):
+    token = signup_token(client)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.post("/api/logout", headers=headers)
+    assert response.status_code == 200
+
+    # The same token must now be rejected
+    response = client.post("/api/logout", headers=headers)
+    assert response.status_code == 401
+
+def test_revocation_is_shared_through_backend():
+    # Two caches over one backend behave like two workers sharing a store
+    backend = InMemoryRevocationStore()
+    worker_a = CachedRevocationStore(backend, ttl=0.0)
+    worker_b = CachedRevocationStore(backend, ttl=0.0)
+
+    assert worker_b.is_revoked("abc") is False
+    worker_a.revoke("abc", datetime.utcnow() + timedelta(minutes=5))
+    assert worker_b.is_revoked("abc") is True
+
+def test_cache_answers_without_backend():
+    class CountingStore(InMemoryRevocationStore):
+        lookups = 0
+
+        def is_revoked(self, jti):
+            CountingStore.lookups += 1
+            return super().is_revoked(jti)
+
+    store = CachedRevocationStore(CountingStore(), ttl=60)
+    store.revoke("revoked", datetime.utcnow() + timedelta(minutes=5))
+    for _ in range(3):
+        assert store.is_revoked("revoked") is True
+        assert store.is_revoked("active") is False
+    assert CountingStore.lookups == 1
+
+def test_expired_entries_are_dropped():
+    store = InMemoryRevocationStore()
+    store.revoke("old", datetime.utcnow() - timedelta(seconds=1))
+    store.revoke("new", datetime.utcnow() + timedelta(minutes=5))
+    assert store.purge_expired() == 1
+    assert store.is_revoked("old") is False
+    assert store.is_revoked("new") is True
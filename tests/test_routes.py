@@ -1,22 +1,6 @@
 # tests/test_routes.py
-import pytest
-from app import create_app, db
-
-@pytest.fixture
-def app_instance():
-    app = create_app()
-    app.config["TESTING"] = True
-    # Use an in-memory SQLite database for testing purposes
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
-    with app.app_context():
-        db.create_all()
-    yield app
-    with app.app_context():
-        db.drop_all()
-
-@pytest.fixture
-def client(app_instance):
-    return app_instance.test_client()
+from app import create_app
+from app.config import Config
 
 def test_home_route(client):
     # Test the root route defined in the application (likely in app.py)
@@ -35,4 +19,12 @@ def test_get_users_empty(client):
         assert len(data) == 0
     else:
         assert response.status_code == 404
-        
\ No newline at end of file
+
+def test_create_app_does_no_database_io():
+    # Nothing listens on port 1, so any query during app creation would fail
+    class UnreachableDatabaseConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "postgresql+psycopg://user:pw@127.0.0.1:1/none"
+
+    app = create_app(UnreachableDatabaseConfig)
+    response = app.test_client().get("/")
+    assert response.status_code == 200
@@ -0,0 +1,72 @@
+# tests/test_search.py
+import pytest
+from app import db
+from app.models import Comment, Post, StudyRoom, User
+
+@pytest.fixture
+def rooms(app_instance):
+    with app_instance.app_context():
+        author = User(username="author", email="author@example.com", password="x")
+        db.session.add(author)
+        db.session.commit()
+        first = StudyRoom(name="Calculus", capacity=10, creator_id=author.id)
+        second = StudyRoom(name="Biology", capacity=10, creator_id=author.id)
+        db.session.add_all([first, second])
+        db.session.commit()
+        posts = [
+            Post(content="Integrals integrals integrals before the exam", creator_id=author.id, room_id=first.room_id),
+            Post(content="Notes on integrals and limits", creator_id=author.id, room_id=first.room_id),
+            Post(content="Cell biology flashcards", creator_id=author.id, room_id=second.room_id),
+            Post(content="Integrals show up in population models too", creator_id=author.id, room_id=second.room_id),
+        ]
+        db.session.add_all(posts)
+        db.session.commit()
+        db.session.add(Comment(post_id=posts[2].post_id, creator_id=author.id, content="Mitochondria integrals joke"))
+        db.session.commit()
+        return first.room_id, second.room_id
+
+def test_search_ranks_posts_by_relevance(client, rooms):
+    response = client.get("/api/search", query_string={"q": "integrals"})
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert len(results) == 3
+    assert results[0]["content"].startswith("Integrals integrals integrals")
+    scores = [result["score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+
+def test_search_within_room_and_comments(client, rooms):
+    first, second = rooms
+    response = client.get("/api/search", query_string={"q": "integrals", "room_id": second})
+    results = response.get_json()["results"]
+    assert [result["room_id"] for result in results] == [second]
+
+    response = client.get("/api/search", query_string={"q": "mitochondria", "type": "comments"})
+    results = response.get_json()["results"]
+    assert len(results) == 1
+    assert results[0]["room_id"] == second
+    assert "comment_id" in results[0] and "post_id" in results[0]
+
+def test_search_cursor_pagination(client, rooms):
+    seen = []
+    after = None
+    while True:
+        params = {"q": "integrals", "limit": 1}
+        if after:
+            params["after"] = after
+        data = client.get("/api/search", query_string=params).get_json()
+        seen.extend(result["post_id"] for result in data["results"])
+        after = data["next_cursor"]
+        if after is None:
+            break
+    assert len(seen) == 3 and len(set(seen)) == 3
+
+def test_search_treats_query_syntax_literally(client, rooms):
+    response = client.get("/api/search", query_string={"q": 'integrals" OR (NEAR'})
+    assert response.status_code == 200
+    assert response.get_json()["results"] == []
+
+def test_search_validates_parameters(client, rooms):
+    assert client.get("/api/search").status_code == 400
+    assert client.get("/api/search", query_string={"q": "x", "type": "users"}).status_code == 400
+    assert client.get("/api/search", query_string={"q": "x", "room_id": "abc"}).status_code == 400
+    assert client.get("/api/search", query_string={"q": "x", "after": "bogus"}).status_code == 400
@@ -0,0 +1,6 @@
+# wsgi.py
+from app import create_app
+
+# WSGI entry point for production servers: "gunicorn -c gunicorn.conf.py wsgi:app".
+# run.py starts the development server instead.
+app = create_app()